@@ -0,0 +1,167 @@
+import ipaddress
+
+import numpy as np
+import pandas as pd
+
+import cyberpandas as ip
+
+SIZES = [10 ** 3, 10 ** 5, 10 ** 7, 10 ** 8]
+# Building the strings is the limit for parsing and formatting.
+STRING_SIZES = [10 ** 3, 10 ** 5, 10 ** 6]
+# The ipaddress baselines take minutes past these.
+BASELINE_SIZES = [10 ** 3, 10 ** 5]
+KINDS = ['v4', 'v4-compact', 'mixed']
+CARDINALITIES = ['low', 'high']
+PROPERTIES = ['is_ipv4', 'is_ipv6', 'is_multicast', 'is_private',
+              'is_global', 'is_unspecified', 'is_reserved', 'is_loopback',
+              'is_link_local']
+NETWORKS = [u'10.0.0.0/8', u'172.16.0.0/12', u'192.168.0.0/16',
+            u'100.64.0.0/10', u'224.0.0.0/4', u'8.8.8.0/24',
+            u'2001:db8::/32', u'fe80::/10', u'fc00::/7', u'2600::/12']
+
+
+def make_addresses(n, kind, cardinality, seed=42):
+    """Random addresses.
+
+    Half of the 'mixed' addresses are IPv6. 'low' cardinality repeats
+    1000 distinct addresses.
+    """
+    rng = np.random.RandomState(seed)
+    size = min(n, 1000) if cardinality == 'low' else n
+    data = np.zeros(size, dtype=ip.IPType._record_type)
+    data['lo'] = rng.randint(1, 2 ** 32, size, dtype='u8')
+    if kind == 'mixed':
+        v6 = rng.randint(0, 2, size).astype(bool)
+        data['hi'][v6] = rng.randint(1, 2 ** 63, v6.sum(), dtype='u8')
+        data['lo'][v6] = rng.randint(0, 2 ** 63, v6.sum(), dtype='u8')
+    if cardinality == 'low':
+        data = data[rng.randint(0, size, n)]
+    arr = ip.IPArray(data)
+    if kind == 'v4-compact':
+        if not hasattr(arr, 'compact'):
+            raise NotImplementedError("No compact storage.")
+        arr = arr.compact()
+    return arr
+
+
+class Methods(object):
+    params = [SIZES, KINDS, CARDINALITIES]
+    param_names = ['n', 'kind', 'cardinality']
+    timeout = 600
+
+    def setup(self, n, kind, cardinality):
+        self.arr = make_addresses(n, kind, cardinality)
+        self.indices = np.random.RandomState(0).randint(0, n, n)
+        self.others = make_addresses(100, kind, 'high', seed=1)
+        self.mask = self.arr.netmask(v4_prefixlen=24, v6_prefixlen=64)
+
+    def time_take(self, n, kind, cardinality):
+        self.arr.take(self.indices)
+
+    def time_unique(self, n, kind, cardinality):
+        self.arr.unique()
+
+    def time_argsort(self, n, kind, cardinality):
+        self.arr.argsort()
+
+    def time_factorize(self, n, kind, cardinality):
+        pd.factorize(self.arr)
+
+    def time_isna(self, n, kind, cardinality):
+        self.arr.isna()
+
+    def time_isin_addresses(self, n, kind, cardinality):
+        self.arr.isin(self.others)
+
+    def time_isin_networks(self, n, kind, cardinality):
+        self.arr.isin(NETWORKS)
+
+    def time_mask(self, n, kind, cardinality):
+        self.arr.mask(self.mask)
+
+
+class Properties(object):
+    params = [SIZES, KINDS, PROPERTIES]
+    param_names = ['n', 'kind', 'property']
+    timeout = 300
+
+    def setup(self, n, kind, prop):
+        self.arr = make_addresses(n, kind, 'high')
+
+    def time_property(self, n, kind, prop):
+        getattr(self.arr, prop)
+
+
+class Strings(object):
+    params = [STRING_SIZES, KINDS]
+    param_names = ['n', 'kind']
+    timeout = 300
+
+    def setup(self, n, kind):
+        self.arr = make_addresses(n, kind, 'high')
+        self.strings = [str(x) for x in self.arr.to_pyipaddress()]
+        self.ints = self.arr.to_pyints()
+
+    def time_parse(self, n, kind):
+        ip.IPArray(self.strings)
+
+    def time_from_pyints(self, n, kind):
+        ip.IPArray.from_pyints(self.ints)
+
+    def time_format_values(self, n, kind):
+        self.arr._format_values()
+
+    def time_to_pyipaddress(self, n, kind):
+        self.arr.to_pyipaddress()
+
+
+class IPAddressBaseline(object):
+    # The same work with the standard library, an address at a time, to
+    # track the speedup.
+    params = [BASELINE_SIZES, ['v4', 'mixed']]
+    param_names = ['n', 'kind']
+    timeout = 300
+
+    def setup(self, n, kind):
+        arr = make_addresses(n, kind, 'high')
+        self.addresses = arr.to_pyipaddress()
+        self.strings = [str(x) for x in self.addresses]
+        self.others = set(make_addresses(100, kind, 'high',
+                                         seed=1).to_pyipaddress())
+        self.networks = [ipaddress.ip_network(x) for x in NETWORKS]
+        self.masks = [int(x) for x in
+                      arr.netmask(v4_prefixlen=24,
+                                  v6_prefixlen=64).to_pyipaddress()]
+        self.indices = np.random.RandomState(0).randint(0, n, n)
+
+    def time_parse(self, n, kind):
+        [ipaddress.ip_address(x) for x in self.strings]
+
+    def time_format(self, n, kind):
+        [str(x) for x in self.addresses]
+
+    def time_take(self, n, kind):
+        [self.addresses[i] for i in self.indices]
+
+    def time_unique(self, n, kind):
+        set(self.addresses)
+
+    def time_argsort(self, n, kind):
+        # IPv4 and IPv6 addresses don't compare, so sort by int.
+        sorted(range(n), key=lambda i: int(self.addresses[i]))
+
+    def time_factorize(self, n, kind):
+        pd.factorize(np.array(self.addresses, dtype=object))
+
+    def time_isin_addresses(self, n, kind):
+        [x in self.others for x in self.addresses]
+
+    def time_isin_networks(self, n, kind):
+        [any(x in net for net in self.networks) for x in self.addresses]
+
+    def time_mask(self, n, kind):
+        [ipaddress.ip_address(int(x) & m)
+         for x, m in zip(self.addresses, self.masks)]
+
+    def time_is_private(self, n, kind):
+        [x.is_private for x in self.addresses]
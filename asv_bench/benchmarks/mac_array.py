@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+import cyberpandas as ip
+
+from .ip_array import BASELINE_SIZES, CARDINALITIES, SIZES, STRING_SIZES
+
+
+def make_macs(n, cardinality, seed=42):
+    """Random MAC addresses. 'low' cardinality repeats 1000 of them."""
+    rng = np.random.RandomState(seed)
+    size = min(n, 1000) if cardinality == 'low' else n
+    values = rng.randint(0, 2 ** 48, size, dtype='u8')
+    if cardinality == 'low':
+        values = values[rng.randint(0, size, n)]
+    return ip.MACArray(values)
+
+
+class Methods(object):
+    params = [SIZES, CARDINALITIES]
+    param_names = ['n', 'cardinality']
+    timeout = 600
+
+    def setup(self, n, cardinality):
+        self.arr = make_macs(n, cardinality)
+        self.indices = np.random.RandomState(0).randint(0, n, n)
+
+    def time_take(self, n, cardinality):
+        self.arr.take(self.indices)
+
+    def time_unique(self, n, cardinality):
+        self.arr.unique()
+
+    def time_argsort(self, n, cardinality):
+        self.arr.argsort()
+
+    def time_factorize(self, n, cardinality):
+        pd.factorize(self.arr)
+
+    def time_isna(self, n, cardinality):
+        self.arr.isna()
+
+    def time_is_multicast(self, n, cardinality):
+        self.arr.is_multicast
+
+    def time_oui(self, n, cardinality):
+        self.arr.oui
+
+
+class Strings(object):
+    params = [STRING_SIZES]
+    param_names = ['n']
+    timeout = 300
+
+    def setup(self, n):
+        self.arr = make_macs(n, 'high')
+        self.strings = list(self.arr.to_strings())
+
+    def time_parse(self, n):
+        ip.MACArray(self.strings)
+
+    def time_to_strings(self, n):
+        self.arr.to_strings()
+
+
+class PythonBaseline(object):
+    # The standard library has no MAC type, so the baseline is plain
+    # Python on ints and strings.
+    params = [BASELINE_SIZES]
+    param_names = ['n']
+    timeout = 300
+
+    def setup(self, n):
+        arr = make_macs(n, 'high')
+        self.values = arr.data.tolist()
+        self.strings = list(arr.to_strings())
+
+    def time_parse(self, n):
+        [int(x.replace(':', ''), 16) for x in self.strings]
+
+    def time_format(self, n):
+        [':'.join('{:012x}'.format(x)[i:i + 2] for i in range(0, 12, 2))
+         for x in self.values]
+
+    def time_unique(self, n):
+        set(self.values)
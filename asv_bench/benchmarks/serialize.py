@@ -0,0 +1,71 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+import pandas as pd
+
+import cyberpandas as ip
+
+# Protocol 5 sends the arrays' data out-of-band. It's only available on
+# Python 3.8 and newer.
+PROTOCOLS = sorted({4, pickle.HIGHEST_PROTOCOL})
+
+
+def _make_frame(n):
+    rng = np.random.RandomState(42)
+    return pd.DataFrame({
+        'src': ip.IPArray.from_pyints(
+            rng.randint(0, 2 ** 63, n, dtype='i8').astype(object) << 64),
+        'dst': ip.IPArray(rng.randint(0, 2 ** 32, n, dtype='u8')),
+        'mac': ip.MACArray(rng.randint(0, 2 ** 48, n, dtype='u8')),
+    })
+
+
+class Pickle(object):
+    params = [[10 ** 4, 10 ** 6], PROTOCOLS]
+    param_names = ['n', 'protocol']
+
+    def setup(self, n, protocol):
+        self.df = _make_frame(n)
+        self.buffers = []
+        callback = self.buffers.append if protocol >= 5 else None
+        self.pickled = pickle.dumps(self.df, protocol=protocol,
+                                    buffer_callback=callback)
+
+    def time_dumps(self, n, protocol):
+        buffers = []
+        callback = buffers.append if protocol >= 5 else None
+        pickle.dumps(self.df, protocol=protocol, buffer_callback=callback)
+
+    def time_loads(self, n, protocol):
+        if protocol >= 5:
+            pickle.loads(self.pickled, buffers=self.buffers)
+        else:
+            pickle.loads(self.pickled)
+
+    def track_pickled_bytes(self, n, protocol):
+        return len(self.pickled)
+
+
+class PoolMap(object):
+    # Sending frames to worker processes and back, the pattern of
+    # multiprocessing and joblib workloads.
+    params = [10 ** 5, 10 ** 6]
+    param_names = ['n']
+    timeout = 120
+
+    def setup(self, n):
+        df = _make_frame(n)
+        self.chunks = [df.iloc[i::8] for i in range(8)]
+        self.pool = multiprocessing.Pool(4)
+
+    def teardown(self, n):
+        self.pool.terminate()
+        self.pool.join()
+
+    def time_map(self, n):
+        self.pool.map(_identity, self.chunks)
+
+
+def _identity(df):
+    return df
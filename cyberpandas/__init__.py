@@ -5,9 +5,31 @@ from .ip_array import (
     IPArray,
     IPAccessor,
 )
-from .ip_methods import ip_range
+from .network_array import (
+    IPNetworkType,
+    IPNetworkArray,
+    IPNetworkAccessor,
+)
+from .endpoint_array import (
+    Endpoint,
+    EndpointType,
+    EndpointArray,
+    EndpointAccessor,
+)
+from .ip_methods import ip_range, collapse, random_ips, summarize_ranges
+from .ipset import IPSet
+from .iprange import IPRange
+from .bitmap import IPv4Bitmap
 from .parser import to_ipaddress
-from .mac_array import MACType, MACArray
+from .mac_array import MACType, MACArray, MACAccessor, to_macaddress
+from .oui import OUIRegistry
+from .parquet import read_parquet, to_parquet
+from .netflow import read_netflow
+from .pcap import read_pcap
+from .zeek import read_zeek
+from .shared import SharedArray
+from . import _arrow  # noqa: F401  registers the Arrow extension types
+from . import _dask  # noqa: F401  registers the Dask dispatch and accessors
 
 from pkg_resources import get_distribution, DistributionNotFound
 try:
@@ -22,11 +44,33 @@ del DistributionNotFound
 
 __all__ = [
     '__version__',
+    'Endpoint',
+    'EndpointAccessor',
+    'EndpointArray',
+    'EndpointType',
     'IPAccessor',
     'IPArray',
     'IPType',
+    'IPNetworkAccessor',
+    'IPNetworkArray',
+    'IPNetworkType',
+    'IPRange',
+    'IPSet',
+    'IPv4Bitmap',
+    'MACAccessor',
     'MACArray',
     'MACType',
+    'OUIRegistry',
+    'SharedArray',
+    'collapse',
     'ip_range',
+    'random_ips',
+    'read_netflow',
+    'read_parquet',
+    'read_pcap',
+    'read_zeek',
+    'summarize_ranges',
     'to_ipaddress',
+    'to_macaddress',
+    'to_parquet',
 ]
@@ -0,0 +1,255 @@
+"""Apache Arrow extension types for IPArray and MACArray.
+
+pyarrow is optional. When it's installed, importing cyberpandas registers
+three extension types with Arrow
+
+* ``cyberpandas.ip``: ``fixed_size_binary(16)`` storage. Each value is
+  the address in network byte order, the same bytes as
+  ``IPType._record_type``.
+* ``cyberpandas.ipv4``: ``uint32`` storage, for compact arrays of IPv4
+  addresses (``IPType._compact_type``).
+* ``cyberpandas.mac``: ``uint64`` storage.
+
+so that ``pyarrow.array``, ``pyarrow.Table.from_pandas`` and
+``pyarrow.Table.to_pandas`` convert between the pandas and Arrow
+containers without copying the values, and so the types survive a round
+trip through Arrow IPC and Parquet files.
+"""
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+def _ip_arrow_type():
+    return IPArrowType()
+
+
+def _ipv4_arrow_type():
+    return IPv4ArrowType()
+
+
+def _mac_arrow_type():
+    return MACArrowType()
+
+
+def ip_to_arrow(values, type=None):
+    """Wrap the data of an IPArray in an Arrow array.
+
+    Parameters
+    ----------
+    values : ndarray
+        With ``IPType._record_type``, or ``IPType._compact_type`` for a
+        compact array.
+    type : pyarrow.DataType, optional
+        The requested type. One of the ``cyberpandas.ip`` or
+        ``cyberpandas.ipv4`` extension types, or their storage types.
+        By default, compact arrays use ``cyberpandas.ipv4`` and others
+        ``cyberpandas.ip``.
+
+    Returns
+    -------
+    pyarrow.Array
+        Sharing memory with `values`, unless converting between the
+        compact and 128-bit layouts.
+    """
+    from .ip_array import IPType, _narrow, _widen
+
+    ipv4_types = [IPv4ArrowType(), pa.uint32()]
+    compact = values.dtype == IPType._compact_type
+    if type is None:
+        want_compact = compact
+    else:
+        want_compact = type in ipv4_types
+
+    if want_compact and not compact:
+        values = _narrow(values)
+        if values.dtype != IPType._compact_type:
+            raise ValueError("Cannot convert IPv6 addresses to Arrow "
+                             "type '{}'.".format(type))
+    elif compact and not want_compact:
+        values = _widen(values)
+
+    values = np.ascontiguousarray(values)
+    if want_compact:
+        storage_type, ext_type = pa.uint32(), IPv4ArrowType()
+    else:
+        storage_type, ext_type = pa.binary(16), IPArrowType()
+    storage = pa.Array.from_buffers(storage_type, len(values),
+                                    [None, pa.py_buffer(values)])
+    return _wrap(storage, ext_type, type)
+
+
+def mac_to_arrow(values, type=None):
+    """Wrap the uint64 values of a MACArray in an Arrow array.
+
+    Parameters
+    ----------
+    values : ndarray[uint64]
+    type : pyarrow.DataType, optional
+        The requested type. Either the extension type or its ``uint64``
+        storage type.
+
+    Returns
+    -------
+    pyarrow.ExtensionArray or pyarrow.UInt64Array
+    """
+    values = np.ascontiguousarray(values, dtype='u8')
+    storage = pa.Array.from_buffers(pa.uint64(), len(values),
+                                    [None, pa.py_buffer(values)])
+    return _wrap(storage, MACArrowType(), type)
+
+
+def _wrap(storage, ext_type, type):
+    if type is None or type == ext_type:
+        return pa.ExtensionArray.from_storage(ext_type, storage)
+    if type == storage.type:
+        return storage
+    raise TypeError("Cannot convert to Arrow type '{}'. Use '{}' or "
+                    "'{}'.".format(type, ext_type, storage.type))
+
+
+def ip_from_arrow(array):
+    """The data of an Arrow array of IP addresses.
+
+    Parameters
+    ----------
+    array : pyarrow.Array or pyarrow.ChunkedArray
+        Of the ``cyberpandas.ip`` or ``cyberpandas.ipv4`` extension
+        types, or their storage types.
+
+    Returns
+    -------
+    ndarray
+        With ``IPType._compact_type`` for ``uint32`` storage, and
+        ``IPType._record_type`` otherwise. Views the Arrow memory when
+        `array` is a single chunk without nulls. Nulls become the
+        NA value, ``0.0.0.0``.
+    """
+    from .ip_array import IPType
+
+    storage_type = array.type
+    if isinstance(storage_type, pa.ExtensionType):
+        storage_type = storage_type.storage_type
+    if storage_type == pa.uint32():
+        return _from_arrow(array, pa.uint32(), IPType._compact_type)
+    return _from_arrow(array, pa.binary(16), IPType._record_type)
+
+
+def mac_from_arrow(array):
+    """The values of an Arrow array of MAC addresses.
+
+    Parameters
+    ----------
+    array : pyarrow.Array or pyarrow.ChunkedArray
+        Of the ``cyberpandas.mac`` extension type or an integer type.
+
+    Returns
+    -------
+    ndarray[uint64]
+        Views the Arrow memory when `array` is a single uint64 chunk
+        without nulls. Nulls become the NA value, 0.
+    """
+    return _from_arrow(array, pa.uint64(), np.dtype('u8'))
+
+
+def _from_arrow(array, storage_type, dtype):
+    if isinstance(array, pa.ChunkedArray):
+        chunks = array.chunks
+    else:
+        chunks = [array]
+
+    values = [_chunk_values(chunk, storage_type, dtype) for chunk in chunks]
+    if len(values) == 1:
+        return values[0]
+    return np.concatenate(values) if values else np.array([], dtype=dtype)
+
+
+def _chunk_values(chunk, storage_type, dtype):
+    if isinstance(chunk, pa.ExtensionArray):
+        chunk = chunk.storage
+    if chunk.type != storage_type:
+        chunk = chunk.cast(storage_type)
+
+    # buffers are [validity, data]. The data buffer isn't sliced with
+    # the array, so apply the array's offset ourselves.
+    validity, data = chunk.buffers()
+    values = np.frombuffer(data, dtype=dtype, count=chunk.offset + len(chunk))
+    values = values[chunk.offset:]
+    if chunk.null_count:
+        values = values.copy()
+        values[np.asarray(chunk.is_null())] = np.zeros(1, dtype=dtype)
+    return values
+
+
+if pa is not None:
+    class IPArrowType(pa.ExtensionType):
+        """Arrow extension type for IP addresses."""
+        def __init__(self):
+            super(IPArrowType, self).__init__(pa.binary(16), 'cyberpandas.ip')
+
+        def __arrow_ext_serialize__(self):
+            return b''
+
+        @classmethod
+        def __arrow_ext_deserialize__(cls, storage_type, serialized):
+            return cls()
+
+        def __reduce__(self):
+            return _ip_arrow_type, ()
+
+        def to_pandas_dtype(self):
+            from .ip_array import IPType
+
+            return IPType()
+
+    class IPv4ArrowType(pa.ExtensionType):
+        """Arrow extension type for compact arrays of IPv4 addresses."""
+        def __init__(self):
+            super(IPv4ArrowType, self).__init__(pa.uint32(),
+                                                'cyberpandas.ipv4')
+
+        def __arrow_ext_serialize__(self):
+            return b''
+
+        @classmethod
+        def __arrow_ext_deserialize__(cls, storage_type, serialized):
+            return cls()
+
+        def __reduce__(self):
+            return _ipv4_arrow_type, ()
+
+        def to_pandas_dtype(self):
+            from .ip_array import IPType
+
+            return IPType()
+
+    class MACArrowType(pa.ExtensionType):
+        """Arrow extension type for MAC addresses."""
+        def __init__(self):
+            super(MACArrowType, self).__init__(pa.uint64(), 'cyberpandas.mac')
+
+        def __arrow_ext_serialize__(self):
+            return b''
+
+        @classmethod
+        def __arrow_ext_deserialize__(cls, storage_type, serialized):
+            return cls()
+
+        def __reduce__(self):
+            return _mac_arrow_type, ()
+
+        def to_pandas_dtype(self):
+            from .mac_array import MACType
+
+            return MACType()
+
+    for _type in [IPArrowType(), IPv4ArrowType(), MACArrowType()]:
+        try:
+            pa.register_extension_type(_type)
+        except pa.ArrowKeyError:
+            # Already registered, e.g. the module was reloaded.
+            pass
+    del _type
@@ -0,0 +1,170 @@
+"""Dask integration for the cyberpandas extension types.
+
+Dask is optional. When it's installed, importing cyberpandas
+
+* registers the ip, network, endpoint and MAC types with Dask's
+  ``make_array_nonempty``, ``make_meta`` and ``make_scalar`` dispatch, so
+  Dask can infer the metadata of operations on those columns,
+* registers the arrays and types with ``sizeof`` and ``normalize_token``,
+  so Dask accounts for their memory and gives equal data equal names,
+* adds the ``ip`` and ``mac`` accessors to ``dask.dataframe.Series``.
+"""
+import ipaddress
+
+import pandas as pd
+
+try:
+    import dask
+    import dask.dataframe as dd
+except ImportError:
+    dd = None
+
+
+def _isin(series, networks, addresses):
+    """``Series.ip.isin`` with the values parsed by ``_split_isin_values``.
+
+    `addresses` is an IPArray, or a Series of them.
+    """
+    if isinstance(addresses, pd.Series):
+        addresses = addresses.values
+    return pd.Series(series.values._isin(networks, addresses),
+                     index=series.index, name=series.name)
+
+
+def _value_counts_combine(counts):
+    # IPv4 and IPv6 addresses don't compare, so group without sorting.
+    return counts.groupby(level=0, sort=False).sum()
+
+
+def _value_counts_aggregate(counts):
+    return _value_counts_combine(counts).sort_values(ascending=False)
+
+
+if dd is not None:
+    from dask.base import normalize_token
+    from dask.dataframe.accessor import Accessor
+    from dask.dataframe.core import aca
+    from dask.dataframe.extensions import (make_array_nonempty, make_scalar,
+                                           register_series_accessor)
+    from dask.dataframe.utils import make_meta
+    from dask.sizeof import sizeof
+
+    from .base import NumPyBackedExtensionArrayMixin
+    from .endpoint_array import Endpoint, EndpointArray, EndpointType
+    from .ip_array import IPArray, IPType, _split_isin_values
+    from .ipset import IPSet
+    from .mac_array import MACArray, MACType
+    from .network_array import IPNetworkArray, IPNetworkType
+
+    _DTYPES = (IPType, IPNetworkType, EndpointType, MACType)
+
+    @make_array_nonempty.register(IPType)
+    def _nonempty_ip(dtype):
+        return IPArray([u'0.0.0.1', u'::2'])
+
+    @make_array_nonempty.register(IPNetworkType)
+    def _nonempty_network(dtype):
+        return IPNetworkArray([u'10.0.0.0/8', u'2001:db8::/32'])
+
+    @make_array_nonempty.register(EndpointType)
+    def _nonempty_endpoint(dtype):
+        return EndpointArray.from_components([1, 2], [80, 443], 6)
+
+    @make_array_nonempty.register(MACType)
+    def _nonempty_mac(dtype):
+        return MACArray([1, 2])
+
+    @make_meta.register(_DTYPES)
+    def _meta_scalar(dtype, index=None):
+        # Like NumPy dtypes, a scalar of the type.
+        return make_array_nonempty(dtype)[0]
+
+    @make_scalar.register(ipaddress.IPv4Address)
+    @make_scalar.register(ipaddress.IPv6Address)
+    @make_scalar.register(ipaddress.IPv4Network)
+    @make_scalar.register(ipaddress.IPv6Network)
+    @make_scalar.register(Endpoint)
+    def _scalar(x):
+        return x
+
+    @sizeof.register(NumPyBackedExtensionArrayMixin)
+    def _sizeof_array(x):
+        return int(x.nbytes)
+
+    @normalize_token.register(NumPyBackedExtensionArrayMixin)
+    def _tokenize_array(x):
+        return [type(x).__name__, normalize_token(x._storage)]
+
+    @normalize_token.register(_DTYPES)
+    def _tokenize_dtype(dtype):
+        return dtype.name
+
+    @register_series_accessor('ip')
+    class IPDaskAccessor(Accessor):
+        """The ``ip`` accessor of ``dask.dataframe.Series``.
+
+        The properties and methods of :class:`IPAccessor` map over the
+        partitions.
+        """
+        _accessor_name = 'ip'
+
+        def isin(self, other):
+            """Check whether each address is in `other`.
+
+            Parameters
+            ----------
+            other : str, sequence, IPArray, IPSet or dask.dataframe.Series
+                As in :meth:`IPArray.isin`. A Dask Series of addresses is
+                reduced to its unique addresses, partition by partition,
+                before checking against them.
+
+            Returns
+            -------
+            dask.dataframe.Series[bool]
+            """
+            if isinstance(other, dd.Series):
+                networks = IPSet()
+                addresses = other.unique().to_delayed()[0]
+            elif isinstance(other, IPSet):
+                networks = dask.delayed(other)
+                addresses = IPArray([])
+            else:
+                # Parse once, not for every partition.
+                networks, addresses = _split_isin_values(other)
+                networks = dask.delayed(networks)
+                addresses = dask.delayed(addresses)
+            return self._series.map_partitions(
+                _isin, networks, addresses, token='ip-isin',
+                meta=(self._series.name, bool))
+
+        def value_counts(self, split_every=None):
+            """Count of each distinct address.
+
+            Unlike ``dask.dataframe.Series.value_counts``, this doesn't
+            sort the addresses when combining the partitions, so it works
+            on columns holding both IPv4 and IPv6 addresses.
+
+            Parameters
+            ----------
+            split_every : int, optional
+                As in ``dask.dataframe.Series.value_counts``.
+
+            Returns
+            -------
+            dask.dataframe.Series
+                The counts, indexed by the addresses, largest first.
+            """
+            return aca(self._series, chunk=pd.Series.value_counts,
+                       aggregate=_value_counts_aggregate,
+                       combine=_value_counts_combine,
+                       meta=self._series._meta.value_counts(),
+                       token='ip-value-counts', split_every=split_every)
+
+    @register_series_accessor('mac')
+    class MACDaskAccessor(Accessor):
+        """The ``mac`` accessor of ``dask.dataframe.Series``.
+
+        The properties and methods of :class:`MACAccessor` map over the
+        partitions.
+        """
+        _accessor_name = 'mac'
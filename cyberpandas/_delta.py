@@ -0,0 +1,227 @@
+"""Delta encoding of IP addresses, for ``IPArray.to_bytes(encoding='delta')``.
+
+The addresses are split into blocks of ``block_size``. Each block stores a
+128-bit base address, and every address as a fixed width offset from
+either
+
+* the previous address, when the block is sorted, or
+* the base, which is then the smallest address in the block.
+
+whichever needs fewer bytes. The width is between 0 and 16 bytes, and
+chosen per block, so sorted or clustered addresses, e.g. scan results or
+allocation tables, take a byte or two each.
+
+The bytes are little-endian, and laid out as
+
+* a 32 byte header: magic, version, block size and length,
+* an index with a 32 byte entry per block: base address, the offset of
+  the block's data, width and mode,
+* the data of each block, offsets as big-endian integers of the block's
+  width.
+
+The index gives random access by block: decoding a range of addresses
+only reads the blocks holding them.
+"""
+import numpy as np
+
+from ._utils import add128, bit_length128, lt128, sub128
+
+MAGIC = b'\x93CYBDLTA'
+VERSION = 1
+DEFAULT_BLOCK_SIZE = 4096
+
+HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u2'),
+    ('pad', 'V2'),
+    ('block_size', '<u4'),
+    ('length', '<u8'),
+    ('reserved', 'V8'),
+])
+INDEX = np.dtype([
+    ('base_hi', '<u8'),
+    ('base_lo', '<u8'),
+    ('offset', '<u8'),
+    ('width', 'u1'),
+    ('mode', 'u1'),
+    ('pad', 'V6'),
+])
+# Block modes
+_OFFSET = 0  # From the base
+_DELTA = 1  # From the previous address
+
+
+def encode(hi, lo, block_size=DEFAULT_BLOCK_SIZE):
+    """Delta encode addresses.
+
+    Parameters
+    ----------
+    hi, lo : ndarray
+        The upper and lower 64 bits of the addresses, as from
+        ``IPArray._hi_lo``.
+    block_size : int
+
+    Returns
+    -------
+    bytes
+    """
+    from .ip_array import IPType
+
+    if block_size < 1:
+        raise ValueError("'block_size' must be positive.")
+    n = len(lo)
+    n_blocks = -(-n // block_size)
+    header = np.zeros(1, dtype=HEADER)
+    header['magic'] = MAGIC
+    header['version'] = VERSION
+    header['block_size'] = block_size
+    header['length'] = n
+    index = np.zeros(n_blocks, dtype=INDEX)
+    if not n:
+        return header.tobytes() + index.tobytes()
+
+    # Pad the last block by repeating the last address. That changes
+    # neither its minimum nor whether it's sorted.
+    padded = np.empty((2, n_blocks * block_size), dtype='u8')
+    padded[0, :n] = hi
+    padded[1, :n] = lo
+    padded[:, n:] = padded[:, n - 1:n]
+    hi = padded[0].reshape(n_blocks, block_size)
+    lo = padded[1].reshape(n_blocks, block_size)
+
+    # Offsets from the minimum
+    min_hi = hi.min(axis=1)
+    min_lo = np.where(hi == min_hi[:, None], lo,
+                      np.uint64(2 ** 64 - 1)).min(axis=1)
+    offset_hi, offset_lo = sub128(hi, lo, min_hi[:, None], min_lo[:, None])
+    offset_width = _byte_width(offset_hi, offset_lo)
+
+    # Deltas from the previous address, with a delta of 0 for the first
+    delta_hi, delta_lo = sub128(hi, lo, np.roll(hi, 1, axis=1),
+                                np.roll(lo, 1, axis=1))
+    delta_hi[:, 0] = delta_lo[:, 0] = 0
+    unsorted = lt128(hi[:, 1:], lo[:, 1:], hi[:, :-1], lo[:, :-1]).any(axis=1)
+    delta_width = np.where(unsorted, 17, _byte_width(delta_hi, delta_lo))
+
+    use_delta = delta_width < offset_width
+    index['mode'] = np.where(use_delta, _DELTA, _OFFSET)
+    index['width'] = width = np.where(use_delta, delta_width, offset_width)
+    index['base_hi'] = np.where(use_delta, hi[:, 0], min_hi)
+    index['base_lo'] = np.where(use_delta, lo[:, 0], min_lo)
+    values = np.empty((n_blocks, block_size), dtype=IPType._record_type)
+    values['hi'] = np.where(use_delta[:, None], delta_hi, offset_hi)
+    values['lo'] = np.where(use_delta[:, None], delta_lo, offset_lo)
+    values = values.reshape(-1)[:n]
+
+    counts = np.full(n_blocks, block_size, dtype='i8')
+    counts[-1] = n - (n_blocks - 1) * block_size
+    sizes = counts * width
+    index['offset'] = np.cumsum(sizes) - sizes
+    payload = np.zeros(sizes.sum(), dtype='u1')
+    element_block = np.repeat(np.arange(n_blocks), counts)
+    element_width = width[element_block]
+    position = (index['offset'][element_block].astype('i8') +
+                (np.arange(n) - element_block * block_size) * element_width)
+    octets = values.view('u1').reshape(n, 16)
+    # The low `width` bytes of each big-endian value.
+    for w in np.unique(width):
+        if w == 0:
+            continue
+        rows = np.flatnonzero(element_width == w)
+        payload[position[rows, None] + np.arange(w)] = octets[rows, 16 - w:]
+    return header.tobytes() + index.tobytes() + payload.tobytes()
+
+
+def decode(buffer, start=None, stop=None):
+    """Decode addresses encoded by :func:`encode`.
+
+    Parameters
+    ----------
+    buffer : bytes-like
+    start, stop : int, optional
+        The range of addresses to decode, as in a slice.
+
+    Returns
+    -------
+    ndarray
+        With ``IPType._record_type``.
+    """
+    from .ip_array import IPType
+
+    buffer = np.frombuffer(buffer, dtype='u1')
+    if len(buffer) < HEADER.itemsize:
+        raise ValueError("Not delta encoded IP addresses. The data is "
+                         "too short.")
+    header = buffer[:HEADER.itemsize].view(HEADER)[0]
+    if header['magic'] != MAGIC:
+        raise ValueError("Not delta encoded IP addresses.")
+    if header['version'] > VERSION:
+        raise ValueError("Unsupported version '{}' of the delta "
+                         "encoding.".format(header['version']))
+    n = int(header['length'])
+    block_size = int(header['block_size'])
+    n_blocks = -(-n // block_size)
+    index_end = HEADER.itemsize + n_blocks * INDEX.itemsize
+    if len(buffer) < index_end:
+        raise ValueError("The delta encoded data is truncated.")
+    index = buffer[HEADER.itemsize:index_end].view(INDEX)
+    payload = buffer[index_end:]
+
+    start, stop, _ = slice(start, stop).indices(n)
+    if stop <= start:
+        return np.zeros(0, dtype=IPType._record_type)
+
+    # Decode whole blocks, then trim.
+    first, last = start // block_size, (stop - 1) // block_size + 1
+    index = index[first:last]
+    counts = np.full(len(index), block_size, dtype='i8')
+    counts[-1] = min(n, last * block_size) - (last - 1) * block_size
+    width = index['width'].astype('i8')
+    if (index['offset'].astype('i8') + counts * width > len(payload)).any():
+        raise ValueError("The delta encoded data is truncated.")
+
+    m = counts.sum()
+    element_block = np.repeat(np.arange(len(index)), counts)
+    element_width = width[element_block]
+    in_block = np.arange(m) - (np.cumsum(counts) - counts)[element_block]
+    position = (index['offset'][element_block].astype('i8') +
+                in_block * element_width)
+    octets = np.zeros((m, 16), dtype='u1')
+    for w in np.unique(width):
+        if w == 0:
+            continue
+        rows = np.flatnonzero(element_width == w)
+        octets[rows, 16 - w:] = payload[position[rows, None] + np.arange(w)]
+    values = octets.view(IPType._record_type).reshape(m)
+    hi = values['hi'].astype('u8')
+    lo = values['lo'].astype('u8')
+
+    # Running sums of the deltas within each block. Sums are modulo
+    # 2**128, with the carries out of 'lo' counted separately.
+    delta = (index['mode'] == _DELTA)[element_block]
+    lo_sum = np.cumsum(np.where(delta, lo, np.uint64(0)), dtype='u8')
+    carries = np.cumsum(lo_sum < np.concatenate([[np.uint64(0)],
+                                                 lo_sum[:-1]]), dtype='u8')
+    hi_sum = np.cumsum(np.where(delta, hi, np.uint64(0)), dtype='u8') + carries
+    block_start = np.cumsum(counts) - counts
+    before = block_start - 1
+    prev_hi = np.where(before >= 0, hi_sum[np.maximum(before, 0)],
+                       np.uint64(0))
+    prev_lo = np.where(before >= 0, lo_sum[np.maximum(before, 0)],
+                       np.uint64(0))
+    sum_hi, sum_lo = sub128(hi_sum, lo_sum, prev_hi[element_block],
+                            prev_lo[element_block])
+    hi = np.where(delta, sum_hi, hi)
+    lo = np.where(delta, sum_lo, lo)
+
+    result = np.empty(m, dtype=IPType._record_type)
+    result['hi'], result['lo'], _ = add128(
+        index['base_hi'][element_block], index['base_lo'][element_block],
+        hi, lo)
+    offset = start - first * block_size
+    return result[offset:offset + stop - start]
+
+
+def _byte_width(hi, lo):
+    """The bytes needed for the largest value of each row."""
+    return (bit_length128(hi, lo).max(axis=1) + 7) // 8
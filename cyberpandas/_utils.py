@@ -1,6 +1,9 @@
 """Utilities for working with IP address data."""
+import collections
 import struct
 
+import numpy as np
+import pandas as pd
 import six
 
 
@@ -28,3 +31,159 @@ def unpack(ip):
 def combine(hi, lo):
     """Combine the hi and lo bytes into the final ip address."""
     return (hi << 64) + lo
+
+
+# -----------------------------------------------------------------------------
+# Vectorized 128-bit helpers
+# -----------------------------------------------------------------------------
+# These operate on pairs of uint64 ndarrays holding the upper ('hi') and lower
+# ('lo') 64 bits of 128-bit integers, i.e. the fields of IPType._record_type.
+
+_ALL_ONES = np.uint64(2 ** 64 - 1)
+
+
+def high_bits(n):
+    """uint64 values with the `n` most significant bits set, 0 <= n <= 64."""
+    n = np.asarray(n, dtype='i8')
+    shift = np.clip(64 - n, 0, 63).astype('u8')
+    return np.where(n == 0, np.uint64(0), _ALL_ONES << shift)
+
+
+def prefix_masks(prefixlen):
+    """Netmasks for an array of 128-bit prefix lengths, as a (hi, lo) pair."""
+    prefixlen = np.asarray(prefixlen, dtype='i8')
+    hi = high_bits(np.clip(prefixlen, 0, 64))
+    lo = high_bits(np.clip(prefixlen - 64, 0, 64))
+    return hi, lo
+
+
+def lt128(ahi, alo, bhi, blo):
+    """Elementwise ``a < b`` for 128-bit integers."""
+    return (ahi < bhi) | ((ahi == bhi) & (alo < blo))
+
+
+def le128(ahi, alo, bhi, blo):
+    """Elementwise ``a <= b`` for 128-bit integers."""
+    return (ahi < bhi) | ((ahi == bhi) & (alo <= blo))
+
+
+def add128(ahi, alo, bhi, blo):
+    """Elementwise ``a + b`` for 128-bit integers.
+
+    Returns
+    -------
+    hi, lo : ndarray
+        The sum, modulo 2**128.
+    overflow : ndarray
+        Whether the sum was 2**128 or larger.
+    """
+    lo = alo + blo
+    carry = (lo < alo).astype('u8')
+    hi = ahi + bhi
+    overflow = hi < ahi
+    hi = hi + carry
+    overflow |= hi < carry
+    return hi, lo, overflow
+
+
+def sub128(ahi, alo, bhi, blo):
+    """Elementwise ``a - b`` for 128-bit integers, modulo 2**128."""
+    lo = alo - blo
+    borrow = (alo < blo).astype('u8')
+    hi = ahi - bhi - borrow
+    return hi, lo
+
+
+def mul64(a, b):
+    """Elementwise full product of uint64 values, as a (hi, lo) pair."""
+    a = np.asarray(a, dtype='u8')
+    b = np.asarray(b, dtype='u8')
+    low32 = np.uint64(2 ** 32 - 1)
+    shift = np.uint64(32)
+    a0, a1 = a & low32, a >> shift
+    b0, b1 = b & low32, b >> shift
+    p00, p01, p10, p11 = a0 * b0, a0 * b1, a1 * b0, a1 * b1
+    middle = (p00 >> shift) + (p01 & low32) + (p10 & low32)
+    lo = (middle << shift) | (p00 & low32)
+    hi = p11 + (p01 >> shift) + (p10 >> shift) + (middle >> shift)
+    return hi, lo
+
+
+def bit_length64(x):
+    """Elementwise ``int.bit_length`` for uint64 values."""
+    x = np.asarray(x, dtype='u8')
+    n = np.zeros(x.shape, dtype='i8')
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = x >= (np.uint64(1) << np.uint64(shift))
+        x = np.where(big, x >> np.uint64(shift), x)
+        n += np.where(big, shift, 0)
+    return n + (x > 0)
+
+
+def bit_length128(hi, lo):
+    """Elementwise ``int.bit_length`` for 128-bit integers."""
+    return np.where(hi > 0, 64 + bit_length64(hi), bit_length64(lo))
+
+
+def trailing_zeros128(hi, lo):
+    """The number of trailing zero bits of 128-bit integers (128 for 0)."""
+    def ctz(x):
+        return bit_length64(x & (~x + np.uint64(1))) - 1
+
+    return np.where(lo != 0, ctz(lo), np.where(hi != 0, 64 + ctz(hi), 128))
+
+
+def pow2_128(n):
+    """``2 ** n`` as a (hi, lo) pair, for 0 <= n < 128."""
+    n = np.asarray(n, dtype='i8')
+    hi = np.where(n >= 64,
+                  np.uint64(1) << np.clip(n - 64, 0, 63).astype('u8'),
+                  np.uint64(0))
+    lo = np.where(n < 64,
+                  np.uint64(1) << np.clip(n, 0, 63).astype('u8'),
+                  np.uint64(0))
+    return hi, lo
+
+
+def ordered_frame(columns):
+    """A DataFrame from ``(name, values)`` pairs, in their order.
+
+    An OrderedDict keeps the column order on Python 2. Passing ``columns``
+    instead would make pandas box extension arrays as objects.
+    """
+    return pd.DataFrame(collections.OrderedDict(columns))
+
+
+def first_positions(codes):
+    """Positions of the first appearance of each code, for codes
+    numbered in order of appearance."""
+    # A code first appears where it exceeds all the codes before it
+    is_first = np.ones(len(codes), dtype=bool)
+    is_first[1:] = codes[1:] > np.maximum.accumulate(codes)[:-1]
+    return np.flatnonzero(is_first)
+
+
+def factorize_codes(values, codes, na_sentinel=-1):
+    """``values.factorize``, from codes numbered in order of appearance.
+
+    Parameters
+    ----------
+    values : ExtensionArray
+    codes : ndarray[int]
+        Equal exactly where `values` are.
+    na_sentinel : int, default -1
+
+    Returns
+    -------
+    codes : ndarray[int]
+    uniques : ExtensionArray
+    """
+    uniques = values.take(first_positions(codes))
+    na = uniques.isna()
+    if na.any():
+        na_code = np.flatnonzero(na)[0]
+        is_na = codes == na_code
+        codes = codes - (codes > na_code)
+        codes[is_na] = na_sentinel
+        uniques = uniques[~na]
+    return codes, uniques
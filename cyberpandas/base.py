@@ -4,6 +4,12 @@ import numpy as np
 
 from pandas.core.arrays import ExtensionArray
 
+try:
+    from pickle import PickleBuffer
+except ImportError:
+    # Python < 3.8
+    PickleBuffer = None
+
 
 class NumPyBackedExtensionArrayMixin(ExtensionArray):
     @property
@@ -69,3 +75,22 @@ class NumPyBackedExtensionArrayMixin(ExtensionArray):
         _, indices = np.unique(self.data, return_index=True)
         data = self.data.take(np.sort(indices))
         return self._from_ndarray(data)
+
+    @property
+    def _storage(self):
+        """The ndarray holding the array's values."""
+        return self.data
+
+    def __reduce_ex__(self, protocol):
+        # Pickle just the ndarray. Under protocol 5 it's wrapped in a
+        # PickleBuffer, which pickle can hand to a buffer_callback
+        # rather than copying it into the stream.
+        data = np.ascontiguousarray(self._storage)
+        if protocol >= 5 and PickleBuffer is not None:
+            return (_from_pickle_buffer,
+                    (type(self), PickleBuffer(data), data.dtype))
+        return type(self)._from_ndarray, (data,)
+
+
+def _from_pickle_buffer(cls, buffer, dtype):
+    return cls._from_ndarray(np.frombuffer(buffer, dtype=dtype))
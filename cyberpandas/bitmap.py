@@ -0,0 +1,377 @@
+"""Compressed sets of IPv4 addresses, for dense sets.
+
+Like a roaring bitmap, the IPv4 space is split into chunks of 65536
+addresses by the upper 16 bits of the address. Each chunk with any
+addresses is stored as whichever is smaller
+
+* a sorted array of its addresses, 4 bytes each, for at most 2048
+  addresses,
+* a bitmap of 8 KiB, with a bit per address.
+
+The arrays of all sparse chunks are kept as one sorted array, and the
+bitmaps as the rows of one 2-D array, so the set operations are whole
+array NumPy operations rather than loops over chunks.
+"""
+import numpy as np
+
+from .common import _IPv4_MAX
+from .ip_array import IPArray
+
+_CHUNK_SIZE = 1 << 16
+_BITMAP_BYTES = _CHUNK_SIZE // 8
+# Where an array of 4 byte addresses outgrows a bitmap
+_ARRAY_MAX = _BITMAP_BYTES // 4
+# Bitmaps handled per pass when setting or reading bits, which bounds the
+# temporary arrays to a byte per address of these chunks, 256 MiB.
+_PASS_CHUNKS = 4096
+
+
+class IPv4Bitmap(object):
+    """A compressed set of IPv4 addresses.
+
+    Sets with many addresses in the same /16s, like the results of scans
+    of whole networks, take down to a bit per address. Cardinality,
+    union, intersection and difference work on whole chunks at once.
+
+    Parameters
+    ----------
+    values : IPArray, or values accepted by :class:`IPArray`, optional
+        IPv4 addresses. Repeats and missing values are ignored.
+
+    Raises
+    ------
+    ValueError
+        If any of the addresses are IPv6.
+
+    See Also
+    --------
+    IPSet : For sets of ranges, and IPv6.
+
+    Examples
+    --------
+    >>> seen = IPv4Bitmap(ip_range('10.0.0.0', '10.2.0.0'))
+    >>> len(seen), seen.nbytes
+    (131072, 16408)
+    >>> seen.contains(['10.1.2.3', '10.2.0.0'])
+    array([ True, False])
+    >>> len(seen & IPv4Bitmap(['10.1.0.1', '192.168.0.1']))
+    1
+    """
+    def __init__(self, values=None):
+        if values is None:
+            values = np.zeros(0, dtype='u4')
+        else:
+            values = _ipv4_values(values)
+        self._set(*_normalize(values, np.zeros(0, dtype='u4'),
+                              _empty_bitmaps()))
+
+    @classmethod
+    def _from_chunks(cls, sparse, keys, bitmaps, counts):
+        result = cls.__new__(cls)
+        result._set(sparse, keys, bitmaps, counts)
+        return result
+
+    def _set(self, sparse, keys, bitmaps, counts):
+        # The addresses of the sparse chunks, sorted.
+        self._sparse = sparse
+        # The upper 16 bits of the bitmap chunks, sorted, their bitmaps,
+        # in np.packbits' bit order, and the number of bits set.
+        self._keys = keys
+        self._bitmaps = bitmaps
+        self._counts = counts
+
+    def __repr__(self):
+        return "IPv4Bitmap(<{} addresses, {} bytes>)".format(len(self),
+                                                             self.nbytes)
+
+    def __len__(self):
+        return len(self._sparse) + int(self._counts.sum())
+
+    def __eq__(self, other):
+        if not isinstance(other, IPv4Bitmap):
+            return NotImplemented
+        return (np.array_equal(self._sparse, other._sparse) and
+                np.array_equal(self._keys, other._keys) and
+                np.array_equal(self._bitmaps, other._bitmaps))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __contains__(self, address):
+        return bool(self.contains(IPArray([address]))[0])
+
+    def __or__(self, other):
+        if not isinstance(other, IPv4Bitmap):
+            return NotImplemented
+        return self.union(other)
+
+    def __and__(self, other):
+        if not isinstance(other, IPv4Bitmap):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        if not isinstance(other, IPv4Bitmap):
+            return NotImplemented
+        return self.difference(other)
+
+    @property
+    def nbytes(self):
+        """The memory used by the set."""
+        return (self._sparse.nbytes + self._keys.nbytes +
+                self._bitmaps.nbytes + self._counts.nbytes)
+
+    # ------------------------------------------------------------------------
+    # Set algebra
+    # ------------------------------------------------------------------------
+
+    def union(self, other):
+        """The addresses in this set or in `other`.
+
+        Parameters
+        ----------
+        other : IPv4Bitmap
+
+        Returns
+        -------
+        IPv4Bitmap
+        """
+        keys = np.union1d(self._keys, other._keys).astype('u4')
+        bitmaps = _empty_bitmaps(len(keys))
+        bitmaps[np.searchsorted(keys, self._keys)] = self._bitmaps
+        bitmaps[np.searchsorted(keys, other._keys)] |= other._bitmaps
+        sparse = np.concatenate([self._sparse, other._sparse])
+        return self._from_chunks(*_normalize(sparse, keys, bitmaps))
+
+    def intersection(self, other):
+        """The addresses in both this set and `other`.
+
+        Parameters
+        ----------
+        other : IPv4Bitmap
+
+        Returns
+        -------
+        IPv4Bitmap
+        """
+        keys, mine, theirs = _intersect(self._keys, other._keys)
+        bitmaps = self._bitmaps[mine] & other._bitmaps[theirs]
+        # Addresses of sparse chunks can only match addresses, so they're
+        # found with lookups.
+        sparse = np.concatenate([
+            self._sparse[other._contains(self._sparse)],
+            other._sparse[self._contains(other._sparse)],
+        ])
+        return self._from_chunks(*_normalize(sparse, keys, bitmaps))
+
+    def difference(self, other):
+        """The addresses in this set but not in `other`.
+
+        Parameters
+        ----------
+        other : IPv4Bitmap
+
+        Returns
+        -------
+        IPv4Bitmap
+        """
+        _, mine, theirs = _intersect(self._keys, other._keys)
+        bitmaps = self._bitmaps.copy()
+        bitmaps[mine] &= ~other._bitmaps[theirs]
+        # Clear the bits of the other's sparse addresses.
+        position = _positions(self._keys)[other._sparse >> 16]
+        in_bitmaps = position >= 0
+        mask = _empty_bitmaps(len(self._keys))
+        _set_bits(mask, position[in_bitmaps],
+                  other._sparse[in_bitmaps] & 0xffff)
+        bitmaps &= ~mask
+
+        sparse = self._sparse[~other._contains(self._sparse)]
+        return self._from_chunks(*_normalize(sparse, self._keys, bitmaps))
+
+    # ------------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------------
+
+    def contains(self, values):
+        """Check whether each address is in the set.
+
+        Parameters
+        ----------
+        values : IPArray, or values accepted by :class:`IPArray`
+
+        Returns
+        -------
+        ndarray[bool]
+            False for IPv6 addresses and the NA address, ``0.0.0.0``.
+        """
+        if not isinstance(values, IPArray):
+            values = IPArray(values)
+        if values.is_compact:
+            return self._contains(values._data)
+        data = values.data
+        is_v4 = (data['hi'] == 0) & (data['lo'] <= _IPv4_MAX)
+        addresses = np.where(is_v4, data['lo'], 0).astype('u4')
+        return self._contains(addresses)
+
+    def _contains(self, addresses):
+        """``contains`` for IPv4 addresses as uint32."""
+        chunks = addresses >> 16
+        found = np.zeros(len(addresses), dtype=bool)
+        if len(self._sparse):
+            # Bisect the addresses of each chunk, at most _ARRAY_MAX, all
+            # at once.
+            counts = np.bincount(self._sparse >> 16, minlength=_CHUNK_SIZE)
+            candidates = np.flatnonzero(counts[chunks])
+            hi = np.cumsum(counts)[chunks[candidates]]
+            lo = hi - counts[chunks[candidates]]
+            wanted = addresses[candidates]
+            last = len(self._sparse) - 1
+            for _ in range(_ARRAY_MAX.bit_length()):
+                mid = (lo + hi) // 2
+                less = (lo < hi) & (self._sparse[np.minimum(mid, last)] <
+                                    wanted)
+                lo, hi = np.where(less, mid + 1, lo), np.where(less, hi, mid)
+            found[candidates] = self._sparse[np.minimum(lo, last)] == wanted
+        if len(self._keys):
+            position = _positions(self._keys)[chunks]
+            in_bitmaps = np.flatnonzero(position >= 0)
+            low = addresses[in_bitmaps] & 0xffff
+            octets = self._bitmaps[position[in_bitmaps], low >> 3]
+            found[in_bitmaps] = (octets << (low & 7)) & 0x80 != 0
+        return found & (addresses != 0)
+
+    # ------------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------------
+
+    def to_array(self):
+        """The addresses of the set.
+
+        Returns
+        -------
+        IPArray
+            Compact, and sorted.
+        """
+        return IPArray._from_ndarray(np.sort(np.concatenate([
+            self._sparse, _unpack(self._keys, self._bitmaps)])))
+
+
+def _ipv4_values(values):
+    """The non-missing IPv4 addresses of `values`, as uint32."""
+    if not isinstance(values, IPArray):
+        values = IPArray(values)
+    if not values.is_compact:
+        if values.is_ipv6.any():
+            raise ValueError("IPv4Bitmap only holds IPv4 addresses.")
+        values = values.compact()
+    values = values._data
+    return values[values != 0]
+
+
+def _empty_bitmaps(n=0):
+    return np.zeros((n, _BITMAP_BYTES), dtype='u1')
+
+
+def _intersect(a, b):
+    """The common keys of two chunk tables, and where they are in each."""
+    keys = np.intersect1d(a, b, assume_unique=True)
+    return keys, np.searchsorted(a, keys), np.searchsorted(b, keys)
+
+
+def _positions(keys):
+    """A table of the row of each chunk's bitmap, or -1."""
+    position = np.full(_CHUNK_SIZE, -1, dtype='i8')
+    position[keys] = np.arange(len(keys))
+    return position
+
+
+def _normalize(addresses, keys, bitmaps):
+    """Arrange addresses and bitmap chunks into the smaller chunk layouts.
+
+    Parameters
+    ----------
+    addresses : ndarray[uint32]
+        Unsorted, maybe repeated, and maybe in the chunks of `keys`.
+    keys : ndarray[uint32]
+        The sorted chunks of `bitmaps`.
+    bitmaps : ndarray[uint8]
+
+    Returns
+    -------
+    sparse, keys, bitmaps, counts
+        As stored by IPv4Bitmap.
+    """
+    chunks = addresses >> 16
+    # Chunks that may be too crowded for an array. Repeats are counted,
+    # so some may not be.
+    crowded = np.flatnonzero(np.bincount(chunks, minlength=_CHUNK_SIZE) >
+                             _ARRAY_MAX).astype('u4')
+    if len(crowded):
+        all_keys = np.union1d(keys, crowded).astype('u4')
+        all_bitmaps = _empty_bitmaps(len(all_keys))
+        all_bitmaps[np.searchsorted(all_keys, keys)] = bitmaps
+        keys, bitmaps = all_keys, all_bitmaps
+    if len(keys):
+        position = _positions(keys)[chunks]
+        in_bitmaps = position >= 0
+        _set_bits(bitmaps, position[in_bitmaps],
+                  addresses[in_bitmaps] & 0xffff)
+        addresses = addresses[~in_bitmaps]
+    sparse = np.unique(addresses).astype('u4')
+
+    # Move chunks with few addresses to the array.
+    counts = _popcount(bitmaps)
+    sparse_chunks = counts <= _ARRAY_MAX
+    if sparse_chunks.any():
+        sparse = np.union1d(sparse, _unpack(keys[sparse_chunks],
+                                            bitmaps[sparse_chunks]))
+        sparse = sparse.astype('u4')
+        keys = keys[~sparse_chunks]
+        bitmaps = bitmaps[~sparse_chunks]
+        counts = counts[~sparse_chunks]
+    return sparse, keys, bitmaps, counts
+
+
+def _set_bits(bitmaps, position, low):
+    """Set the bits for the lower 16 bits `low` in rows `position`."""
+    for first in range(0, len(bitmaps), _PASS_CHUNKS):
+        last = min(first + _PASS_CHUNKS, len(bitmaps))
+        in_pass = (position >= first) & (position < last)
+        flags = np.zeros((last - first) * _CHUNK_SIZE, dtype=bool)
+        flags[(position[in_pass] - first) * _CHUNK_SIZE +
+              low[in_pass]] = True
+        bitmaps[first:last] |= np.packbits(flags).reshape(-1, _BITMAP_BYTES)
+
+
+def _unpack(keys, bitmaps):
+    """The sorted addresses in bitmap chunks, as uint32."""
+    parts = [np.zeros(0, dtype='u4')]
+    for first in range(0, len(bitmaps), _PASS_CHUNKS):
+        bits = np.unpackbits(bitmaps[first:first + _PASS_CHUNKS], axis=1)
+        row, low = np.nonzero(bits)
+        parts.append((keys[first + row].astype('u4') << 16) |
+                     low.astype('u4'))
+    return np.concatenate(parts)
+
+
+def _popcount(bitmaps):
+    """The number of bits set in each bitmap."""
+    counts = np.zeros(len(bitmaps), dtype='i8')
+    for first in range(0, len(bitmaps), _PASS_CHUNKS):
+        words = bitmaps[first:first + _PASS_CHUNKS].view('u8')
+        # Sum the bits of each word in place: pairs, nibbles, then bytes.
+        words = words - ((words >> np.uint64(1)) &
+                         np.uint64(0x5555555555555555))
+        words = ((words & np.uint64(0x3333333333333333)) +
+                 ((words >> np.uint64(2)) & np.uint64(0x3333333333333333)))
+        words = (words + (words >> np.uint64(4))) & np.uint64(
+            0x0f0f0f0f0f0f0f0f)
+        words = (words * np.uint64(0x0101010101010101)) >> np.uint64(56)
+        counts[first:first + _PASS_CHUNKS] = words.sum(axis=1)
+    return counts
@@ -0,0 +1,593 @@
+import functools
+import ipaddress
+
+import six
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionDtype
+from pandas.api.types import infer_dtype, is_scalar
+from pandas import isna
+
+from ._accessor import (DelegatedMethod, DelegatedProperty,
+                        delegated_method)
+from ._utils import combine, factorize_codes, first_positions, pack, unpack
+from .base import NumPyBackedExtensionArrayMixin
+from .ip_array import IPArray, IPType
+
+try:
+    from collections.abc import Iterable
+except ImportError:  # Python 2
+    from collections import Iterable
+
+# IANA protocol numbers with a name in the string form
+_PROTOCOLS = {
+    'icmp': 1,
+    'tcp': 6,
+    'udp': 17,
+    'icmpv6': 58,
+    'sctp': 132,
+}
+_PROTOCOL_NAMES = {number: name for name, number in _PROTOCOLS.items()}
+
+# -----------------------------------------------------------------------------
+# Scalar
+# -----------------------------------------------------------------------------
+
+
+@functools.total_ordering
+class Endpoint(object):
+    """An IP address, port and protocol.
+
+    Parameters
+    ----------
+    address : str, int, or IPv4Address or IPv6Address
+    port : int
+    proto : int, default 0
+        The IANA protocol number, e.g. 6 for TCP. 0 is unspecified.
+
+    Examples
+    --------
+    >>> Endpoint('192.168.1.1', 443, 6)
+    Endpoint('192.168.1.1:443/tcp')
+    """
+    __slots__ = ('address', 'port', 'proto')
+
+    def __init__(self, address, port, proto=0):
+        self.address = ipaddress.ip_address(address)
+        self.port = int(port)
+        self.proto = int(proto)
+
+    def _key(self):
+        return (int(self.address), self.port, self.proto)
+
+    def __eq__(self, other):
+        if not isinstance(other, Endpoint):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __lt__(self, other):
+        if not isinstance(other, Endpoint):
+            return NotImplemented
+        return self._key() < other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __str__(self):
+        if self.address.version == 6:
+            result = u'[{}]:{}'.format(self.address, self.port)
+        else:
+            result = u'{}:{}'.format(self.address, self.port)
+        if self.proto:
+            result += u'/{}'.format(_PROTOCOL_NAMES.get(self.proto,
+                                                        self.proto))
+        return result
+
+    def __repr__(self):
+        return "Endpoint('{}')".format(self)
+
+
+# -----------------------------------------------------------------------------
+# Extension Type
+# -----------------------------------------------------------------------------
+
+
+@pd.api.extensions.register_extension_dtype
+class EndpointType(ExtensionDtype):
+    """Dtype for IP address, port and protocol data."""
+    name = 'endpoint'
+    type = Endpoint
+    kind = 'O'
+    _record_type = np.dtype([('hi', '>u8'), ('lo', '>u8'), ('port', '>u2'),
+                             ('proto', 'u1')])
+    na_value = Endpoint(0, 0)
+
+    @classmethod
+    def construct_from_string(cls, string):
+        if string == cls.name:
+            return cls()
+        else:
+            raise TypeError("Cannot construct a '{}' from "
+                            "'{}'".format(cls, string))
+
+    @classmethod
+    def construct_array_type(cls):
+        return EndpointArray
+
+
+# -----------------------------------------------------------------------------
+# Extension Container
+# -----------------------------------------------------------------------------
+
+
+class EndpointArray(NumPyBackedExtensionArrayMixin):
+    """Holder for IP address, port and protocol triples.
+
+    EndpointArray stores the endpoints of flows, like ``192.168.1.1:443``
+    or ``[2001:db8::1]:53/udp``, in a single packed 19-byte record, so
+    that grouping and merging on endpoints only has to factorize one
+    column.
+
+    The all-zero endpoint ``0.0.0.0:0`` with no protocol is missing.
+    """
+    # The address is stored like IPArray, in 'hi' and 'lo' uint64 fields,
+    # followed by a uint16 'port' and a uint8 'proto'.
+    __array_priority__ = 1000
+    _dtype = EndpointType()
+    _itemsize = 19
+    ndim = 1
+    can_hold_na = True
+
+    def __init__(self, values, dtype=None, copy=False):
+        values = _to_endpoint_array(values)
+        if copy:
+            values = values.copy()
+        self.data = values
+
+    @classmethod
+    def _from_ndarray(cls, data, copy=False):
+        """Zero-copy construction of an EndpointArray from an ndarray.
+
+        Parameters
+        ----------
+        data : ndarray
+            This should have EndpointType._record_type dtype
+        copy : bool, default False
+            Whether to copy the data.
+
+        Returns
+        -------
+        ExtensionArray
+        """
+        if copy:
+            data = data.copy()
+        new = EndpointArray([])
+        new.data = data
+        return new
+
+    @classmethod
+    def from_components(cls, addresses, ports, protos=0):
+        """Construct an EndpointArray from addresses, ports and protocols.
+
+        Parameters
+        ----------
+        addresses : IPArray or sequence
+        ports : int or array-like of int
+        protos : int or array-like of int, default 0
+
+        Returns
+        -------
+        EndpointArray
+
+        Examples
+        --------
+        >>> EndpointArray.from_components(['10.0.0.1', '::1'], [443, 53],
+        ...                               [6, 17])
+        EndpointArray(['10.0.0.1:443/tcp', '[::1]:53/udp'])
+        """
+        addresses = IPArray(addresses)
+        n = len(addresses)
+        ports = np.broadcast_to(np.asarray(ports, dtype='i8'), (n,))
+        protos = np.broadcast_to(np.asarray(protos, dtype='i8'), (n,))
+        if ((ports < 0) | (ports > 65535)).any():
+            raise ValueError("Ports must be between 0 and 65535.")
+        if ((protos < 0) | (protos > 255)).any():
+            raise ValueError("Protocols must be between 0 and 255.")
+        data = np.empty(n, dtype=EndpointType._record_type)
+        data['hi'], data['lo'] = addresses._hi_lo
+        data['port'] = ports
+        data['proto'] = protos
+        return cls._from_ndarray(data)
+
+    # -------------------------------------------------------------------------
+    # Properties
+    # -------------------------------------------------------------------------
+    @property
+    def na_value(self):
+        """The missing value sentinal for endpoints.
+
+        The endpoint ``0.0.0.0:0``, with no protocol, is used.
+        """
+        return self.dtype.na_value
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        indices = np.asarray(indices, dtype='int')
+
+        if allow_fill and fill_value is None:
+            fill_value = self.na_value
+        if allow_fill:
+            fill_value = _to_endpoint_array([fill_value])[0]
+            mask = (indices == -1)
+            if not len(self):
+                if not mask.all():
+                    msg = "Invalid take for empty array. Must be all -1."
+                    raise IndexError(msg)
+                else:
+                    took = np.full(len(indices), fill_value,
+                                   dtype=self.dtype._record_type)
+                    return self._from_ndarray(took)
+            if (indices < -1).any():
+                msg = ("Invalid value in 'indicies'. Must be all >= -1 "
+                       "for 'allow_fill=True'")
+                raise ValueError(msg)
+
+        took = self.data.take(indices)
+        if allow_fill:
+            took[mask] = fill_value
+
+        return self._from_ndarray(took)
+
+    # -------------------------------------------------------------------------
+    # Interfaces
+    # -------------------------------------------------------------------------
+
+    def __repr__(self):
+        formatted = self._format_values()
+        return "EndpointArray({!r})".format(formatted)
+
+    def _format_values(self):
+        return self.to_strings().tolist()
+
+    @staticmethod
+    def _box_scalar(scalar):
+        hi, lo, port, proto = scalar
+        return Endpoint(combine(int(hi), int(lo)), port, proto)
+
+    @property
+    def _parser(self):
+        return EndpointArray
+
+    def __setitem__(self, key, value):
+        value = _to_endpoint_array(value)
+        self.data[key] = value
+
+    def __iter__(self):
+        return iter(self.to_pyendpoints())
+
+    # ------------------------------------------------------------------------
+    # Serializaiton / Export
+    # ------------------------------------------------------------------------
+
+    def to_pyendpoints(self):
+        """Convert the array to a list of :class:`Endpoint` objects."""
+        return [self._box_scalar(x) for x in self.data.tolist()]
+
+    def to_strings(self):
+        """Format the endpoints as strings.
+
+        IPv6 addresses are bracketed, like ``'[::1]:53'``. Named or
+        numeric protocols follow a ``'/'``, like ``'10.0.0.1:443/tcp'``.
+
+        Returns
+        -------
+        ndarray[object]
+        """
+        addresses = self.address
+        formatted = np.array(addresses._format_values(), dtype=object)
+        formatted = np.where(addresses.is_ipv6,
+                             u'[' + formatted + u']', formatted)
+        ports = self.data['port'].astype(str).astype(object)
+        result = formatted + u':' + ports
+
+        protos = self.data['proto']
+        if protos.any():
+            names = np.array([_PROTOCOL_NAMES.get(p, str(p))
+                              for p in range(256)], dtype=object)
+            result = np.where(protos != 0, result + u'/' + names[protos],
+                              result)
+        return result
+
+    def astype(self, dtype, copy=True):
+        if isinstance(dtype, EndpointType):
+            if copy:
+                self = self.copy()
+            return self
+        return super(EndpointArray, self).astype(dtype)
+
+    # ------------------------------------------------------------------------
+    # Ops
+    # ------------------------------------------------------------------------
+
+    def __eq__(self, other):
+        if not isinstance(other, EndpointArray):
+            return NotImplemented
+        mask = self.isna() | other.isna()
+        result = self.data == other.data
+        result[mask] = False
+        return result
+
+    def equals(self, other):
+        if not isinstance(other, EndpointArray):
+            raise TypeError("Cannot compare 'EndpointArray' "
+                            "to type '{}'".format(type(other)))
+        return (self.data == other.data).all()
+
+    def _values_for_factorize(self):
+        # The records as fixed-width bytes. NumPy strips trailing null
+        # bytes, which is still one-to-one for records of the same width.
+        return self.data.view('S19'), b''
+
+    def _codes(self):
+        """Integer codes, in order of first appearance, that are equal
+        exactly where the endpoints are.
+
+        Each field is factorized with pandas' integer hash tables, and the
+        codes combined pairwise, so no Python objects are created.
+        """
+        data = self.data
+        if not len(data):
+            return np.array([], dtype=np.intp)
+        hi = pd.factorize(data['hi'].astype('u8'))[0]
+        lo = pd.factorize(data['lo'].astype('u8'))[0]
+        address = pd.factorize(hi * (lo.max() + 1) + lo)[0]
+        # The codes go in the low bits; pandas' int64 hash is weak on keys
+        # that only differ in their high bits.
+        port_proto = ((data['port'].astype('i8') << 8) |
+                      data['proto'].astype('i8'))
+        return pd.factorize(port_proto * (address.max() + 1) + address)[0]
+
+    def factorize(self, na_sentinel=-1):
+        return factorize_codes(self, self._codes(), na_sentinel)
+
+    def unique(self):
+        return self.take(first_positions(self._codes()))
+
+    def value_counts(self, dropna=True):
+        """Count of each distinct endpoint.
+
+        Parameters
+        ----------
+        dropna : bool, default True
+            Whether to exclude missing values.
+
+        Returns
+        -------
+        Series
+        """
+        codes, uniques = self.factorize()
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        index = uniques.astype(object)
+        if not dropna and (codes == -1).any():
+            counts = np.append(counts, (codes == -1).sum())
+            index = np.append(index, self.na_value)
+        return pd.Series(counts, index=pd.Index(index, dtype=object))
+
+    def isna(self):
+        """Indicator for whether each element is missing.
+
+        The endpoint ``0.0.0.0:0``, with no protocol, is used to indicate
+        missing values.
+        """
+        data = self.data
+        return ((data['hi'] == 0) & (data['lo'] == 0) &
+                (data['port'] == 0) & (data['proto'] == 0))
+
+    # ------------------------------------------------------------------------
+    # Endpoint Specific
+    # ------------------------------------------------------------------------
+
+    @property
+    def address(self):
+        """The IP address of each endpoint, as an IPArray.
+
+        This is a view on the array's data, so no copy is made, unless the
+        records aren't contiguous, as for a slice with a step.
+        """
+        # The address is the first 16 bytes of each record.
+        data = np.ascontiguousarray(self.data)
+        return IPArray._from_ndarray(np.ndarray(
+            len(data), dtype=IPType._record_type, buffer=data,
+            strides=(data.itemsize,)))
+
+    @property
+    def port(self):
+        """The port of each endpoint.
+
+        This is a view on the array's data, so no copy is made.
+        """
+        return self.data['port']
+
+    @property
+    def proto(self):
+        """The IANA protocol number of each endpoint, 0 if unspecified.
+
+        This is a view on the array's data, so no copy is made.
+        """
+        return self.data['proto']
+
+
+def _to_endpoint_array(values):
+    """Convert `values` to an ndarray with EndpointType._record_type."""
+    if isinstance(values, EndpointArray):
+        return values.data
+
+    if (isinstance(values, np.ndarray) and
+            values.dtype == EndpointType._record_type):
+        return np.atleast_1d(values)
+
+    if (isinstance(values, six.string_types + (tuple, Endpoint)) or
+            not isinstance(values, Iterable)):
+        values = [values]
+
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'U':
+        return _parse_endpoint_strings(values)
+    values = list(values)
+    if len(values) and infer_dtype(values, skipna=False) in ('string',
+                                                             'unicode'):
+        return _parse_endpoint_strings(values)
+
+    result = np.zeros(len(values), dtype=EndpointType._record_type)
+    is_str = np.array([isinstance(x, six.string_types) for x in values],
+                      dtype=bool)
+    if is_str.any():
+        result[is_str] = _parse_endpoint_strings(
+            [x for x, s in zip(values, is_str) if s])
+
+    for i in np.flatnonzero(~is_str):
+        value = values[i]
+        if is_scalar(value) and isna(value):
+            continue
+        if isinstance(value, tuple) and len(value) == 4:
+            result[i] = value
+            continue
+        if not isinstance(value, Endpoint):
+            value = Endpoint(*value)
+        result[i] = (unpack(pack(int(value.address))) +
+                     (value.port, value.proto))
+    return result
+
+
+def _parse_endpoint_strings(values):
+    """Parse strings like ``'10.0.0.1:443'``, ``'[::1]:53'`` and
+    ``'10.0.0.1:443/tcp'``.
+
+    The strings are viewed as a 2-D array of character codes. The
+    separators are located in bulk, and the address, port and protocol
+    cut out as new arrays of strings.
+    """
+    from .parser import _parse_ip_strings
+
+    values = np.asarray(values, dtype='U')
+    n = len(values)
+    width = max(values.dtype.itemsize // 4, 1)
+    codes = np.ascontiguousarray(values).view('u4').reshape(n, width)
+    rows = np.arange(n)
+    length = (codes != 0).sum(axis=1)
+
+    # The last ':' comes before the port, and the first '/' before the
+    # protocol.
+    is_colon = codes == ord(':')
+    has_colon = is_colon.any(axis=1)
+    colon = np.where(has_colon, width - 1 - is_colon[:, ::-1].argmax(axis=1),
+                     0)
+    is_slash = codes == ord('/')
+    has_slash = is_slash.any(axis=1)
+    slash = np.where(has_slash, is_slash.argmax(axis=1), length)
+    bracketed = ((codes[:, 0] == ord('[')) &
+                 (codes[rows, np.maximum(colon - 1, 0)] == ord(']')))
+
+    addresses = _substrings(codes, bracketed.astype(int), colon - bracketed)
+    ports = _substrings(codes, colon + 1, slash)
+    protos = _substrings(codes, slash + 1, length)
+
+    port_codes = ports.view('u4').reshape(n, -1)
+    # An IPv6 address must be bracketed, so that its last group isn't
+    # mistaken for the port.
+    invalid = (~has_colon | (slash < colon) | (colon == 0) |
+               (~bracketed & (is_colon.sum(axis=1) > 1)) |
+               (ports == '') | (has_slash & (protos == '')) |
+               ~((port_codes == 0) |
+                 ((port_codes >= ord('0')) & (port_codes <= ord('9')))
+                 ).all(axis=1))
+    if invalid.any():
+        raise ValueError("Could not parse {!r} as an endpoint. IPv6 "
+                         "addresses must be bracketed, like "
+                         "'[::1]:53'.".format(values[invalid][0]))
+
+    # There are only a handful of distinct protocols
+    names, inverse = np.unique(protos, return_inverse=True)
+    numbers = []
+    for name in names:
+        if not name:
+            numbers.append(0)
+        elif name.isdigit():
+            numbers.append(int(name))
+        elif name.lower() in _PROTOCOLS:
+            numbers.append(_PROTOCOLS[name.lower()])
+        else:
+            raise ValueError("Unknown protocol '{}'.".format(name))
+
+    # Ports have at most 5 digits, and more could overflow below.
+    too_long = (port_codes != 0).sum(axis=1) > 5
+    if too_long.any():
+        raise ValueError("Could not parse {!r} as an endpoint. The port has "
+                         "more than 5 digits.".format(values[too_long][0]))
+
+    port_numbers = np.zeros(n, dtype='i8')
+    for column in port_codes.T.astype('i8'):
+        port_numbers = np.where(column != 0,
+                                port_numbers * 10 + column - ord('0'),
+                                port_numbers)
+
+    addresses = IPArray._from_ndarray(_parse_ip_strings(addresses))
+    return EndpointArray.from_components(
+        addresses, port_numbers, np.array(numbers, dtype='i8')[inverse]).data
+
+
+def _substrings(codes, start, stop):
+    """Cut ``[start, stop)`` out of each row of a 2-D array of character
+    codes, returning an array of strings."""
+    n, width = codes.shape
+    lengths = np.maximum(stop - start, 0)
+    out_width = max(lengths.max() if n else 0, 1)
+    offsets = np.arange(out_width)
+    index = np.minimum(start[:, None] + offsets, width - 1)
+    chars = codes[np.arange(n)[:, None], index]
+    chars[offsets >= lengths[:, None]] = 0
+    return np.ascontiguousarray(chars).view('U{}'.format(out_width)).ravel()
+
+
+# -----------------------------------------------------------------------------
+# Accessor
+# -----------------------------------------------------------------------------
+
+
+@pd.api.extensions.register_series_accessor("endpoint")
+class EndpointAccessor:
+
+    address = DelegatedProperty("address")
+    port = DelegatedProperty("port")
+    proto = DelegatedProperty("proto")
+
+    isna = DelegatedMethod("isna")
+    to_pyendpoints = DelegatedMethod("to_pyendpoints")
+
+    def __init__(self, obj):
+        self._validate(obj)
+        self._data = obj.values
+        self._index = obj.index
+        self._name = obj.name
+
+    @staticmethod
+    def _validate(obj):
+        if not is_endpoint_type(obj):
+            raise AttributeError("Cannot use 'endpoint' accessor on objects "
+                                 "of dtype '{}'.".format(obj.dtype))
+
+    def to_strings(self):
+        return delegated_method(self._data.to_strings, self._index,
+                                self._name)
+
+
+def is_endpoint_type(obj):
+    t = getattr(obj, 'dtype', obj)
+    try:
+        return isinstance(t, EndpointType) or issubclass(t, EndpointType)
+    except Exception:
+        return False
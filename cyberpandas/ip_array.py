@@ -1,17 +1,18 @@
 import abc
 import collections
 import ipaddress
+import operator
 
 import six
 import numpy as np
 import pandas as pd
-from pandas.api.extensions import ExtensionDtype
+from pandas.api.extensions import ExtensionDtype, take
 
 from ._accessor import (DelegatedMethod, DelegatedProperty,
                         delegated_method)
-from ._utils import combine, pack, unpack
+from ._utils import combine, pack, unpack, lt128, le128
 from .base import NumPyBackedExtensionArrayMixin
-from .common import _U8_MAX, _IPv4_MAX
+from .common import _IPv4_MAX
 from .parser import _to_ipaddress_pyint, _as_ip_object
 
 # -----------------------------------------------------------------------------
@@ -35,6 +36,7 @@ class IPType(ExtensionDtype):
     type = IPv4v6Base
     kind = 'O'
     _record_type = np.dtype([('hi', '>u8'), ('lo', '>u8')])
+    _compact_type = np.dtype('u4')
     na_value = ipaddress.IPv4Address(0)
 
     @classmethod
@@ -49,6 +51,36 @@ class IPType(ExtensionDtype):
     def construct_array_type(cls):
         return IPArray
 
+    def __from_arrow__(self, array):
+        """Construct an IPArray from a pyarrow Array or ChunkedArray.
+
+        The addresses are not copied when `array` is a single chunk
+        without nulls.
+        """
+        from ._arrow import ip_from_arrow
+
+        return IPArray._from_ndarray(ip_from_arrow(array))
+
+
+# The file format of IPArray.to_file is a fixed size header followed by the
+# array's data, exactly as it's laid out in memory. The data is the last
+# thing in the file so that it can be memory mapped.
+_FILE_MAGIC = b'\x93CYBERIP'
+_FILE_VERSION = 1
+_FILE_HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u2'),
+    ('layout', 'u1'),
+    ('pad', 'V5'),
+    ('length', '<u8'),
+    ('reserved', 'V8'),
+])
+# layout -> on disk dtype. Compact addresses are stored little-endian.
+_FILE_LAYOUTS = {
+    0: IPType._record_type,
+    1: np.dtype('<u4'),
+}
+
 
 # -----------------------------------------------------------------------------
 # Extension Container
@@ -63,27 +95,106 @@ class IPArray(NumPyBackedExtensionArrayMixin):
     :class:`pandas.Series` and :class:`pandas.DataFrame`.
 
     See :ref:`usage` for more.
+
+    Parameters
+    ----------
+    values : int, str, bytes, or sequence of those
+    dtype : IPType, optional
+    copy : bool, default False
+    compact : bool, default False
+        Whether to store the addresses in 4 bytes each when they are
+        all IPv4 addresses. See :meth:`IPArray.compact`.
     """
     # A note on the internal data layout. IPv6 addresses require 128 bits,
     # which is more than a uint64 can store. So we use a NumPy structured array
     # with two fields, 'hi', 'lo' to store the data. Each field is a uint64.
     # The 'hi' field contains upper 64 bits. The think this is correct since
     # all IP traffic is big-endian.
+    #
+    # Arrays of only IPv4 addresses may instead use a 'compact' layout, a
+    # uint32 ndarray holding the addresses (IPType._compact_type). That's
+    # a quarter of the memory. Compact arrays are promoted to the 128-bit
+    # layout, in place when possible, as soon as an IPv6 address is written
+    # to them.
+    # ``self.data`` always has the 128-bit layout; for compact arrays it's
+    # a read-only copy, so internally we work on ``self._data``, or on
+    # ``self._hi_lo``, wherever the layout allows it.
     __array_priority__ = 1000
     _dtype = IPType()
     _itemsize = 16
     ndim = 1
     can_hold_na = True
 
-    def __init__(self, values, dtype=None, copy=False):
+    def __init__(self, values, dtype=None, copy=False, compact=False):
         from .parser import _to_ip_array
 
-        values = _to_ip_array(values)  # TODO: avoid potential copy
+        if isinstance(values, IPArray):
+            values = values._data
+        else:
+            values = _to_ip_array(values)  # TODO: avoid potential copy
         # TODO: dtype?
-        if copy:
+        if compact and values.dtype != IPType._compact_type:
+            values = _narrow(values)
+        elif copy:
             values = values.copy()
         self.data = values
 
+    @property
+    def data(self):
+        """The addresses as an ndarray with IPType._record_type.
+
+        For compact arrays, this is a read-only copy in the 128-bit layout,
+        made on each access, so take it once rather than in a loop. Set
+        addresses through the IPArray instead, as in
+        ``arr[0] = '10.0.0.1'``.
+        """
+        data = self._data
+        if data.dtype == IPType._compact_type:
+            data = _widen(data)
+            data.flags.writeable = False
+        return data
+
+    @data.setter
+    def data(self, values):
+        self._data = values
+
+    @property
+    def _storage(self):
+        return self._data
+
+    @property
+    def is_compact(self):
+        """Whether the addresses are stored in 4 bytes each.
+
+        See Also
+        --------
+        IPArray.compact
+        """
+        return self._data.dtype == IPType._compact_type
+
+    def compact(self):
+        """Store the addresses in 4 bytes each, if possible.
+
+        Arrays containing only IPv4 addresses can be stored as uint32s rather
+        than 128-bit integers. Compact arrays are promoted to the 128-bit
+        layout when an IPv6 address is set.
+
+        Returns
+        -------
+        IPArray
+            A compact array when all the addresses are IPv4 addresses,
+            otherwise a copy of `self`.
+
+        Examples
+        --------
+        >>> arr = IPArray(['192.168.1.1', '192.168.1.2'])
+        >>> arr.nbytes
+        32
+        >>> arr.compact().nbytes
+        8
+        """
+        return self._from_ndarray(_narrow(self._data))
+
     @classmethod
     def from_pyints(cls, values):
         """Construct an IPArray from a sequence of Python integers.
@@ -104,7 +215,7 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         return cls(_to_ipaddress_pyint(values))
 
     @classmethod
-    def from_bytes(cls, bytestring):
+    def from_bytes(cls, bytestring, encoding=None, start=None, stop=None):
         r"""Create an IPArray from a bytestring.
 
         Parameters
@@ -113,6 +224,12 @@ class IPArray(NumPyBackedExtensionArrayMixin):
             Note that bytestring is a Python 3-style string of bytes,
             not a sequences of bytes where each element represents an
             IPAddress.
+        encoding : {None, 'delta'}
+            The encoding passed to :meth:`IPArray.to_bytes`.
+        start, stop : int, optional
+            Only read the addresses in this range, as in a slice. With
+            ``encoding='delta'``, only the blocks holding them are
+            decoded.
 
         Returns
         -------
@@ -127,12 +244,78 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         >>> IPArray.from_bytes(buf)
         IPArray(['0.0.0.10', '0.0.0.20'])
 
+        >>> buf = arr.to_bytes(encoding='delta')
+        >>> IPArray.from_bytes(buf, encoding='delta', start=1)
+        IPArray(['0.0.0.20'])
+
         See Also
         --------
         to_bytes
         from_pyints
         """
+        if encoding == 'delta':
+            from ._delta import decode
+
+            return cls._from_ndarray(decode(bytestring, start, stop))
+        elif encoding is not None:
+            raise ValueError("Unknown encoding '{}'. Use None or "
+                             "'delta'.".format(encoding))
         data = np.frombuffer(bytestring, dtype=IPType._record_type)
+        if start is not None or stop is not None:
+            data = data[start:stop]
+        return cls._from_ndarray(data)
+
+    @classmethod
+    def from_file(cls, path, mmap=True):
+        """Read an IPArray written by :meth:`IPArray.to_file`.
+
+        Parameters
+        ----------
+        path : str
+        mmap : bool, default True
+            Whether to memory map the file rather than reading it. Mapping
+            is nearly instant regardless of the size of the file, and
+            processes mapping the same file share its pages. Memory mapped
+            arrays are read-only; use :meth:`IPArray.copy` for a writeable
+            copy.
+
+        Returns
+        -------
+        IPArray
+
+        See Also
+        --------
+        to_file
+        """
+        with open(path, 'rb') as f:
+            header = np.frombuffer(f.read(_FILE_HEADER.itemsize),
+                                   dtype=_FILE_HEADER)
+            if len(header) != 1 or header['magic'][0] != _FILE_MAGIC:
+                raise ValueError("'{}' is not an IPArray file.".format(path))
+            header = header[0]
+            if header['version'] > _FILE_VERSION:
+                raise ValueError("Unsupported IPArray file version "
+                                 "'{}'.".format(header['version']))
+            dtype = _FILE_LAYOUTS.get(header['layout'])
+            if dtype is None:
+                raise ValueError("Unknown IPArray file layout "
+                                 "'{}'.".format(header['layout']))
+            length = int(header['length'])
+
+            if mmap and length:
+                data = np.memmap(f, dtype=dtype, mode='r',
+                                 offset=_FILE_HEADER.itemsize,
+                                 shape=(length,))
+                # A plain ndarray view. The mapping stays open through its
+                # base.
+                data = data.view(np.ndarray)
+            else:
+                data = np.fromfile(f, dtype=dtype, count=length)
+            if len(data) != length:
+                raise ValueError("'{}' is truncated.".format(path))
+
+        if dtype.kind == 'u' and not dtype.isnative:
+            data = data.astype(IPType._compact_type)
         return cls._from_ndarray(data)
 
     @classmethod
@@ -142,7 +325,8 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         Parameters
         ----------
         data : ndarray
-            This should have IPType._record_type dtype
+            This should have IPType._record_type dtype, or
+            IPType._compact_type for a compact array.
         copy : bool, default False
             Whether to copy the data.
 
@@ -159,7 +343,20 @@ class IPArray(NumPyBackedExtensionArrayMixin):
     @property
     def _as_u8(self):
         """A 2-D view on our underlying data, for bit-level manipulation."""
-        return self.data.view("<u8").reshape(-1, 1)
+        return np.ascontiguousarray(self.data).view("<u8").reshape(-1, 1)
+
+    @property
+    def _hi_lo(self):
+        """The upper and lower 64 bits of each address.
+
+        For compact arrays, these are computed from the 32-bit storage
+        rather than from :attr:`IPArray.data`, and the upper bits are a
+        read-only view of a single zero.
+        """
+        if self.is_compact:
+            return (np.broadcast_to(np.uint64(0), self.shape),
+                    self._data.astype('u8'))
+        return self._data['hi'], self._data['lo']
 
     # -------------------------------------------------------------------------
     # Properties
@@ -177,6 +374,62 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         """
         return self.dtype.na_value
 
+    @property
+    def shape(self):
+        return (len(self._data),)
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    def __getitem__(self, *args):
+        if not self.is_compact:
+            return super(IPArray, self).__getitem__(*args)
+        result = self._data.__getitem__(*args)
+        if np.ndim(result) == 0:
+            return ipaddress.IPv4Address(int(result))
+        return self._from_ndarray(result)
+
+    def copy(self, deep=False):
+        return self._from_ndarray(self._data.copy())
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        if all(array.is_compact for array in to_concat):
+            return cls._from_ndarray(
+                np.concatenate([array._data for array in to_concat]))
+        return cls._from_ndarray(
+            np.concatenate([array.data for array in to_concat]))
+
+    def argsort(self, axis=-1, kind='quicksort', order=None):
+        return self._data.argsort()
+
+    def unique(self):
+        _, indices = np.unique(self._data, return_index=True)
+        data = self._data.take(np.sort(indices))
+        return self._from_ndarray(data)
+
+    def value_counts(self, dropna=True):
+        """Count of each distinct address.
+
+        Parameters
+        ----------
+        dropna : bool, default True
+            Whether to exclude the NA address (``0.0.0.0``).
+
+        Returns
+        -------
+        Series
+            The counts, indexed by the addresses, in order of address.
+        """
+        values = self[~self.isna()] if dropna else self
+        uniques, counts = np.unique(values._data, return_counts=True)
+        index = self._from_ndarray(uniques).astype(object)
+        return pd.Series(counts, index=pd.Index(index, dtype=object))
+
     def take(self, indices, allow_fill=False, fill_value=None):
         # Can't use pandas' take yet
         # 1. axis
@@ -188,6 +441,17 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         elif allow_fill and not isinstance(fill_value, tuple):
             fill_value = unpack(pack(int(fill_value)))
 
+        if self.is_compact and (not allow_fill or
+                                (fill_value[0] == 0 and
+                                 fill_value[1] <= _IPv4_MAX)):
+            # The result stays compact
+            if allow_fill:
+                fill_value = fill_value[1]
+            took = take(self._data, indices, allow_fill=allow_fill,
+                        fill_value=fill_value)
+            return self._from_ndarray(took.astype(IPType._compact_type,
+                                                  copy=False))
+
         if allow_fill:
             mask = (indices == -1)
             if not len(self):
@@ -204,7 +468,10 @@ class IPArray(NumPyBackedExtensionArrayMixin):
                        "for 'allow_fill=True'")
                 raise ValueError(msg)
 
-        took = self.data.take(indices)
+        if self.is_compact:
+            took = _widen(self._data.take(indices))
+        else:
+            took = self._data.take(indices)
         if allow_fill:
             took[mask] = fill_value
 
@@ -219,23 +486,17 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         return "IPArray({!r})".format(formatted)
 
     def _format_values(self):
-        formatted = []
-        # TODO: perf
-        for i in range(len(self)):
-            hi, lo = self.data[i]
-            if lo == -1:
-                formatted.append("NA")
-            elif hi == 0 and lo <= _IPv4_MAX:
-                formatted.append(ipaddress.IPv4Address._string_from_ip_int(
-                    int(lo)))
-            elif hi == 0:
-                formatted.append(ipaddress.IPv6Address._string_from_ip_int(
-                    int(lo)))
-            else:
-                # TODO:
-                formatted.append(ipaddress.IPv6Address._string_from_ip_int(
-                    (int(hi) << 64) + int(lo)))
-        return formatted
+        if self.is_compact:
+            return _format_ipv4(self._data).tolist()
+        data = self.data
+        is_v4 = (data['hi'] == 0) & (data['lo'] <= _IPv4_MAX)
+        formatted = np.empty(len(self), dtype=object)
+        formatted[is_v4] = _format_ipv4(data['lo'][is_v4])
+        for i in np.flatnonzero(~is_v4):
+            hi, lo = data[i]
+            formatted[i] = ipaddress.IPv6Address._string_from_ip_int(
+                (int(hi) << 64) + int(lo))
+        return formatted.tolist()
 
     @staticmethod
     def _box_scalar(scalar):
@@ -250,7 +511,33 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         from .parser import to_ipaddress
 
         value = to_ipaddress(value).data
-        self.data[key] = value
+        if self.is_compact:
+            if ((value['hi'] == 0) & (value['lo'] <= _IPv4_MAX)).all():
+                self._data[key] = value['lo']
+                return
+            self._promote()
+        self._data[key] = value
+
+    def _promote(self):
+        """Convert compact storage to the 128-bit layout.
+
+        The buffer is resized in place when we own it and nothing else
+        refers to it. Otherwise, e.g. for slices or unpickled arrays, the
+        data is replaced by a widened copy, which no longer shares memory
+        with other arrays.
+        """
+        n = len(self._data)
+        try:
+            # Only through the attribute: another reference fails the check
+            self._data.resize(4 * n, refcheck=True)
+        except ValueError:
+            self._data = _widen(self._data)
+            return
+        values = self._data[:n].copy()
+        wide = self._data.view(IPType._record_type)
+        wide['hi'] = 0
+        wide['lo'] = values
+        self._data = wide
 
     def __iter__(self):
         return iter(self.to_pyipaddress())
@@ -300,14 +587,36 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         >>> IPArray(['192.168.1.1', '2001:db8::1000']).to_pyints()
         [3232235777, 42540766411282592856903984951653830656]
         """
-        return [combine(*map(int, x)) for x in self.data]
+        if self.is_compact:
+            return self._data.tolist()
+        hi, lo = self._hi_lo
+        return (hi.astype(object) * 2 ** 64 + lo.astype(object)).tolist()
 
-    def to_bytes(self):
+    def to_bytes(self, encoding=None, block_size=None):
         r"""Serialize the IPArray as a Python bytestring.
 
         This and :meth:IPArray.from_bytes is the fastest way to roundtrip
         serialize and de-serialize an IPArray.
 
+        Parameters
+        ----------
+        encoding : {None, 'delta'}
+            By default, each address is written as 16 bytes. With
+            ``'delta'``, the addresses are split into blocks, and each
+            block stores its addresses as offsets from the previous
+            address, when the block is sorted, or from the block's
+            smallest address, in as few bytes as they need. Sorted or
+            clustered addresses take a byte or two each.
+        block_size : int, optional
+            The number of addresses per block, for ``encoding='delta'``.
+            4096 by default. Smaller blocks adapt better to the data and
+            make reading a range of addresses cheaper, at 32 bytes per
+            block.
+
+        Returns
+        -------
+        bytes
+
         See Also
         --------
         IPArray.from_bytes
@@ -317,9 +626,58 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         >>> arr = IPArray([10, 20])
         >>> arr.to_bytes()
         b'\x00\x00\...x00\x02'
+        >>> len(ip_range(2 ** 20).to_bytes(encoding='delta'))
+        1056800
         """
+        if encoding == 'delta':
+            from ._delta import DEFAULT_BLOCK_SIZE, encode
+
+            hi, lo = self._hi_lo
+            return encode(hi, lo, block_size or DEFAULT_BLOCK_SIZE)
+        elif encoding is not None:
+            raise ValueError("Unknown encoding '{}'. Use None or "
+                             "'delta'.".format(encoding))
+        elif block_size is not None:
+            raise ValueError("'block_size' only applies to "
+                             "encoding='delta'.")
         return self.data.tobytes()
 
+    def to_file(self, path):
+        """Write the IPArray to a file, for :meth:`IPArray.from_file`.
+
+        The file is a 32 byte header, holding the format version, the
+        length of the array and its layout, followed by the addresses as
+        they're stored in memory. Compact arrays stay compact.
+
+        Parameters
+        ----------
+        path : str
+
+        See Also
+        --------
+        from_file
+        """
+        layout = int(self.is_compact)
+        header = np.zeros(1, dtype=_FILE_HEADER)
+        header['magic'] = _FILE_MAGIC
+        header['version'] = _FILE_VERSION
+        header['layout'] = layout
+        header['length'] = len(self)
+        with open(path, 'wb') as f:
+            f.write(header.tobytes())
+            self._data.astype(_FILE_LAYOUTS[layout], copy=False).tofile(f)
+
+    def __arrow_array__(self, type=None):
+        """Convert to a pyarrow ExtensionArray.
+
+        The addresses are stored as ``fixed_size_binary(16)`` in network
+        byte order, or as ``uint32`` for compact arrays, sharing memory
+        with this array.
+        """
+        from ._arrow import ip_to_arrow
+
+        return ip_to_arrow(self._data, type=type)
+
     def astype(self, dtype, copy=True):
         if isinstance(dtype, IPType):
             if copy:
@@ -331,33 +689,35 @@ class IPArray(NumPyBackedExtensionArrayMixin):
     # Ops
     # ------------------------------------------------------------------------
 
+    def _compare(self, other, op, op128):
+        # Compact arrays are compared directly, everything else is compared
+        # as 128-bit integers.
+        if self.is_compact and other.is_compact:
+            a, b = self._data, other._data
+            result = op(a, b)
+            mask = (a == 0) | (b == 0)
+        else:
+            result = op128(*(self._hi_lo + other._hi_lo))
+            mask = self.isna() | other.isna()
+        result[mask] = False
+        return result
+
     def __eq__(self, other):
         # TDOO: scalar ipaddress
         if not isinstance(other, IPArray):
             return NotImplemented
-        mask = self.isna() | other.isna()
-        result = self.data == other.data
-        result[mask] = False
-        return result
+        return self._compare(other, operator.eq, _eq128)
 
     def __lt__(self, other):
         # TDOO: scalar ipaddress
         if not isinstance(other, IPArray):
             return NotImplemented
-        mask = self.isna() | other.isna()
-        result = ((self.data['hi'] <= other.data['hi']) &
-                  (self.data['lo'] < other.data['lo']))
-        result[mask] = False
-        return result
+        return self._compare(other, operator.lt, lt128)
 
     def __le__(self, other):
         if not isinstance(other, IPArray):
             return NotImplemented
-        mask = self.isna() | other.isna()
-        result = ((self.data['hi'] <= other.data['hi']) &
-                  (self.data['lo'] <= other.data['lo']))
-        result[mask] = False
-        return result
+        return self._compare(other, operator.le, le128)
 
     def __gt__(self, other):
         if not isinstance(other, IPArray):
@@ -374,7 +734,12 @@ class IPArray(NumPyBackedExtensionArrayMixin):
             raise TypeError("Cannot compare 'IPArray' "
                             "to type '{}'".format(type(other)))
         # TODO: missing
-        return (self.data == other.data).all()
+        if self.is_compact and other.is_compact:
+            return (self._data == other._data).all()
+        if self.is_compact or other.is_compact:
+            return (len(self) == len(other) and
+                    _eq128(*(self._hi_lo + other._hi_lo)).all())
+        return (self._data == other._data).all()
 
     def _values_for_factorize(self):
         return self.astype(object), ipaddress.IPv4Address(0)
@@ -389,6 +754,8 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         >>> IPArray(['0.0.0.0', '192.168.1.1']).isna()
         array([ True, False])
         """
+        if self.is_compact:
+            return self._data == 0
         ips = self.data
         return (ips['lo'] == 0) & (ips['hi'] == 0)
 
@@ -431,49 +798,31 @@ class IPArray(NumPyBackedExtensionArrayMixin):
 
         >>> s.isin(['192.168.1.1', '192.168.1.2', '255.255.255.1']])
         array([ True, False])
-        """
-        box = (isinstance(other, str) or
-               not isinstance(other, (IPArray, collections.Sequence)))
-        if box:
-            other = [other]
 
-        networks = []
-        addresses = []
+        Comparison to an :class:`IPSet`, which is parsed and merged once
+        for many lookups
 
-        if not isinstance(other, IPArray):
-            for net in other:
-                net = _as_ip_object(net)
-                if isinstance(net, (ipaddress.IPv4Network,
-                                    ipaddress.IPv6Network)):
-                    networks.append(net)
-                if isinstance(net, (ipaddress.IPv4Address,
-                                    ipaddress.IPv6Address)):
-                    addresses.append(ipaddress.IPv6Network(net))
-        else:
-            addresses = other
+        >>> s.isin(IPSet(['192.168.1.0/24', '10.0.0.0/8']))
+        array([ True, False])
+        """
+        from .ipset import IPSet
 
-        # Flatten all the addresses
-        addresses = IPArray(addresses)  # TODO: think about copy=False
+        if isinstance(other, IPSet):
+            return other.contains(self)
+        return self._isin(*_split_isin_values(other))
 
-        mask = np.zeros(len(self), dtype='bool')
-        for network in networks:
-            mask |= self._isin_network(network)
+    def _isin(self, networks, addresses):
+        """Check for membership in networks and an IPArray of addresses.
 
+        The parsed form of ``isin``'s argument, from
+        :func:`_split_isin_values`.
+        """
+        mask = networks.contains(self)
         # no... we should flatten this.
-        mask |= self._isin_addresses(addresses)
+        if len(addresses):
+            mask |= self._isin_addresses(addresses)
         return mask
 
-    def _isin_network(self, other):
-        """Check whether an array of addresses is contained in a network."""
-        # A network is bounded below by 'network_address' and
-        # above by 'broadcast_address'.
-        # IPArray handles comparisons between arrays of addresses, and NumPy
-        # handles broadcasting.
-        net_lo = type(self)([other.network_address])
-        net_hi = type(self)([other.broadcast_address])
-
-        return (net_lo <= self) & (self <= net_hi)
-
     def _isin_addresses(self, other):
         """Check whether elements of self are present in other."""
         from pandas.core.algorithms import isin
@@ -488,14 +837,18 @@ class IPArray(NumPyBackedExtensionArrayMixin):
     def is_ipv4(self):
         """Indicator for whether each address fits in the IPv4 space."""
         # TODO: NA should be NA
+        if self.is_compact:
+            return np.ones(len(self), dtype=bool)
         ips = self.data
-        return (ips['hi'] == 0) & (ips['lo'] < _U8_MAX)
+        return (ips['hi'] == 0) & (ips['lo'] <= _IPv4_MAX)
 
     @property
     def is_ipv6(self):
         """Indicator for whether each address requires IPv6."""
+        if self.is_compact:
+            return np.zeros(len(self), dtype=bool)
         ips = self.data
-        return (ips['hi'] > 0) | (ips['lo'] > _U8_MAX)
+        return (ips['hi'] > 0) | (ips['lo'] > _IPv4_MAX)
 
     @property
     def version(self):
@@ -556,20 +909,26 @@ class IPArray(NumPyBackedExtensionArrayMixin):
 
     def _apply_mask(self, op, v4_prefixlen, v6_prefixlen):
         """Apply a netmask or hostmask"""
-        self = self.copy()
+        if self.is_compact:
+            v4_net = getattr(
+                ipaddress.ip_network(u'0.0.0.0/{}'.format(v4_prefixlen)),
+                op)
+            return self._from_ndarray(np.full(len(self), int(v4_net),
+                                              dtype=IPType._compact_type))
+        data = self.data.copy()
         is_v4 = self.is_ipv4
         v4_net = getattr(
             ipaddress.ip_network(u'0.0.0.0/{}'.format(v4_prefixlen)),
             op)
         v4_mask = IPArray([v4_net])
-        self.data[is_v4] = v4_mask.data
+        data[is_v4] = v4_mask.data
 
         v6_net = getattr(
             ipaddress.ip_network(u'0::0/{}'.format(v6_prefixlen)),
             op)
         v6_mask = IPArray([v6_net])
-        self.data[~is_v4] = v6_mask.data
-        return self
+        data[~is_v4] = v6_mask.data
+        return self._from_ndarray(data)
 
     def netmask(self, v4_prefixlen=32, v6_prefixlen=128):
         """Compute an array of netmasks for an array of IP addresses.
@@ -653,6 +1012,8 @@ class IPArray(NumPyBackedExtensionArrayMixin):
         IPArray(['216.3.128.0', '192.168.100.0'])
         """
         mask = type(self)(mask)
+        if self.is_compact and mask.is_compact:
+            return self._from_ndarray(self._data & mask._data)
         a = self._as_u8
         b = mask._as_u8
         masked = np.bitwise_and(a, b).ravel().view(self.dtype._record_type)
@@ -710,6 +1071,104 @@ class IPAccessor:
                                 other)
 
 
+def _split_isin_values(other):
+    """Parse the argument of :meth:`IPArray.isin`.
+
+    Returns
+    -------
+    networks : IPSet
+    addresses : IPArray
+    """
+    from .ipset import IPSet
+
+    box = (isinstance(other, str) or
+           not isinstance(other, (IPArray, collections.Sequence)))
+    if box:
+        other = [other]
+
+    networks = []
+    addresses = []
+
+    if not isinstance(other, IPArray):
+        for net in other:
+            net = _as_ip_object(net)
+            if isinstance(net, (ipaddress.IPv4Network,
+                                ipaddress.IPv6Network)):
+                networks.append(net)
+            if isinstance(net, (ipaddress.IPv4Address,
+                                ipaddress.IPv6Address)):
+                addresses.append(net)
+    else:
+        addresses = other
+
+    # Flatten all the addresses
+    addresses = IPArray(addresses)  # TODO: think about copy=False
+    return IPSet(networks), addresses
+
+
+def _widen(data):
+    """Convert compact data to the 128-bit layout."""
+    wide = np.zeros(len(data), dtype=IPType._record_type)
+    wide['lo'] = data
+    return wide
+
+
+def _narrow(data):
+    """Convert 128-bit data to the compact layout, if possible."""
+    if data.dtype == IPType._compact_type:
+        return data.copy()
+    if ((data['hi'] == 0) & (data['lo'] <= _IPv4_MAX)).all():
+        return data['lo'].astype(IPType._compact_type)
+    return data.copy()
+
+
+def _octet_digits():
+    digits = np.zeros((256, 3), dtype='u1')
+    for i in range(256):
+        octet = str(i).encode('ascii')
+        digits[i, :len(octet)] = bytearray(octet)
+    lengths = np.array([len(str(i)) for i in range(256)])
+    return digits, lengths
+
+
+# The decimal digits of each octet value, padded with zeros, and how many
+# there are.
+_OCTET_DIGITS, _OCTET_LENGTHS = _octet_digits()
+
+
+def _format_ipv4(values):
+    """Vectorized formatting of IPv4 addresses as dotted quads.
+
+    Parameters
+    ----------
+    values : ndarray
+        IPv4 addresses as unsigned integers.
+
+    Returns
+    -------
+    ndarray[str]
+    """
+    values = np.asarray(values, dtype='u8')
+    n = len(values)
+    # Each octet writes all three of its digit slots, and the unused ones
+    # are overwritten by the following dot and octet.
+    chars = np.zeros((n, 15), dtype='u1')
+    rows = np.arange(n)[:, None]
+    pos = np.zeros(n, dtype=np.intp)
+    for shift in (24, 16, 8, 0):
+        octets = ((values >> np.uint64(shift)) & np.uint64(0xff)).astype('i8')
+        if shift != 24:
+            chars[rows[:, 0], pos] = ord('.')
+            pos += 1
+        chars[rows, pos[:, None] + np.arange(3)] = _OCTET_DIGITS[octets]
+        pos += _OCTET_LENGTHS[octets]
+    return chars.astype('u4').view('U15').ravel()
+
+
+def _eq128(ahi, alo, bhi, blo):
+    return (ahi == bhi) & (alo == blo)
+
+
 def is_ipaddress_type(obj):
     t = getattr(obj, 'dtype', obj)
     try:
@@ -1,18 +1,18 @@
 import ipaddress
 
 import numpy as np
+import pandas as pd
 import six
 
-from .ip_array import IPArray
+from ._utils import (add128, sub128, lt128, le128, bit_length128,
+                     trailing_zeros128, pow2_128, prefix_masks,
+                     ordered_frame)
+from .ip_array import IPArray, IPType
+from .iprange import IPRange
+from .network_array import IPNetworkArray, _records
 from .common import _U8_MAX
 
 
-def _as_int(ip):
-    if isinstance(ip, six.string_types):
-        ip = ipaddress.ip_address(ip)
-    return int(ip)
-
-
 def _crosses_boundary(lo, hi):
     return (lo <= _U8_MAX) == (hi <= _U8_MAX)
 
@@ -25,7 +25,7 @@ def ip_range(start=None, stop=None, step=None):
     start : int, str, IPv4Address, or IPv6Address, optional
         Start of interval.  The interval includes this value.  The default
         start value is 0.
-    start : int, str, IPv4Address, or IPv6Address, optional
+    stop : int, str, IPv4Address, or IPv6Address, optional
         End of interval.  The interval does not include this value.
     step : int, optional
         Spacing between values.  For any output `out`, this is the distance
@@ -37,10 +37,14 @@ def ip_range(start=None, stop=None, step=None):
     -------
     IPArray
 
+    See Also
+    --------
+    IPRange : A range that computes its addresses as needed.
+
     Notes
     -----
-    Performance will worsen if either of `start` or `stop` are larger than
-    2**64.
+    The addresses are computed with 128-bit arithmetic, so IPv6 ranges are
+    as fast as IPv4 ones.
 
     Examples
     --------
@@ -59,11 +63,453 @@ def ip_range(start=None, stop=None, step=None):
     >>> ip_range(ipaddress.IPv4Address(1), ipaddress.IPv4Address(5))
     IPArray(['0.0.0.1', '0.0.0.2', '0.0.0.3', '0.0.0.4'])
     """
-    if start is not None:
-        start = _as_int(start)
-    if stop is not None:
-        stop = _as_int(stop)
-    if step is not None:
-        step = _as_int(step)
-    arr = IPArray(np.arange(start, stop, step))
-    return arr
+    if start is None:
+        start = 0
+    return IPRange(start, stop, 1 if step is None else step).to_array()
+
+
+def random_ips(n, networks=None, weights=None, unique=False, seed=None):
+    """Draw random addresses from networks or ranges.
+
+    The addresses are drawn as 128-bit integers straight into the
+    ``hi`` and ``lo`` fields, so IPv6 networks are as fast as IPv4 ones.
+    The NA address, ``0.0.0.0``, is never drawn.
+
+    Parameters
+    ----------
+    n : int
+        The number of addresses.
+    networks : str, IPNetworkArray, IPRange, or sequence, optional
+        Where to draw the addresses from. Sequences may mix networks, like
+        ``'10.0.0.0/8'`` or ``IPv6Network``, and :class:`IPRange` objects
+        with a step of 1 or -1. The default is all IPv4 addresses.
+    weights : sequence of float, optional
+        The relative chance of drawing from each of `networks`. By default,
+        every address of the networks is equally likely, with addresses in
+        overlapping networks counted once.
+    unique : bool, default False
+        Whether to draw each address at most once.
+    seed : int, numpy.random.Generator, or numpy.random.RandomState, optional
+        The source of randomness. Ints and None seed a new
+        ``numpy.random.Generator``, or a ``RandomState`` with NumPy
+        before 1.17.
+
+    Returns
+    -------
+    IPArray
+
+    Raises
+    ------
+    ValueError
+        If there are fewer addresses than `n` to draw unique addresses
+        from, or a network holds only the NA address.
+
+    Examples
+    --------
+    >>> networks = ['10.0.0.0/8', '2001:db8::/32']
+    >>> addresses = random_ips(1000, networks, weights=[3, 1], seed=0)
+    >>> IPSet(networks).contains(addresses).all()
+    True
+    >>> len(set(random_ips(256, '10.0.0.0/24', unique=True)))
+    256
+    """
+    rng = _random_generator(seed)
+    start, end = _random_bounds(networks)
+    uniform = weights is None
+    if uniform:
+        # Over the union of the networks, so overlaps count once.
+        start, end = _merge_bounds(start, end)
+        weights = _num_addresses(start, end).astype('f8')
+    else:
+        weights = np.asarray(weights, dtype='f8')
+        if weights.shape != (len(start),):
+            raise ValueError("'weights' must have a weight for each "
+                             "network.")
+        if (weights < 0).any() or not weights.sum() > 0:
+            raise ValueError("'weights' must be non-negative, and not all "
+                             "zero.")
+        start, end = start[weights > 0], end[weights > 0]
+        weights = weights[weights > 0]
+    p = weights / weights.sum()
+
+    if not unique:
+        return IPArray._from_ndarray(_draw(rng, n, start, end, p))
+
+    merged = _merge_bounds(start, end)
+    size = sum(_num_addresses(*merged).tolist())
+    if n > size:
+        raise ValueError("Can't draw {} unique addresses from {} "
+                         "addresses.".format(n, size))
+    if uniform and size <= 2 * n:
+        # Few addresses to spare, so draw positions without repeats.
+        position = rng.choice(size, n, replace=False)
+        return IPArray._from_ndarray(_position_to_address(position, *merged))
+
+    result = np.zeros(0, dtype=IPType._record_type)
+    while len(result) < n:
+        draws = _draw(rng, n - len(result), start, end, p)
+        result = np.concatenate([result, draws])
+        # Keep the first draw of each address, in the order drawn.
+        _, first = np.unique(result.view('S16'), return_index=True)
+        result = result[np.sort(first)]
+    return IPArray._from_ndarray(result)
+
+
+def _random_generator(seed):
+    if isinstance(seed, np.random.RandomState):
+        return seed
+    if hasattr(np.random, 'default_rng'):
+        return np.random.default_rng(seed)
+    return np.random.RandomState(seed)
+
+
+def _random_bounds(networks):
+    """The first and last address of each network, skipping NA."""
+    if networks is None:
+        networks = [u'0.0.0.0/0']
+    elif isinstance(networks, (six.string_types, IPRange,
+                               ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        networks = [networks]
+    start = np.empty(len(networks), dtype=IPType._record_type)
+    end = np.empty(len(networks), dtype=IPType._record_type)
+    if isinstance(networks, IPNetworkArray):
+        is_range = np.zeros(len(networks), dtype=bool)
+    else:
+        is_range = np.array([isinstance(x, IPRange) for x in networks],
+                            dtype=bool)
+    if not is_range.all():
+        others = networks
+        if not isinstance(networks, IPNetworkArray):
+            others = IPNetworkArray([x for x in networks
+                                     if not isinstance(x, IPRange)])
+        start[~is_range] = others.network_address.data
+        end[~is_range] = others.broadcast_address.data
+    for i in np.flatnonzero(is_range):
+        r = networks[i]
+        if abs(r.step) != 1 or not r:
+            raise ValueError("Ranges must have addresses, and a step of 1 "
+                             "or -1.")
+        first, last = sorted([r.start, int(r[-1])])
+        start[i] = divmod(first, 2 ** 64)
+        end[i] = divmod(last, 2 ** 64)
+
+    is_na = (start['hi'] == 0) & (start['lo'] == 0)
+    if (is_na & (end['hi'] == 0) & (end['lo'] == 0)).any():
+        raise ValueError("Can't draw from a network holding only the NA "
+                         "address, 0.0.0.0.")
+    start['lo'][is_na] = 1
+    return start, end
+
+
+def _merge_bounds(start, end):
+    """Merge the bounds of overlapping and adjacent networks."""
+    start_hi, start_lo, end_hi, end_lo = _merge_intervals(
+        start['hi'], start['lo'], end['hi'], end['lo'])
+    merged_start = np.empty(len(start_hi), dtype=IPType._record_type)
+    merged_end = np.empty(len(start_hi), dtype=IPType._record_type)
+    merged_start['hi'], merged_start['lo'] = start_hi, start_lo
+    merged_end['hi'], merged_end['lo'] = end_hi, end_lo
+    return merged_start, merged_end
+
+
+def _draw(rng, n, start, end, p):
+    """Draw `n` addresses, from bounds chosen with probabilities `p`."""
+    which = (rng.choice(len(p), n, p=p) if len(p) > 1
+             else np.zeros(n, dtype='i8'))
+    first_hi = start['hi'][which].astype('u8')
+    first_lo = start['lo'][which].astype('u8')
+    span_hi, span_lo = sub128(end['hi'][which].astype('u8'),
+                              end['lo'][which].astype('u8'),
+                              first_hi, first_lo)
+    # Draw random bits of the span's width until they're within it. More
+    # than half of the draws are.
+    mask_hi, mask_lo = prefix_masks(128 - bit_length128(span_hi, span_lo))
+    mask_hi, mask_lo = ~mask_hi, ~mask_lo
+    offset_hi = np.zeros(n, dtype='u8')
+    offset_lo = np.zeros(n, dtype='u8')
+    todo = np.arange(n)
+    while len(todo):
+        bits = np.frombuffer(rng.bytes(16 * len(todo)), dtype='u8')
+        hi = bits[::2] & mask_hi[todo]
+        lo = bits[1::2] & mask_lo[todo]
+        ok = le128(hi, lo, span_hi[todo], span_lo[todo])
+        offset_hi[todo[ok]] = hi[ok]
+        offset_lo[todo[ok]] = lo[ok]
+        todo = todo[~ok]
+
+    result = np.empty(n, dtype=IPType._record_type)
+    result['hi'], result['lo'], _ = add128(first_hi, first_lo, offset_hi,
+                                           offset_lo)
+    return result
+
+
+def _num_addresses(start, end):
+    """The number of addresses between bounds, as an object array of ints."""
+    span_hi, span_lo = sub128(end['hi'].astype('u8'), end['lo'].astype('u8'),
+                              start['hi'].astype('u8'),
+                              start['lo'].astype('u8'))
+    return (span_hi.astype(object) << 64) + span_lo.astype(object) + 1
+
+
+def _position_to_address(position, start, end):
+    """The address at each position in disjoint, sorted bounds.
+
+    The bounds hold few enough addresses for int64.
+    """
+    sizes = _num_addresses(start, end).astype('i8')
+    before = np.cumsum(sizes) - sizes
+    which = np.searchsorted(before, position, side='right') - 1
+    result = np.empty(len(position), dtype=IPType._record_type)
+    result['hi'], result['lo'], _ = add128(
+        start['hi'][which].astype('u8'), start['lo'][which].astype('u8'),
+        np.uint64(0), (position - before[which]).astype('u8'))
+    return result
+
+
+def collapse(values):
+    """Collapse addresses and networks into the fewest covering networks.
+
+    This is a vectorized version of :func:`ipaddress.collapse_addresses`.
+    Overlapping and adjacent networks are merged, and the merged ranges are
+    split into the fewest CIDR blocks covering them. IPv4 and IPv6 values are
+    collapsed separately. Missing values are ignored.
+
+    Parameters
+    ----------
+    values : IPArray, IPNetworkArray, or sequence
+        The addresses or networks to collapse. Sequences may mix addresses
+        and networks, e.g. ``['10.0.0.1', '10.0.0.0/24']``.
+
+    Returns
+    -------
+    IPNetworkArray
+        The collapsed networks, sorted by version and then address.
+
+    Examples
+    --------
+    >>> collapse(['192.168.0.0/24', '192.168.1.0/24', '192.168.1.7'])
+    IPNetworkArray(['192.168.0.0/23'])
+
+    >>> collapse(IPArray(['10.0.0.0', '10.0.0.1', '10.0.0.2']))
+    IPNetworkArray(['10.0.0.0/31', '10.0.0.2/32'])
+    """
+    values, start, end = _bounds(values)
+    is_v4 = values.is_ipv4
+
+    records = []
+    for mask, version in ((is_v4, 4), (~is_v4, 6)):
+        merged = _merge_intervals(start['hi'][mask], start['lo'][mask],
+                                  end['hi'][mask], end['lo'][mask])
+        _, hi, lo, prefixlen = _range_to_cidrs(*merged)
+        records.append(_records(hi, lo, prefixlen, version))
+    return IPNetworkArray._from_ndarray(np.concatenate(records))
+
+
+def _bounds(values):
+    """The first and last address of addresses or networks.
+
+    Missing values are dropped.
+
+    Returns
+    -------
+    values : IPArray or IPNetworkArray
+    start, end : ndarray
+        With ``IPType._record_type``.
+    """
+    if isinstance(values, IPArray):
+        values = values[~values.isna()]
+        start = end = values.data
+    else:
+        if not isinstance(values, IPNetworkArray):
+            values = IPNetworkArray(values)
+        values = values[~values.isna()]
+        start = values.network_address.data
+        end = values.broadcast_address.data
+    return values, start, end
+
+
+def summarize_ranges(start, end):
+    """Split ranges of addresses into CIDR blocks.
+
+    This is a vectorized :func:`ipaddress.summarize_address_range`, for
+    many ranges at once.
+
+    Parameters
+    ----------
+    start, end : IPArray, Series, or sequence
+        The first and last addresses of each range. Both ends are included.
+        When `start` is a Series, its index is used for the ``range_id``.
+
+    Returns
+    -------
+    DataFrame
+        With one row per block, and columns
+
+        * range_id : the position (or index label) of the block's range
+        * network : the block, as an :class:`IPNetworkArray`
+        * prefixlen : the prefix length of the block
+
+    Raises
+    ------
+    TypeError
+        If the start and end of a range are different versions.
+    ValueError
+        If the end of a range is before its start.
+
+    Examples
+    --------
+    >>> summarize_ranges(['10.0.0.0', '192.168.0.1'],
+    ...                  ['10.0.1.255', '192.168.0.4'])
+       range_id         network  prefixlen
+    0         0     10.0.0.0/23         23
+    1         1  192.168.0.1/32         32
+    2         1  192.168.0.2/31         31
+    3         1  192.168.0.4/32         32
+    """
+    index = None
+    if isinstance(start, pd.Series):
+        index = start.index
+        start = start.values
+    if isinstance(end, pd.Series):
+        end = end.values
+    start = IPArray(start)
+    end = IPArray(end)
+    if len(start) != len(end):
+        raise ValueError("'start' and 'end' must be the same length.")
+    # '::' is stored like '0.0.0.0', so it may start an IPv6 range
+    if (start.is_ipv4 & end.is_ipv6 & ~start.isna()).any():
+        raise TypeError("The start and end of each range must be the same "
+                        "version.")
+    first, last = start.data, end.data
+    if lt128(last['hi'], last['lo'], first['hi'], first['lo']).any():
+        raise ValueError("The end of each range must not be before its "
+                         "start.")
+
+    range_id, hi, lo, prefixlen = _range_to_cidrs(first['hi'], first['lo'],
+                                                  last['hi'], last['lo'])
+    version = np.where(end.is_ipv4.take(range_id), 4, 6)
+    network = IPNetworkArray._from_ndarray(_records(hi, lo, prefixlen,
+                                                    version))
+    if index is not None:
+        range_id = index.take(range_id)
+    return ordered_frame([
+        ('range_id', range_id),
+        ('network', network),
+        ('prefixlen', network.prefixlen),
+    ])
+
+
+def _merge_intervals(start_hi, start_lo, end_hi, end_lo):
+    """Merge overlapping and adjacent intervals of 128-bit integers.
+
+    The intervals are closed, ``[start, end]``. Returns the ``start_hi,
+    start_lo, end_hi, end_lo`` of the disjoint, sorted, merged intervals.
+    """
+    n = len(start_hi)
+    start_hi = np.asarray(start_hi, dtype='u8')
+    start_lo = np.asarray(start_lo, dtype='u8')
+    # Sweep over the interval boundaries, counting how many intervals are
+    # open. Ends are made exclusive (the 129th bit is 'overflow') so that
+    # adjacent intervals touch.
+    stop_hi, stop_lo, overflow = add128(np.asarray(end_hi, dtype='u8'),
+                                        np.asarray(end_lo, dtype='u8'),
+                                        np.uint64(0), np.uint64(1))
+    pos_hi = np.concatenate([start_hi, stop_hi])
+    pos_lo = np.concatenate([start_lo, stop_lo])
+    pos_overflow = np.concatenate([np.zeros(n, dtype=bool), overflow])
+    # Starts sort before ends at the same position, so touching intervals
+    # are merged.
+    is_end = np.repeat([False, True], n)
+    order = _lexsort_128(pos_overflow, pos_hi, pos_lo, is_end)
+
+    delta = np.where(is_end[order], -1, 1)
+    depth = np.cumsum(delta)
+    opens = order[(delta == 1) & (depth == 1)]
+    closes = order[depth == 0]
+
+    # Back to closed intervals. An exclusive end of 2**128 wraps around to
+    # 0, so subtracting one gives the correct maximum.
+    end_hi, end_lo = sub128(pos_hi[closes], pos_lo[closes],
+                            np.uint64(0), np.uint64(1))
+    return pos_hi[opens], pos_lo[opens], end_hi, end_lo
+
+
+def _lexsort_128(overflow, hi, lo, flag):
+    """Indices sorting by 'overflow', then 'hi', then 'lo', then 'flag'.
+
+    np.lexsort is slow, so keys that don't change the order are dropped,
+    and 'flag' is folded into 'lo' when there's room.
+    """
+    if len(lo) and lo.max() < 2 ** 63:
+        keys = [(lo << np.uint64(1)) | flag.astype('u8')]
+    else:
+        keys = [flag, lo]
+    if len(hi) and (hi != hi[0]).any():
+        keys.append(hi)
+    if overflow.any():
+        keys.append(overflow)
+    if len(keys) == 1:
+        return np.argsort(keys[0])
+    return np.lexsort(keys)
+
+
+def _range_to_cidrs(start_hi, start_lo, end_hi, end_lo):
+    """Split closed ranges of 128-bit integers into CIDR blocks.
+
+    This is a vectorized :func:`ipaddress.summarize_address_range`. Each
+    pass emits the largest block starting at the current start of every
+    range, and then advances those starts past the block.
+
+    Returns
+    -------
+    range_id : ndarray
+        For each block, the position of the range it came from.
+    hi, lo : ndarray
+        The first address of each block.
+    prefixlen : ndarray
+        The prefix length of each block, relative to 128 bits.
+    """
+    range_id = np.arange(len(start_hi))
+    start_hi = np.asarray(start_hi, dtype='u8')
+    start_lo = np.asarray(start_lo, dtype='u8')
+    end_hi = np.asarray(end_hi, dtype='u8')
+    end_lo = np.asarray(end_lo, dtype='u8')
+
+    valid = ~lt128(end_hi, end_lo, start_hi, start_lo)
+    range_id = range_id[valid]
+    start_hi, start_lo = start_hi[valid], start_lo[valid]
+    end_hi, end_lo = end_hi[valid], end_lo[valid]
+
+    ids, his, los, bits = [], [], [], []
+    while len(range_id):
+        # The block size is limited by the alignment of the start, and by the
+        # number of addresses left in the range.
+        size_hi, size_lo = sub128(end_hi, end_lo, start_hi, start_lo)
+        size_hi, size_lo, full = add128(size_hi, size_lo,
+                                        np.uint64(0), np.uint64(1))
+        fits = np.where(full, 128, bit_length128(size_hi, size_lo) - 1)
+        n = np.minimum(trailing_zeros128(start_hi, start_lo), fits)
+
+        ids.append(range_id)
+        his.append(start_hi)
+        los.append(start_lo)
+        bits.append(n)
+
+        step_hi, step_lo = pow2_128(np.minimum(n, 127))
+        start_hi, start_lo, overflow = add128(start_hi, start_lo,
+                                              step_hi, step_lo)
+        keep = ~(overflow | (n == 128) |
+                 lt128(end_hi, end_lo, start_hi, start_lo))
+        range_id = range_id[keep]
+        start_hi, start_lo = start_hi[keep], start_lo[keep]
+        end_hi, end_lo = end_hi[keep], end_lo[keep]
+
+    if not ids:
+        empty = np.array([], dtype='u8')
+        return np.array([], dtype=int), empty, empty, np.array([], dtype=int)
+
+    range_id = np.concatenate(ids)
+    # Blocks are emitted in increasing order within each range
+    order = np.argsort(range_id, kind='mergesort')
+    return (range_id[order], np.concatenate(his)[order],
+            np.concatenate(los)[order], 128 - np.concatenate(bits)[order])
@@ -0,0 +1,278 @@
+"""Ranges of IP addresses, computed as needed."""
+import ipaddress
+import operator
+
+import numpy as np
+import six
+
+from ._utils import add128, combine, le128, mul64, sub128, trailing_zeros128
+from .ip_array import IPArray, IPType
+
+_MAX = 2 ** 128
+# Addresses computed at a time when iterating over the scalars
+_ITER_CHUNK = 4096
+
+
+def _as_int(ip):
+    if isinstance(ip, six.string_types):
+        ip = ipaddress.ip_address(ip)
+    return int(ip)
+
+
+def _length(start, stop, step):
+    """``len(range(start, stop, step))``, for any size."""
+    if step > 0:
+        return max(0, (stop - start + step - 1) // step)
+    return max(0, (start - stop - step - 1) // -step)
+
+
+def _split(n):
+    """A 128-bit int as a (hi, lo) pair of uint64."""
+    return np.uint64(n >> 64), np.uint64(n & (2 ** 64 - 1))
+
+
+class IPRange(object):
+    """A range of IP addresses, computed as needed.
+
+    Like :class:`range`, an :class:`IPRange` only stores its start, step
+    and length. Indexing, slicing and membership tests are arithmetic, and
+    :meth:`chunks` walks ranges too large for memory, like a /64, as
+    arrays of a fixed size.
+
+    Parameters
+    ----------
+    start : int, str, IPv4Address, or IPv6Address
+        The first address. With no `stop`, the end of a range from 0.
+    stop : int, str, IPv4Address, or IPv6Address, optional
+        The end of the range, not included.
+    step : int, optional
+        The distance between adjacent addresses, which may be negative.
+        The default is 1.
+
+    Raises
+    ------
+    ValueError
+        If `step` is zero, or the range is outside of the 128-bit address
+        space.
+
+    See Also
+    --------
+    ip_range : The addresses of a range as an IPArray.
+
+    Examples
+    --------
+    >>> hosts = IPRange('2001:db8::', '2001:db8:0:1::')
+    >>> hosts.num_addresses
+    18446744073709551616
+    >>> hosts[-1]
+    IPv6Address('2001:db8::ffff:ffff:ffff:ffff')
+    >>> hosts.contains(['2001:db8::1', '2001:db8:1::'])
+    array([ True, False])
+    >>> [len(batch) for batch in hosts[:10].chunks(4)]
+    [4, 4, 2]
+    """
+    def __init__(self, start, stop=None, step=1):
+        if stop is None:
+            start, stop = 0, start
+        start, stop, step = _as_int(start), _as_int(stop), _as_int(step)
+        if step == 0:
+            raise ValueError("'step' must not be zero.")
+        self._set(start, step, _length(start, stop, step))
+
+    @classmethod
+    def _from_start(cls, start, step, length):
+        result = cls.__new__(cls)
+        result._set(start, step, length)
+        return result
+
+    def _set(self, start, step, length):
+        if length:
+            last = start + (length - 1) * step
+            if not (0 <= start < _MAX and 0 <= last < _MAX):
+                raise ValueError("The range is outside of the address "
+                                 "space.")
+        self._start = start
+        self._step = step
+        self._length = length
+
+    def __repr__(self):
+        if not self._length:
+            return "IPRange(<0 addresses>)"
+        step = '' if self._step == 1 else ', step {}'.format(self._step)
+        return "IPRange(<{} addresses, {} to {}{}>)".format(
+            self._length, self[0], self[-1], step)
+
+    def __len__(self):
+        # Like range, this raises an OverflowError past sys.maxsize. Use
+        # num_addresses for large ranges.
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        if not isinstance(other, IPRange):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def _key(self):
+        """What determines the addresses, as for range."""
+        if not self._length:
+            return (0,)
+        if self._length == 1:
+            return (1, self._start)
+        return (self._length, self._start, self._step)
+
+    @property
+    def start(self):
+        """The first address, as an int."""
+        return self._start
+
+    @property
+    def stop(self):
+        """The end of the range, ``start + num_addresses * step``."""
+        return self._start + self._length * self._step
+
+    @property
+    def step(self):
+        """The distance between adjacent addresses."""
+        return self._step
+
+    @property
+    def num_addresses(self):
+        """The number of addresses, as an int of any size."""
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            return self._from_start(self._start + start * self._step,
+                                    self._step * step,
+                                    _length(start, stop, step))
+        key = operator.index(key)
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("IPRange index out of range")
+        return ipaddress.ip_address(self._start + key * self._step)
+
+    def __contains__(self, address):
+        return bool(self.contains(IPArray([address]))[0])
+
+    def __iter__(self):
+        for batch in self.chunks(_ITER_CHUNK):
+            for address in batch:
+                yield address
+
+    def contains(self, values):
+        """Check whether each address is in the range.
+
+        Parameters
+        ----------
+        values : IPArray, or values accepted by :class:`IPArray`
+
+        Returns
+        -------
+        ndarray[bool]
+            False for the NA address, ``0.0.0.0``, as for
+            :meth:`IPSet.contains`.
+        """
+        if not isinstance(values, IPArray):
+            values = IPArray(values)
+        if not self._length:
+            return np.zeros(len(values), dtype=bool)
+        hi, lo = values._hi_lo
+        hi = hi.astype('u8')
+        lo = lo.astype('u8')
+        low, high = sorted([self._start,
+                            self._start + (self._length - 1) * self._step])
+        low_hi, low_lo = _split(low)
+        high_hi, high_lo = _split(high)
+        found = (le128(low_hi, low_lo, hi, lo) &
+                 le128(hi, lo, high_hi, high_lo) & ~values.isna())
+
+        # Whether the offset from the lowest address is a multiple of step
+        step = abs(self._step)
+        offset_hi, offset_lo = sub128(hi, lo, low_hi, low_lo)
+        if step & (step - 1) == 0:
+            found &= (trailing_zeros128(offset_hi, offset_lo) >=
+                      step.bit_length() - 1)
+        elif step < 2 ** 32:
+            # Each term stays below step ** 2, so no product overflows.
+            divisor = np.uint64(step)
+            remainder = ((offset_hi % divisor) * np.uint64(2 ** 64 % step) +
+                         offset_lo % divisor) % divisor
+            found &= remainder == 0
+        else:
+            index = np.flatnonzero(found)
+            found[index] = [combine(int(h), int(l)) % step == 0 for h, l in
+                            zip(offset_hi[index], offset_lo[index])]
+        return found
+
+    # ------------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------------
+
+    def chunks(self, size):
+        """Iterate over the addresses as arrays.
+
+        Parameters
+        ----------
+        size : int
+            The number of addresses in each array, except the last.
+
+        Returns
+        -------
+        iterator of IPArray
+        """
+        if size < 1:
+            raise ValueError("'size' must be positive.")
+        return self._chunks(size)
+
+    def _chunks(self, size):
+        position = 0
+        while position < self._length:
+            n = min(size, self._length - position)
+            yield self._take(position, n)
+            position += n
+
+    def to_array(self):
+        """The addresses of the range.
+
+        Returns
+        -------
+        IPArray
+        """
+        return self._take(0, self._length)
+
+    def _take(self, position, n):
+        """The `n` addresses from `position`, with 128-bit arithmetic."""
+        first_hi, first_lo = _split(self._start + position * self._step)
+        step = abs(self._step)
+        k = np.arange(n, dtype='u8')
+        if step < 2 ** 64 and step * max(n - 1, 0) < 2 ** 64:
+            offset_hi, offset_lo = np.uint64(0), k * np.uint64(step)
+        else:
+            # k * step, which is below 2 ** 128 within the range
+            offset_hi, offset_lo = mul64(k, np.uint64(step & (2 ** 64 - 1)))
+            offset_hi = offset_hi + k * np.uint64((step >> 64) &
+                                                  (2 ** 64 - 1))
+        if self._step > 0:
+            hi, lo, _ = add128(first_hi, first_lo, offset_hi, offset_lo)
+        else:
+            hi, lo = sub128(first_hi, first_lo, offset_hi, offset_lo)
+        data = np.empty(n, dtype=IPType._record_type)
+        data['hi'] = hi
+        data['lo'] = lo
+        return IPArray._from_ndarray(data)
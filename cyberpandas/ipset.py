@@ -0,0 +1,394 @@
+"""Sets of IP addresses, built once and matched against many arrays.
+
+An IPSet is stored as sorted, disjoint ranges of 128-bit integers, with
+adjacent ranges merged. Set operations merge ranges, and membership is a
+binary search over the ranges' starts.
+
+The bytes of :meth:`IPSet.to_bytes` are
+
+* a 24 byte header: magic, version and the number of ranges, little-endian,
+* the first address of each range, 16 bytes in network byte order,
+* the last address of each range, likewise.
+"""
+import ipaddress
+
+import numpy as np
+import six
+
+from ._utils import add128, combine, le128, lt128, sub128
+from .common import _IPv4_MAX
+from .ip_array import IPArray, IPType
+from .ip_methods import _bounds, _merge_intervals, _range_to_cidrs
+from .network_array import IPNetworkArray, _block_version, _records
+
+_MAGIC = b'\x93CYBIPST'
+_VERSION = 1
+_HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u2'),
+    ('pad', 'V6'),
+    ('length', '<u8'),
+])
+_MAX = np.uint64(2 ** 64 - 1)
+
+
+class IPSet(object):
+    """A set of IP addresses and networks, for fast membership tests.
+
+    Building the set parses and merges its values once. Each lookup with
+    :meth:`IPSet.contains` is then a binary search, however many networks
+    the set holds, so one set can serve many arrays.
+
+    Like :class:`IPArray`, the set doesn't tell IPv4 addresses from the
+    IPv6 addresses below ``2**32``, e.g. ``'0.0.0.1'`` and ``'::1'``.
+
+    Parameters
+    ----------
+    values : IPSet, IPArray, IPNetworkArray, str, or sequence, optional
+        Addresses and networks, e.g. ``['10.0.0.1', '10.0.0.0/24']``.
+        Missing values are ignored.
+
+    See Also
+    --------
+    IPArray.isin
+
+    Examples
+    --------
+    >>> blocklist = IPSet(['10.0.0.0/8', '192.168.1.1', '2001:db8::/32'])
+    >>> blocklist.contains(['10.1.2.3', '8.8.8.8', '2001:db8::1'])
+    array([ True, False,  True])
+    >>> blocklist.add('8.8.8.0/24')
+    >>> '8.8.8.8' in blocklist
+    True
+    """
+    def __init__(self, values=None):
+        self._start, self._end = _to_records(
+            *_merge_intervals(*_intervals(values)))
+
+    @classmethod
+    def _from_records(cls, start, end):
+        """An IPSet of sorted, disjoint and non-adjacent ranges."""
+        result = cls.__new__(cls)
+        result._start = start
+        result._end = end
+        return result
+
+    def __repr__(self):
+        return "IPSet(<{} ranges, {} addresses>)".format(
+            len(self._start), self.num_addresses)
+
+    def __bool__(self):
+        return bool(len(self._start))
+
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        if not isinstance(other, IPSet):
+            return NotImplemented
+        return (np.array_equal(self._start, other._start) and
+                np.array_equal(self._end, other._end))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __contains__(self, address):
+        return bool(self.contains(IPArray([address]))[0])
+
+    def __or__(self, other):
+        if not isinstance(other, IPSet):
+            return NotImplemented
+        return self.union(other)
+
+    def __and__(self, other):
+        if not isinstance(other, IPSet):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        if not isinstance(other, IPSet):
+            return NotImplemented
+        return self.difference(other)
+
+    def copy(self):
+        return self._from_records(self._start, self._end)
+
+    @property
+    def num_addresses(self):
+        """The number of addresses in the set."""
+        start_hi, start_lo, end_hi, end_lo = _intervals(self)
+        size_hi, size_lo = sub128(end_hi, end_lo, start_hi, start_lo)
+        # Plus one address per range. Python ints, as the whole space
+        # has 2**128.
+        return (combine(sum(size_hi.tolist()), sum(size_lo.tolist())) +
+                len(self._start))
+
+    # ------------------------------------------------------------------------
+    # Set algebra
+    # ------------------------------------------------------------------------
+
+    def union(self, *others):
+        """The addresses in this set or any of `others`.
+
+        Parameters
+        ----------
+        *others : IPSet, or values accepted by :class:`IPSet`
+
+        Returns
+        -------
+        IPSet
+        """
+        parts = [_intervals(self)] + [_intervals(other) for other in others]
+        return self._from_records(*_to_records(*_merge_intervals(
+            *[np.concatenate(bounds) for bounds in zip(*parts)])))
+
+    def intersection(self, other):
+        """The addresses in both this set and `other`.
+
+        Parameters
+        ----------
+        other : IPSet, or values accepted by :class:`IPSet`
+
+        Returns
+        -------
+        IPSet
+        """
+        # Outside of either complement
+        gaps = [_complement(*_intervals(self)),
+                _complement(*_intervals(other))]
+        return self._from_records(*_to_records(*_complement(
+            *_merge_intervals(*[np.concatenate(bounds)
+                                for bounds in zip(*gaps)]))))
+
+    def difference(self, other):
+        """The addresses in this set but not in `other`.
+
+        Parameters
+        ----------
+        other : IPSet, or values accepted by :class:`IPSet`
+
+        Returns
+        -------
+        IPSet
+        """
+        # Outside of both this set's complement and `other`
+        parts = [_complement(*_intervals(self)), _intervals(other)]
+        return self._from_records(*_to_records(*_complement(
+            *_merge_intervals(*[np.concatenate(bounds)
+                                for bounds in zip(*parts)]))))
+
+    def add(self, values):
+        """Add addresses and networks to the set, in place.
+
+        Parameters
+        ----------
+        values : IPSet, or values accepted by :class:`IPSet`
+        """
+        merged = self.union(values)
+        self._start, self._end = merged._start, merged._end
+
+    def remove(self, values):
+        """Remove addresses and networks from the set, in place.
+
+        Addresses not in the set are ignored.
+
+        Parameters
+        ----------
+        values : IPSet, or values accepted by :class:`IPSet`
+        """
+        merged = self.difference(values)
+        self._start, self._end = merged._start, merged._end
+
+    # ------------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------------
+
+    def contains(self, values):
+        """Check whether each address is in the set.
+
+        Parameters
+        ----------
+        values : IPArray, or values accepted by :class:`IPArray`
+
+        Returns
+        -------
+        ndarray[bool]
+            False for the NA address, ``0.0.0.0``.
+        """
+        if not isinstance(values, IPArray):
+            values = IPArray(values)
+        if not self:
+            return np.zeros(len(values), dtype=bool)
+        if values.is_compact:
+            return self._contains_ipv4(values._data)
+        data = np.ascontiguousarray(values.data)
+        # The big-endian records sort like the addresses as bytes.
+        index = np.searchsorted(self._start.view('S16'), data.view('S16'),
+                                side='right') - 1
+        end = self._end[np.maximum(index, 0)]
+        return ((index >= 0) & ~values.isna() &
+                le128(data['hi'], data['lo'], end['hi'], end['lo']))
+
+    def _contains_ipv4(self, values):
+        """``contains`` for the data of a compact IPArray."""
+        # Only the ranges starting in the IPv4 space can match, and only
+        # their part in that space.
+        start = self._start
+        n = np.searchsorted(start['hi'], 0, side='right')
+        n = np.searchsorted(start['lo'][:n], _IPv4_MAX, side='right')
+        if not n:
+            return np.zeros(len(values), dtype=bool)
+        end = np.where(self._end['hi'][:n] == 0, self._end['lo'][:n],
+                       _IPv4_MAX)
+        index = np.searchsorted(start['lo'][:n].astype('u8'), values,
+                                side='right') - 1
+        return ((index >= 0) & (values != 0) &
+                (values <= end[np.maximum(index, 0)]))
+
+    # ------------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------------
+
+    def to_networks(self):
+        """The fewest networks covering exactly the set.
+
+        Returns
+        -------
+        IPNetworkArray
+            Sorted by address.
+
+        Examples
+        --------
+        >>> IPSet(['10.0.0.0/24', '10.0.1.0/24', '10.0.2.1']).to_networks()
+        IPNetworkArray(['10.0.0.0/23', '10.0.2.1/32'])
+        """
+        _, hi, lo, prefixlen = _range_to_cidrs(*_intervals(self))
+        version = _block_version(hi, lo, prefixlen)
+        return IPNetworkArray._from_ndarray(_records(hi, lo, prefixlen,
+                                                     version))
+
+    def to_bytes(self):
+        """Serialize the set.
+
+        Returns
+        -------
+        bytes
+
+        See Also
+        --------
+        IPSet.from_bytes
+        """
+        header = np.zeros(1, dtype=_HEADER)
+        header['magic'] = _MAGIC
+        header['version'] = _VERSION
+        header['length'] = len(self._start)
+        return (header.tobytes() + self._start.tobytes() +
+                self._end.tobytes())
+
+    @classmethod
+    def from_bytes(cls, bytestring):
+        """Load a set serialized by :meth:`IPSet.to_bytes`.
+
+        The ranges are views on `bytestring`, without copying.
+
+        Parameters
+        ----------
+        bytestring : bytes-like
+
+        Returns
+        -------
+        IPSet
+        """
+        buffer = np.frombuffer(bytestring, dtype='u1')
+        if (len(buffer) < _HEADER.itemsize or
+                buffer[:_HEADER.itemsize].view(_HEADER)['magic'][0] !=
+                _MAGIC):
+            raise ValueError("Not a serialized IPSet.")
+        header = buffer[:_HEADER.itemsize].view(_HEADER)[0]
+        if header['version'] > _VERSION:
+            raise ValueError("Unsupported IPSet version '{}'.".format(
+                header['version']))
+        n = int(header['length'])
+        size = n * IPType._record_type.itemsize
+        if len(buffer) != _HEADER.itemsize + 2 * size:
+            raise ValueError("The serialized IPSet is truncated.")
+        data = buffer[_HEADER.itemsize:].view(IPType._record_type)
+        start, end = data[:n], data[n:]
+        if not _is_canonical(start, end):
+            raise ValueError("The serialized IPSet's ranges are not sorted "
+                             "and disjoint.")
+        return cls._from_records(start, end)
+
+    def __reduce__(self):
+        return IPSet.from_bytes, (self.to_bytes(),)
+
+
+def _intervals(values):
+    """Closed ranges covering addresses and networks.
+
+    Returns
+    -------
+    start_hi, start_lo, end_hi, end_lo : ndarray[uint64]
+    """
+    if isinstance(values, IPSet):
+        start, end = values._start, values._end
+    elif values is None:
+        start = end = np.zeros(0, dtype=IPType._record_type)
+    else:
+        if isinstance(values, (six.string_types, ipaddress._BaseAddress,
+                               ipaddress._BaseNetwork)):
+            values = [values]
+        _, start, end = _bounds(values)
+    return (start['hi'].astype('u8'), start['lo'].astype('u8'),
+            end['hi'].astype('u8'), end['lo'].astype('u8'))
+
+
+def _to_records(start_hi, start_lo, end_hi, end_lo):
+    start = np.empty(len(start_hi), dtype=IPType._record_type)
+    start['hi'] = start_hi
+    start['lo'] = start_lo
+    end = np.empty(len(end_hi), dtype=IPType._record_type)
+    end['hi'] = end_hi
+    end['lo'] = end_lo
+    return start, end
+
+
+def _complement(start_hi, start_lo, end_hi, end_lo):
+    """The gaps between sorted, disjoint, non-adjacent closed ranges.
+
+    The gaps are closed ranges too, over all 128-bit integers.
+    """
+    one = np.uint64(1)
+    zero = np.uint64(0)
+    after_hi, after_lo, _ = add128(end_hi, end_lo, zero, one)
+    before_hi, before_lo = sub128(start_hi, start_lo, zero, one)
+    gap_start_hi = np.concatenate([[zero], after_hi]).astype('u8')
+    gap_start_lo = np.concatenate([[zero], after_lo]).astype('u8')
+    gap_end_hi = np.concatenate([before_hi, [_MAX]]).astype('u8')
+    gap_end_lo = np.concatenate([before_lo, [_MAX]]).astype('u8')
+
+    keep = np.ones(len(gap_start_hi), dtype=bool)
+    if len(start_hi):
+        # No gap before a range starting at 0, or after one ending at the
+        # last address.
+        keep[0] = start_hi[0] != 0 or start_lo[0] != 0
+        keep[-1] = end_hi[-1] != _MAX or end_lo[-1] != _MAX
+    return (gap_start_hi[keep], gap_start_lo[keep], gap_end_hi[keep],
+            gap_end_lo[keep])
+
+
+def _is_canonical(start, end):
+    """Whether ranges are sorted, disjoint and non-adjacent."""
+    if not le128(start['hi'], start['lo'], end['hi'], end['lo']).all():
+        return False
+    # Each range ends at least two before the next one starts.
+    after_hi, after_lo, overflow = add128(
+        end['hi'][:-1].astype('u8'), end['lo'][:-1].astype('u8'),
+        np.uint64(0), np.uint64(1))
+    return bool((~overflow & lt128(after_hi, after_lo,
+                                   start['hi'][1:].astype('u8'),
+                                   start['lo'][1:].astype('u8'))).all())
@@ -1,12 +1,20 @@
+import ipaddress
 from collections import Iterable
 
 import numpy as np
+import pandas as pd
 import six
 
 from pandas.api.extensions import (
-    ExtensionDtype, take, register_extension_dtype)
+    ExtensionArray, ExtensionDtype, take, register_extension_dtype)
+from pandas.api.types import infer_dtype, is_scalar
+from pandas import isna
 
+from ._accessor import (DelegatedMethod, DelegatedProperty,
+                        delegated_method)
 from .base import NumPyBackedExtensionArrayMixin
+from .ip_array import IPArray, IPType
+from .network_array import IPNetworkArray
 
 
 @register_extension_dtype
@@ -30,22 +38,41 @@ class MACType(ExtensionDtype):
     def construct_array_type(cls):
         return MACArray
 
+    def __from_arrow__(self, array):
+        """Construct a MACArray from a pyarrow Array or ChunkedArray.
+
+        The values are not copied when `array` is a single chunk
+        without nulls.
+        """
+        from ._arrow import mac_from_arrow
+
+        return MACArray(mac_from_arrow(array), copy=False)
+
 
 class MACArray(NumPyBackedExtensionArrayMixin):
     """Array for MAC Address data.
 
+    Holds MAC-48 addresses, and EUI-64 identifiers. The width of each
+    value isn't stored. Values larger than ``2**48 - 1`` can only be
+    EUI-64s, but an EUI-64 whose upper 16 bits are zero looks like a
+    MAC-48. So the conversions that depend on the width, like
+    :meth:`MACArray.to_interface_id`, take it as an argument.
+
     * https://en.wikipedia.org/wiki/MAC_address
     * https://tools.ietf.org/html/rfc5342
     """
-    # What type(s) do we support?
-    # MAC-48 or EUI-64?
     _dtype = MACType()
     _itemsize = 8
     ndim = 1
     can_hold_na = True
 
     def __init__(self, values, copy=True, dtype=None):
-        # TODO: parse hex / strings
+        if isinstance(values, MACArray):
+            values = values.data
+        elif not (isinstance(values, np.ndarray) and
+                  values.dtype.kind in 'ui'):
+            values = to_macaddress(values)
+            copy = False
         self.data = np.array(values, dtype='uint64', copy=copy)
         if isinstance(dtype, str):
             MACType.construct_array_type(dtype)
@@ -56,6 +83,10 @@ class MACArray(NumPyBackedExtensionArrayMixin):
     def _from_ndarray(cls, data, copy=False):
         return cls(data, copy=copy)
 
+    @classmethod
+    def _from_sequence_of_strings(cls, strings, dtype=None, copy=False):
+        return cls(to_macaddress(strings), copy=False)
+
     @property
     def na_value(self):
         return self.dtype.na_value
@@ -65,7 +96,28 @@ class MACArray(NumPyBackedExtensionArrayMixin):
         return "MACArray({!r})".format(formatted)
 
     def _format_values(self):
-        return [_format(x) for x in self.data]
+        return self.to_strings().tolist()
+
+    def to_strings(self, style='colon'):
+        """Format the addresses as strings.
+
+        Parameters
+        ----------
+        style : {'colon', 'dash', 'cisco', 'bare'}, default 'colon'
+            Formats like ``'aa:bb:cc:dd:ee:ff'``, ``'aa-bb-cc-dd-ee-ff'``,
+            ``'aabb.ccdd.eeff'`` or ``'aabbccddeeff'``. Values wider than
+            48 bits get 8 octets.
+
+        Returns
+        -------
+        ndarray[object]
+
+        Examples
+        --------
+        >>> MACArray([117633730022]).to_strings('cisco')
+        array(['001b.6384.45e6'], dtype=object)
+        """
+        return _format_mac_strings(self.data, style).astype(object)
 
     @staticmethod
     def _box_scalar(scalar):
@@ -100,11 +152,285 @@ class MACArray(NumPyBackedExtensionArrayMixin):
 
     def _values_for_factorize(self):
         # Should hit pandas' UInt64Hashtable
-        return self, 0
+        return self.data, 0
+
+    def _values_for_argsort(self):
+        return self.data
+
+    # The mixin's argsort ignores 'ascending'
+    argsort = ExtensionArray.argsort
+
+    def unique(self):
+        # Hash based, keeping the order of appearance
+        return self._from_ndarray(pd.unique(self.data))
+
+    def searchsorted(self, value, side='left', sorter=None):
+        """Find indices to insert `value` so as to maintain order.
+
+        Parameters
+        ----------
+        value : int, str, or sequence of those
+        side : {'left', 'right'}, default 'left'
+        sorter : ndarray[int], optional
+            Indices that sort this array.
+
+        Returns
+        -------
+        int or ndarray[int]
+            An int for a single `value`, otherwise an array.
+        """
+        if isinstance(value, MACArray):
+            return self.data.searchsorted(value.data, side=side,
+                                          sorter=sorter)
+        result = self.data.searchsorted(to_macaddress(value), side=side,
+                                        sorter=sorter)
+        if is_scalar(value):
+            return result[0]
+        return result
+
+    def value_counts(self, dropna=True):
+        """Count of each distinct address.
+
+        Parameters
+        ----------
+        dropna : bool, default True
+            Whether to exclude the NA address (0).
+
+        Returns
+        -------
+        Series
+            The counts, indexed by the addresses as integers.
+        """
+        data = self.data
+        if dropna:
+            data = data[data != 0]
+        return pd.Series(data).value_counts(sort=False)
+
+    def duplicated(self, keep='first'):
+        """Mark the repeated occurrences of each address.
+
+        Parameters
+        ----------
+        keep : {'first', 'last', False}, default 'first'
+            Which occurrence to leave unmarked. ``False`` marks all of
+            them.
+
+        Returns
+        -------
+        ndarray[bool]
+        """
+        return pd.Series(self.data).duplicated(keep=keep).values
 
     def isna(self):
         return (self.data == 0)
 
+    # ------------------------------------------------------------------------
+    # Properties
+    # ------------------------------------------------------------------------
+
+    @property
+    def is_eui64(self):
+        """Indicator for whether each value is wider than 48 bits, and so
+        must be an EUI-64.
+
+        EUI-64s whose upper 16 bits are zero aren't included.
+        """
+        return self.data > _MAC48_MAX
+
+    @property
+    def _first_octet_shift(self):
+        return np.where(self.is_eui64, np.uint64(56), np.uint64(40))
+
+    @property
+    def oui(self):
+        """The organizationally unique identifier (upper 24 bits) of
+        each address."""
+        shift = self._first_octet_shift - np.uint64(16)
+        return (self.data >> shift).astype('u4')
+
+    @property
+    def is_multicast(self):
+        """Indicator for whether each address is multicast."""
+        # The least significant bit of the first octet
+        return (self.data >> self._first_octet_shift) & np.uint64(1) == 1
+
+    @property
+    def is_locally_administered(self):
+        """Indicator for whether each address is locally administered,
+        rather than assigned by the manufacturer."""
+        # The second least significant bit of the first octet
+        shift = self._first_octet_shift + np.uint64(1)
+        return (self.data >> shift) & np.uint64(1) == 1
+
+    # ------------------------------------------------------------------------
+    # EUI-64 and IPv6
+    # ------------------------------------------------------------------------
+
+    def to_eui64(self):
+        """Convert MAC-48 addresses to EUI-64 identifiers.
+
+        ``FF-FE`` is inserted between the OUI and the rest of the
+        address.
+
+        Returns
+        -------
+        MACArray
+
+        Raises
+        ------
+        ValueError
+            If any value is wider than 48 bits.
+
+        Examples
+        --------
+        >>> MACArray(['00:1b:63:84:45:e6']).to_eui64()
+        MACArray(['00:1b:63:ff:fe:84:45:e6'])
+        """
+        data = self._check_width(48)
+        oui = data >> np.uint64(24)
+        nic = data & np.uint64(0xFFFFFF)
+        eui64 = (oui << np.uint64(40)) | _EUI64_MARKER | nic
+        return type(self)(np.where(data != 0, eui64, data), copy=False)
+
+    def to_interface_id(self, width):
+        """Modified EUI-64 IPv6 interface identifiers.
+
+        This is the EUI-64 of each address with the universal / local bit
+        flipped (RFC 4291, Appendix A).
+
+        Parameters
+        ----------
+        width : {48, 64}
+            Whether the values are MAC-48s, which are converted with
+            :meth:`MACArray.to_eui64` first, or EUI-64s.
+
+        Returns
+        -------
+        ndarray[uint64]
+            0 for missing values.
+
+        Raises
+        ------
+        ValueError
+            If `width` is 48 and any value is wider than 48 bits.
+        """
+        if width == 48:
+            data = self.to_eui64().data
+        else:
+            data = self._check_width(width)
+        return np.where(data != 0, data ^ _UNIVERSAL_LOCAL_BIT, data)
+
+    def _check_width(self, width):
+        """The values, after checking that they fit in `width` bits."""
+        if width not in (48, 64):
+            raise ValueError("'width' must be 48 or 64, got "
+                             "'{}'.".format(width))
+        if width == 48 and (self.data > _MAC48_MAX).any():
+            raise ValueError("Some values are wider than 48 bits, so they "
+                             "aren't MAC-48s. Use width=64 for EUI-64s.")
+        return self.data
+
+    def link_local(self, width=48):
+        """The IPv6 link-local address (``fe80::/64``) of each address.
+
+        Parameters
+        ----------
+        width : {48, 64}, default 48
+            Whether the values are MAC-48s or EUI-64s, as in
+            :meth:`MACArray.to_interface_id`.
+
+        Returns
+        -------
+        IPArray
+
+        Examples
+        --------
+        >>> MACArray(['00:1b:63:84:45:e6']).link_local()
+        IPArray(['fe80::21b:63ff:fe84:45e6'])
+        """
+        return self.slaac(_LINK_LOCAL, width=width)
+
+    def slaac(self, prefix, width=48):
+        """IPv6 addresses from stateless address autoconfiguration.
+
+        Combines a /64 prefix with the modified EUI-64 interface
+        identifier of each address (RFC 4862).
+
+        Parameters
+        ----------
+        prefix : str, IPv6Network, IPNetworkArray, or sequence
+            A single /64 network for every address, or one per address.
+        width : {48, 64}, default 48
+            Whether the values are MAC-48s or EUI-64s, as in
+            :meth:`MACArray.to_interface_id`.
+
+        Returns
+        -------
+        IPArray
+        """
+        if isinstance(prefix, six.string_types + (ipaddress.IPv6Network,)):
+            net = ipaddress.IPv6Network(prefix)
+            if net.prefixlen != 64:
+                raise ValueError("'prefix' must be a /64 network, got "
+                                 "'{}'.".format(net))
+            hi = np.uint64(int(net.network_address) >> 64)
+        else:
+            nets = prefix
+            if isinstance(nets, pd.Series):
+                nets = nets.values
+            if not isinstance(nets, IPNetworkArray):
+                nets = IPNetworkArray(nets)
+            if len(nets) != len(self):
+                raise ValueError("'prefix' must be a single network, or "
+                                 "one per address.")
+            if not (nets.is_ipv6 & (nets.prefixlen == 64)).all():
+                raise ValueError("'prefix' must be IPv6 /64 networks.")
+            hi = nets.data['hi']
+
+        iid = self.to_interface_id(width)
+        data = np.zeros(len(self), dtype=IPType._record_type)
+        data['hi'] = np.where(iid != 0, hi, np.uint64(0))
+        data['lo'] = iid
+        return IPArray._from_ndarray(data)
+
+    @classmethod
+    def from_ipv6(cls, addresses, eui64=False):
+        """Extract MAC addresses from the interface identifiers of IPv6
+        addresses.
+
+        This reverses :meth:`MACArray.slaac` and
+        :meth:`MACArray.link_local`.
+
+        Parameters
+        ----------
+        addresses : IPArray, Series, or sequence
+        eui64 : bool, default False
+            By default, only interface identifiers derived from a MAC-48
+            (with ``FF-FE`` in the middle) are converted, to MAC-48.
+            Others are NA. If True, every IPv6 address gives an EUI-64.
+
+        Returns
+        -------
+        MACArray
+
+        Examples
+        --------
+        >>> MACArray.from_ipv6(['fe80::21b:63ff:fe84:45e6', '::1'])
+        MACArray(['00:1b:63:84:45:e6', '00:00:00:00:00:00'])
+        """
+        if isinstance(addresses, pd.Series):
+            addresses = addresses.values
+        if not isinstance(addresses, IPArray):
+            addresses = IPArray(addresses)
+        data = addresses.data
+        eui = data['lo'] ^ _UNIVERSAL_LOCAL_BIT
+        valid = addresses.is_ipv6
+        if not eui64:
+            valid &= (eui & _EUI64_MARKER_MASK) == _EUI64_MARKER
+            eui = (((eui >> np.uint64(40)) << np.uint64(24)) |
+                   (eui & np.uint64(0xFFFFFF)))
+        return cls(np.where(valid, eui, np.uint64(0)), copy=False)
+
     @property
     def _parser(self):
         return lambda x: x
@@ -117,7 +443,16 @@ class MACArray(NumPyBackedExtensionArrayMixin):
         return type(self)(took)
 
     def _formatting_values(self):
-        return np.array(self._format_values(), dtype='object')
+        return self.to_strings()
+
+    def __arrow_array__(self, type=None):
+        """Convert to a pyarrow ExtensionArray with uint64 storage.
+
+        The values share memory with this array.
+        """
+        from ._arrow import mac_to_arrow
+
+        return mac_to_arrow(self.data, type=type)
 
     @classmethod
     def _concat_same_type(cls, to_concat):
@@ -137,24 +472,288 @@ class MACArray(NumPyBackedExtensionArrayMixin):
         return super().astype(dtype, copy)
 
 
-def _format(mac):
-    # https://stackoverflow.com/a/36883363/1889400
-    mac_hex = "{:012x}".format(mac)
-    mac_str = ":".join(mac_hex[i:i+2] for i in range(0, len(mac_hex), 2))
-    return mac_str
+def _mac_format(n_digits, group, separators):
+    """Describe a MAC address string format.
 
+    Returns the positions of the hex digits, the positions of the
+    separators, and the character codes allowed as separators.
+    """
+    if not separators:
+        return np.arange(n_digits), np.array([], dtype=int), []
+    digits = np.arange(n_digits)
+    digits = digits + digits // group
+    seps = np.arange(1, n_digits // group) * (group + 1) - 1
+    return digits, seps, [ord(c) for c in separators]
+
+
+# Supported string formats, by length
+_MAC_FORMATS = {
+    17: _mac_format(12, 2, ':-'),  # aa:bb:cc:dd:ee:ff, aa-bb-cc-dd-ee-ff
+    14: _mac_format(12, 4, '.'),   # aabb.ccdd.eeff
+    12: _mac_format(12, None, ''),  # aabbccddeeff
+    # EUI-64
+    23: _mac_format(16, 2, ':-'),  # aa:bb:cc:dd:ee:ff:00:11
+    19: _mac_format(16, 4, '.'),   # aabb.ccdd.eeff.0011
+    16: _mac_format(16, None, ''),  # aabbccddeeff0011
+}
+
+
+_MAC48_MAX = np.uint64(2 ** 48 - 1)
+# Inserted in the middle of a MAC-48 to make an EUI-64
+_EUI64_MARKER = np.uint64(0xFFFE << 24)
+_EUI64_MARKER_MASK = np.uint64(0xFFFF << 24)
+_UNIVERSAL_LOCAL_BIT = np.uint64(1 << 57)
+_LINK_LOCAL = ipaddress.IPv6Network(u'fe80::/64')
+
+# Separator, and digits per group, of each output style
+_MAC_STYLES = {
+    'colon': (2, ':'),
+    'dash': (2, '-'),
+    'cisco': (4, '.'),
+    'bare': (None, ''),
+}
+
+_HEX_CHARS = np.frombuffer(b'0123456789abcdef', dtype='u1')
+
+
+@pd.api.extensions.register_series_accessor("mac")
+class MACAccessor:
+
+    oui = DelegatedProperty("oui")
+    is_multicast = DelegatedProperty("is_multicast")
+    is_locally_administered = DelegatedProperty("is_locally_administered")
+
+    isna = DelegatedMethod("isna")
+
+    def __init__(self, obj):
+        self._validate(obj)
+        self._data = obj.values
+        self._index = obj.index
+        self._name = obj.name
 
-def _parse(mac):
-    # https://stackoverflow.com/a/36883363/1889400
-    mac_int = int(mac.replace(":", "").replace("-", ""), 16)
-    return mac_int
-
+    @staticmethod
+    def _validate(obj):
+        if not is_macaddress_type(obj):
+            raise AttributeError("Cannot use 'mac' accessor on objects of "
+                                 "dtype '{}'.".format(obj.dtype))
+
+    def to_strings(self, style='colon'):
+        return delegated_method(self._data.to_strings, self._index,
+                                self._name, style)
+
+    def vendor(self, registry):
+        """Look up the vendor of each address.
+
+        Parameters
+        ----------
+        registry : OUIRegistry
+
+        Returns
+        -------
+        Series
+            A categorical Series of vendor names.
+        """
+        return delegated_method(registry.lookup, self._index, self._name,
+                                self._data)
+
+
+def is_macaddress_type(obj):
+    t = getattr(obj, 'dtype', obj)
+    try:
+        return isinstance(t, MACType) or issubclass(t, MACType)
+    except Exception:
+        return False
+
+
+def _format_mac_strings(values, style='colon'):
+    """Vectorized formatting of MAC addresses.
+
+    Parameters
+    ----------
+    values : ndarray[uint64]
+    style : str
+        A key of ``_MAC_STYLES``.
+
+    Returns
+    -------
+    ndarray[str]
+    """
+    try:
+        group, separator = _MAC_STYLES[style]
+    except KeyError:
+        raise ValueError("'style' must be one of {}, got "
+                         "'{}'.".format(sorted(_MAC_STYLES), style))
+    values = np.asarray(values, dtype='u8')
+    wide = values > np.uint64(2 ** 48 - 1)
+    if not wide.any():
+        return _format_fixed_width(values, 12, group, separator)
+
+    result = np.empty(len(values), dtype=object)
+    result[~wide] = _format_fixed_width(values[~wide], 12, group, separator)
+    result[wide] = _format_fixed_width(values[wide], 16, group, separator)
+    return result.astype('U')
+
+
+def _format_fixed_width(values, n_digits, group, separator):
+    """Format the low ``n_digits`` hex digits of each value.
+
+    The characters are written into a 2-D array of character codes, which
+    is then viewed as an array of fixed-width strings.
+    """
+    digits, seps, _ = _mac_format(n_digits, group, separator)
+    width = n_digits + len(seps)
+    octets = values.astype('>u8').view('u1').reshape(-1, 8)
+    octets = octets[:, 8 - n_digits // 2:]
+    chars = np.empty((len(values), width), dtype='u1')
+    chars[:, digits[::2]] = _HEX_CHARS[octets >> 4]
+    chars[:, digits[1::2]] = _HEX_CHARS[octets & 0x0f]
+    if len(seps):
+        chars[:, seps] = ord(separator)
+    # Widening the codes is much cheaper than decoding byte strings
+    return chars.astype('u4').view('U{}'.format(width)).ravel()
+
+
+def _hex_digits(chars):
+    """Values of a 2-D uint8 array of ASCII hex digits.
+
+    Returns the values, and whether each row was all hex digits.
+    """
+    # '0'-'9' are 0x30-0x39, and 'A'-'F' / 'a'-'f' are 0x41-0x46 / 0x61-0x66,
+    # so the low nibble is the value, plus 9 for letters.
+    lower = chars | 0x20
+    is_digit = (chars >= ord('0')) & (chars <= ord('9'))
+    is_letter = (lower >= ord('a')) & (lower <= ord('f'))
+    values = (chars & 0x0f) + (chars >> 6) * np.uint8(9)
+    return values, (is_digit | is_letter).all(axis=1)
+
+
+def _parse_mac_strings(values, errors='raise'):
+    """Vectorized parsing of MAC address strings.
+
+    Parameters
+    ----------
+    values : ndarray
+        An ndarray of unicode or bytes strings (or objects, which are
+        converted to unicode).
+    errors : {'raise', 'coerce'}
+        Whether invalid strings raise a ValueError or are set to NA.
+
+    Returns
+    -------
+    ndarray[uint64]
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'O':
+        values = values.astype('U')
+    n = len(values)
+    # View the strings as a 2-D array of character codes. NumPy pads
+    # shorter strings with zeros.
+    char_type = 'u4' if values.dtype.kind == 'U' else 'u1'
+    width = values.dtype.itemsize // np.dtype(char_type).itemsize
+    codes = np.ascontiguousarray(values).view(char_type).reshape(n, width)
+    if char_type == 'u4':
+        # Non-ASCII characters are never valid, so map them to 0xff
+        codes = np.minimum(codes, 0xff).astype('u1')
+
+    result = np.zeros(n, dtype='u8')
+    # Empty strings are missing
+    valid = codes[:, 0] == 0 if width else np.ones(n, dtype=bool)
+    for length, (digits, seps, separators) in _MAC_FORMATS.items():
+        if width < length:
+            continue
+        has_length = codes[:, length - 1] != 0
+        if width > length:
+            has_length &= codes[:, length] == 0
+        rows = np.flatnonzero(has_length)
+        if not len(rows):
+            continue
+        if len(rows) == n:
+            rows = slice(None)
+        chars = codes[rows, :length]
+        nibbles, ok = _hex_digits(chars[:, digits])
+        if len(seps):
+            # The separator must be allowed, and the same throughout
+            sep = chars[:, seps]
+            ok &= ((sep == sep[:, :1]).all(axis=1) &
+                   np.in1d(sep[:, 0], separators))
+        # Pack pairs of nibbles into bytes, and the bytes into big-endian
+        # uint64s.
+        octets = np.zeros((len(nibbles), 8), dtype='u1')
+        n_octets = len(digits) // 2
+        octets[:, 8 - n_octets:] = (nibbles[:, ::2] << 4) | nibbles[:, 1::2]
+        result[rows] = octets.view('>u8').ravel()
+        valid[rows] = ok
+
+    if not valid.all():
+        if errors == 'raise':
+            raise ValueError("Could not parse {!r} as a MAC "
+                             "address.".format(values[~valid][0]))
+        result[~valid] = 0
+    return result
+
+
+def to_macaddress(addresses, errors='raise'):
+    """Convert values to MAC addresses.
+
+    Parameters
+    ----------
+    addresses : int, str, or sequence of those
+        Strings may be formatted like ``'aa:bb:cc:dd:ee:ff'``,
+        ``'aa-bb-cc-dd-ee-ff'``, ``'aabb.ccdd.eeff'`` or ``'aabbccddeeff'``,
+        in either case. The same formats with 8 octets are EUI-64s.
+    errors : {'raise', 'coerce'}, default 'raise'
+        If 'raise', invalid values raise a ValueError. If 'coerce', they
+        are set to NA (0). Missing values and empty strings are always NA.
+
+    Returns
+    -------
+    ndarray[uint64]
+
+    Examples
+    --------
+    >>> to_macaddress(['00:1b:63:84:45:e6', '001b.6384.45e6', 1])
+    array([117633730022, 117633730022,            1], dtype=uint64)
+    """
+    if errors not in ('raise', 'coerce'):
+        raise ValueError("'errors' must be 'raise' or 'coerce'.")
 
-def to_macaddress(addresses):
-    if (isinstance(addresses, six.string_types) or
+    if (isinstance(addresses, six.string_types + (bytes,)) or
             not isinstance(addresses, Iterable)):
         addresses = [addresses]
-
-    addresses = [_parse(mac) if isinstance(mac, six.string_types) else mac
-                 for mac in addresses]
-    return np.array(addresses, dtype='u8')
+    if not isinstance(addresses, np.ndarray):
+        addresses = np.asarray(addresses, dtype=object)
+
+    if addresses.dtype.kind in 'US':
+        return _parse_mac_strings(addresses, errors=errors)
+    if addresses.dtype.kind in 'ui':
+        return addresses.astype('u8')
+
+    inferred = infer_dtype(addresses, skipna=False)
+    if inferred in ('string', 'unicode', 'bytes'):
+        return _parse_mac_strings(addresses, errors=errors)
+    elif inferred in ('integer', 'empty'):
+        return addresses.astype('u8')
+
+    # Mixed types: parse the strings together, and everything else one
+    # by one.
+    result = np.zeros(len(addresses), dtype='u8')
+    is_str = np.array([isinstance(x, six.string_types + (bytes,))
+                       for x in addresses], dtype=bool)
+    result[is_str] = _parse_mac_strings(addresses[is_str].astype('U'),
+                                        errors=errors)
+    for i in np.flatnonzero(~is_str):
+        value = addresses[i]
+        if is_scalar(value) and isna(value):
+            continue
+        try:
+            # Floats would be truncated
+            if isinstance(value, (float, np.floating)) and (
+                    not float(value).is_integer() or
+                    not 0 <= value < 2 ** 64):
+                raise ValueError
+            result[i] = value
+        except (TypeError, ValueError, OverflowError):
+            if errors == 'raise':
+                raise ValueError("Could not parse {!r} as a MAC "
+                                 "address.".format(value))
+    return result
@@ -0,0 +1,438 @@
+"""Reading NetFlow v5 and IPFIX export packets.
+
+Collectors often write the payloads of the UDP datagrams they receive
+straight to disk, one after the other. Both formats say how long each
+packet is, so such a file can be split back into packets.
+
+The flow records within a packet have a fixed layout, given by the
+format for NetFlow v5 and by a template for IPFIX. They're read with
+NumPy structured dtypes, so the only Python loop is over packets and
+IPFIX sets, not over records.
+
+* NetFlow v5: "NetFlow Export Datagram Format", in the Cisco NetFlow
+  Collection Engine user guide
+* https://tools.ietf.org/html/rfc7011
+* https://www.iana.org/assignments/ipfix/ipfix.xhtml
+"""
+import collections
+import struct
+
+import numpy as np
+import pandas as pd
+
+from .ip_array import IPArray, IPType, _widen
+
+_V5_HEADER = np.dtype([
+    ('version', '>u2'), ('count', '>u2'), ('sys_uptime', '>u4'),
+    ('unix_secs', '>u4'), ('unix_nsecs', '>u4'), ('flow_sequence', '>u4'),
+    ('engine_type', 'u1'), ('engine_id', 'u1'),
+    ('sampling_interval', '>u2'),
+])
+_V5_RECORD = np.dtype([
+    ('srcaddr', '>u4'), ('dstaddr', '>u4'), ('nexthop', '>u4'),
+    ('input', '>u2'), ('output', '>u2'), ('dPkts', '>u4'),
+    ('dOctets', '>u4'), ('first', '>u4'), ('last', '>u4'),
+    ('srcport', '>u2'), ('dstport', '>u2'), ('pad1', 'u1'),
+    ('tcp_flags', 'u1'), ('prot', 'u1'), ('tos', 'u1'), ('src_as', '>u2'),
+    ('dst_as', '>u2'), ('src_mask', 'u1'), ('dst_mask', 'u1'),
+    ('pad2', '>u2'),
+])
+_IPFIX_HEADER = struct.Struct('>HHIII')
+_SET_HEADER = struct.Struct('>HH')
+_FIELD = struct.Struct('>HH')
+
+_TEMPLATE_SET = 2
+_OPTIONS_TEMPLATE_SET = 3
+_VARIABLE_LENGTH = 65535
+_NTP_EPOCH = 2208988800  # 1900-01-01 to 1970-01-01, in seconds
+
+# The columns of the result, and their dtypes. 'ip' columns become an
+# IPArray.
+_COLUMNS = collections.OrderedDict([
+    ('start', 'M8[ns]'),
+    ('end', 'M8[ns]'),
+    ('src', 'ip'),
+    ('dst', 'ip'),
+    ('nexthop', 'ip'),
+    ('sport', 'u2'),
+    ('dport', 'u2'),
+    ('proto', 'u1'),
+    ('tcp_flags', 'u2'),
+    ('tos', 'u1'),
+    ('packets', 'u8'),
+    ('bytes', 'u8'),
+    ('input', 'u4'),
+    ('output', 'u4'),
+    ('src_as', 'u4'),
+    ('dst_as', 'u4'),
+    ('src_mask', 'u1'),
+    ('dst_mask', 'u1'),
+])
+
+# IPFIX information element -> (column, kind). The kind says how to
+# decode the element. Times become nanoseconds since the epoch.
+_IPFIX_ELEMENTS = {
+    1: ('bytes', 'uint'),       # octetDeltaCount
+    2: ('packets', 'uint'),     # packetDeltaCount
+    4: ('proto', 'uint'),       # protocolIdentifier
+    5: ('tos', 'uint'),         # ipClassOfService
+    6: ('tcp_flags', 'uint'),   # tcpControlBits
+    7: ('sport', 'uint'),       # sourceTransportPort
+    8: ('src', 'ipv4'),         # sourceIPv4Address
+    9: ('src_mask', 'uint'),    # sourceIPv4PrefixLength
+    10: ('input', 'uint'),      # ingressInterface
+    11: ('dport', 'uint'),      # destinationTransportPort
+    12: ('dst', 'ipv4'),        # destinationIPv4Address
+    13: ('dst_mask', 'uint'),   # destinationIPv4PrefixLength
+    14: ('output', 'uint'),     # egressInterface
+    15: ('nexthop', 'ipv4'),    # ipNextHopIPv4Address
+    16: ('src_as', 'uint'),     # bgpSourceAsNumber
+    17: ('dst_as', 'uint'),     # bgpDestinationAsNumber
+    21: ('end', 'uptime'),      # flowEndSysUpTime
+    22: ('start', 'uptime'),    # flowStartSysUpTime
+    27: ('src', 'ipv6'),        # sourceIPv6Address
+    28: ('dst', 'ipv6'),        # destinationIPv6Address
+    29: ('src_mask', 'uint'),   # sourceIPv6PrefixLength
+    30: ('dst_mask', 'uint'),   # destinationIPv6PrefixLength
+    62: ('nexthop', 'ipv6'),    # ipNextHopIPv6Address
+    150: ('start', 's'),        # flowStartSeconds
+    151: ('end', 's'),          # flowEndSeconds
+    152: ('start', 'ms'),       # flowStartMilliseconds
+    153: ('end', 'ms'),         # flowEndMilliseconds
+    154: ('start', 'ntp'),      # flowStartMicroseconds
+    155: ('end', 'ntp'),        # flowEndMicroseconds
+    156: ('start', 'ntp'),      # flowStartNanoseconds
+    157: ('end', 'ntp'),        # flowEndNanoseconds
+    158: ('start', 'delta_us'),  # flowStartDeltaMicroseconds
+    159: ('end', 'delta_us'),    # flowEndDeltaMicroseconds
+    160: (None, 'uint'),        # systemInitTimeMilliseconds
+}
+_SYSTEM_INIT_TIME = 160
+_UINT_LENGTHS = (1, 2, 4, 8)
+
+# Exporters resend their templates every few packets. They're decoded to
+# a dtype once, by layout.
+_TEMPLATE_DTYPES = {}
+
+
+def read_netflow(path):
+    """Read the flow records of NetFlow v5 and IPFIX packets.
+
+    Parameters
+    ----------
+    path : str
+        A file holding export packets one after another, as written by
+        a collector. Both formats may be mixed.
+
+    Returns
+    -------
+    DataFrame
+        With a row per flow record, in the order of the file, and the
+        columns
+
+        * start, end : datetime64[ns]. NaT when the template has no
+          flow times.
+        * src, dst, nexthop : IPArray
+        * sport, dport, proto, tcp_flags, tos : int
+        * packets, bytes : int
+        * input, output : int. The SNMP interface indexes.
+        * src_as, dst_as : int
+        * src_mask, dst_mask : int. The prefix lengths.
+
+        Fields missing from a template are 0.
+
+    Raises
+    ------
+    ValueError
+        For packets of other versions, such as NetFlow v9, or malformed
+        IPFIX messages.
+
+    Notes
+    -----
+    IPFIX templates apply to the data sets following them in the same
+    observation domain. Data sets whose template hasn't been seen yet,
+    options data, and templates with variable length fields are skipped.
+    The common information elements for IPv4 and IPv6 flows are decoded,
+    including reduced-size encodings. Other elements are ignored.
+
+    A truncated last packet is ignored.
+
+    Examples
+    --------
+    >>> df = read_netflow('flows.bin')
+    >>> df.groupby('src').bytes.sum()
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    groups = collections.OrderedDict()
+    templates = {}
+    rows = 0
+    pos = 0
+    while pos + 4 <= len(data):
+        version, word = _SET_HEADER.unpack_from(data, pos)
+        if version == 5:
+            length = _V5_HEADER.itemsize + word * _V5_RECORD.itemsize
+            if pos + length > len(data):
+                break
+            group = groups.setdefault('v5', _Group(_V5_RECORD, None))
+            rows = group.add(data, pos + _V5_HEADER.itemsize, word, rows,
+                             np.frombuffer(data, _V5_HEADER, 1, pos))
+        elif version == 10:
+            length = word
+            if length < _IPFIX_HEADER.size:
+                raise ValueError("Malformed IPFIX message at offset "
+                                 "{}.".format(pos))
+            if pos + length > len(data):
+                break
+            rows = _read_ipfix_message(data, pos, length, templates, groups,
+                                       rows)
+        else:
+            raise ValueError("Unsupported NetFlow version '{}' at offset "
+                             "{}.".format(version, pos))
+        pos += length
+
+    pieces = collections.defaultdict(list)
+    for key, group in groups.items():
+        if not group.chunks:
+            continue
+        positions, records, headers = group.concatenate()
+        if key == 'v5':
+            columns = _decode_v5(records, headers)
+        else:
+            columns = _decode_ipfix(records, group.fields, headers)
+        for name, values in columns.items():
+            pieces[name].append((positions, values))
+
+    frame = collections.OrderedDict()
+    for name, dtype in _COLUMNS.items():
+        frame[name] = _assemble(pieces[name], dtype, rows)
+    return pd.DataFrame(frame)
+
+
+class _Group(object):
+    """The records sharing a layout, as views of the file."""
+    def __init__(self, dtype, fields):
+        self.dtype = dtype
+        self.fields = fields
+        self.chunks = []
+
+    def add(self, data, offset, count, rows, header):
+        """Add `count` records at `offset`, starting at row `rows`."""
+        if count:
+            records = np.frombuffer(data, self.dtype, count, offset)
+            self.chunks.append((rows, records, header))
+        return rows + count
+
+    def concatenate(self):
+        """The rows, records and packet header of each record."""
+        counts = [len(records) for _, records, _ in self.chunks]
+        starts = np.array([rows for rows, _, _ in self.chunks], dtype='i8')
+        first = np.cumsum(counts) - counts
+        positions = (np.repeat(starts - first, counts) +
+                     np.arange(sum(counts)))
+        records = np.concatenate([records for _, records, _ in self.chunks])
+        headers = np.repeat(
+            np.concatenate([header for _, _, header in self.chunks]), counts)
+        return positions, records, headers
+
+
+def _read_ipfix_message(data, pos, length, templates, groups, rows):
+    _, _, export_time, _, domain = _IPFIX_HEADER.unpack_from(data, pos)
+    header = np.array([export_time], dtype='u4')
+    end = pos + length
+    pos += _IPFIX_HEADER.size
+    while pos + _SET_HEADER.size <= end:
+        set_id, set_length = _SET_HEADER.unpack_from(data, pos)
+        if set_length < _SET_HEADER.size or pos + set_length > end:
+            raise ValueError("Malformed IPFIX set at offset "
+                             "{}.".format(pos))
+        body, body_end = pos + _SET_HEADER.size, pos + set_length
+        if set_id in (_TEMPLATE_SET, _OPTIONS_TEMPLATE_SET):
+            _read_templates(data, body, body_end, domain,
+                            set_id == _OPTIONS_TEMPLATE_SET, templates)
+        elif set_id >= 256:
+            template = templates.get((domain, set_id))
+            if template is not None:
+                dtype, fields = template
+                # Templates with the same fields share a group.
+                key = (dtype, tuple(fields))
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = _Group(dtype, fields)
+                count = (body_end - body) // dtype.itemsize
+                rows = group.add(data, body, count, rows, header)
+        pos = body_end
+    return rows
+
+
+def _read_templates(data, pos, end, domain, options, templates):
+    """Add the template records of a set to `templates`.
+
+    Templates that can't be decoded, and options templates, map to None.
+    """
+    while pos + _FIELD.size <= end:
+        template_id, count = _FIELD.unpack_from(data, pos)
+        pos += _FIELD.size
+        if count == 0:
+            # Withdrawn
+            templates.pop((domain, template_id), None)
+            continue
+        if options:
+            # The scope field count
+            pos += 2
+
+        layout = []
+        while len(layout) < count and pos + _FIELD.size <= end:
+            element, length = _FIELD.unpack_from(data, pos)
+            pos += _FIELD.size
+            if element & 0x8000:
+                # Enterprise-specific, followed by the enterprise number
+                element = None
+                pos += 4
+            layout.append((element, length))
+        if len(layout) < count or pos > end:
+            raise ValueError("Malformed IPFIX template {}.".format(
+                template_id))
+        template = None
+        if not options and all(length != _VARIABLE_LENGTH
+                               for _, length in layout):
+            layout = tuple(layout)
+            template = _TEMPLATE_DTYPES.get(layout)
+            if template is None:
+                template = _TEMPLATE_DTYPES[layout] = _template_dtype(layout)
+        templates[(domain, template_id)] = template
+
+
+def _template_dtype(layout):
+    """The record dtype of a template, and its decoded fields.
+
+    Returns
+    -------
+    dtype : numpy.dtype
+    fields : list of (field name, element, kind)
+    """
+    names, formats, fields = [], [], []
+    for i, (element, length) in enumerate(layout):
+        name = 'f{}'.format(i)
+        column, kind = _IPFIX_ELEMENTS.get(element, (None, None))
+        if kind == 'ipv4' and length == 4:
+            fmt = '>u4'
+        elif kind == 'ipv6' and length == 16:
+            fmt = IPType._record_type
+        elif kind in ('uint', 'uptime', 's', 'ms', 'delta_us') and \
+                length in _UINT_LENGTHS:
+            fmt = '>u{}'.format(length)
+        elif kind == 'ntp' and length == 8:
+            fmt = '>u8'
+        else:
+            fmt = 'V{}'.format(length)
+            kind = None
+        names.append(name)
+        formats.append(fmt)
+        if kind is not None:
+            fields.append((name, element, kind))
+    return np.dtype({'names': names, 'formats': formats}), fields
+
+
+def _decode_v5(records, headers):
+    # The flow times are router uptimes, in milliseconds. The header
+    # gives the export time for the uptime it was sent at.
+    exported = (headers['unix_secs'].astype('i8') * 10 ** 9 +
+                headers['unix_nsecs'].astype('i8'))
+    uptime = headers['sys_uptime'].astype('i8')
+    return {
+        'start': exported - (uptime - records['first']) * 10 ** 6,
+        'end': exported - (uptime - records['last']) * 10 ** 6,
+        'src': records['srcaddr'].astype(IPType._compact_type),
+        'dst': records['dstaddr'].astype(IPType._compact_type),
+        'nexthop': records['nexthop'].astype(IPType._compact_type),
+        'sport': records['srcport'],
+        'dport': records['dstport'],
+        'proto': records['prot'],
+        'tcp_flags': records['tcp_flags'],
+        'tos': records['tos'],
+        'packets': records['dPkts'],
+        'bytes': records['dOctets'],
+        'input': records['input'],
+        'output': records['output'],
+        'src_as': records['src_as'],
+        'dst_as': records['dst_as'],
+        'src_mask': records['src_mask'],
+        'dst_mask': records['dst_mask'],
+    }
+
+
+def _decode_ipfix(records, fields, export_time):
+    columns = {}
+    system_init = None
+    for name, element, kind in fields:
+        if element == _SYSTEM_INIT_TIME:
+            system_init = records[name].astype('i8')
+    for name, element, kind in fields:
+        column = _IPFIX_ELEMENTS[element][0]
+        values = records[name]
+        if kind == 'ipv4':
+            values = values.astype(IPType._compact_type)
+            if column in columns:
+                values = _merge_addresses(values, columns[column])
+        elif kind == 'ipv6':
+            if column in columns:
+                values = _merge_addresses(columns[column], values)
+        elif kind == 'uptime':
+            if system_init is None:
+                continue
+            values = (system_init + values) * 10 ** 6
+        elif kind == 's':
+            values = values.astype('i8') * 10 ** 9
+        elif kind == 'ms':
+            values = values.astype('i8') * 10 ** 6
+        elif kind == 'ntp':
+            seconds = (values >> np.uint64(32)).astype('i8') - _NTP_EPOCH
+            fraction = values & np.uint64(0xffffffff)
+            values = (seconds * 10 ** 9 +
+                      ((fraction * np.uint64(10 ** 9)) >>
+                       np.uint64(32)).astype('i8'))
+        elif kind == 'delta_us':
+            values = (export_time.astype('i8') * 10 ** 9 -
+                      values.astype('i8') * 1000)
+        if column is not None:
+            columns[column] = values
+    return columns
+
+
+def _merge_addresses(ipv4, ipv6):
+    """IPv6 addresses where they're set, and IPv4 otherwise."""
+    if ipv4.dtype == IPType._compact_type:
+        ipv4 = _widen(ipv4)
+    unset = (ipv6['hi'] == 0) & (ipv6['lo'] == 0)
+    merged = ipv6.copy()
+    merged[unset] = ipv4[unset]
+    return merged
+
+
+def _assemble(pieces, dtype, rows):
+    """Scatter the values of each group into a column of the result."""
+    if dtype == 'ip':
+        if all(values.dtype == IPType._compact_type
+               for _, values in pieces):
+            out = np.zeros(rows, dtype=IPType._compact_type)
+        else:
+            out = np.zeros(rows, dtype=IPType._record_type)
+            pieces = [(positions, _widen(values)
+                       if values.dtype == IPType._compact_type else values)
+                      for positions, values in pieces]
+        for positions, values in pieces:
+            out[positions] = values
+        return IPArray._from_ndarray(out)
+
+    if dtype == 'M8[ns]':
+        out = np.full(rows, np.datetime64('NaT'), dtype=dtype)
+        for positions, values in pieces:
+            out[positions] = values.astype('i8').view(dtype)
+        return out
+
+    out = np.zeros(rows, dtype=dtype)
+    for positions, values in pieces:
+        out[positions] = values
+    return out
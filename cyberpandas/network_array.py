@@ -0,0 +1,709 @@
+import ipaddress
+
+import six
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionDtype
+from pandas.api.types import infer_dtype, is_scalar
+
+from ._accessor import (DelegatedMethod, DelegatedProperty,
+                        delegated_method)
+from ._utils import combine, factorize_codes, pack, unpack, prefix_masks
+from .base import NumPyBackedExtensionArrayMixin
+from .common import _IPv4_MAX
+from .ip_array import IPArray, IPType
+from .parser import _parse_ip_strings
+
+try:
+    from collections.abc import Iterable, Sequence
+except ImportError:  # Python 2
+    from collections import Iterable, Sequence
+
+# -----------------------------------------------------------------------------
+# Extension Type
+# -----------------------------------------------------------------------------
+
+
+@pd.api.extensions.register_extension_dtype
+class IPNetworkType(ExtensionDtype):
+    """Dtype for IP Network data."""
+    name = 'ipnetwork'
+    type = ipaddress._BaseNetwork
+    kind = 'O'
+    _record_type = np.dtype([('hi', '>u8'), ('lo', '>u8'),
+                             ('prefixlen', 'u1'), ('version', 'u1')])
+    na_value = np.nan
+
+    @classmethod
+    def construct_from_string(cls, string):
+        if string == cls.name:
+            return cls()
+        else:
+            raise TypeError("Cannot construct a '{}' from "
+                            "'{}'".format(cls, string))
+
+    @classmethod
+    def construct_array_type(cls):
+        return IPNetworkArray
+
+
+# Missing values have version 0, which no network has.
+_NA_RECORD = np.array([(0, 0, 128, 0)], dtype=IPNetworkType._record_type)[0]
+
+
+# -----------------------------------------------------------------------------
+# Extension Container
+# -----------------------------------------------------------------------------
+
+
+class IPNetworkArray(NumPyBackedExtensionArrayMixin):
+    """Holder for IP Networks.
+
+    IPNetworkArray is a container for IPv4 or IPv6 networks, like
+    ``192.168.0.0/16`` or ``2001:db8::/32``. It satisfies pandas' extension
+    array interface, and so can be stored inside :class:`pandas.Series` and
+    :class:`pandas.DataFrame`.
+
+    Host bits set in the input are masked off, i.e. ``'10.0.0.1/8'`` is
+    stored as ``'10.0.0.0/8'``.
+    """
+    # The network address is stored like IPArray, in 'hi' and 'lo' uint64
+    # fields. IPv4 networks live in the first /96, just like IPv4 addresses,
+    # so the 'prefixlen' field is always relative to the 128-bit address
+    # space: '10.0.0.0/8' is stored with a prefixlen of 104. The
+    # ``prefixlen`` property translates back to the version-specific length.
+    # The 'version' field is 4 or 6, as '::/120' and '0.0.0.0/24' share the
+    # other fields, and 0 for missing values.
+    __array_priority__ = 1000
+    _dtype = IPNetworkType()
+    _itemsize = 18
+    ndim = 1
+    can_hold_na = True
+
+    def __init__(self, values, dtype=None, copy=False):
+        values = _to_network_array(values)
+        if copy:
+            values = values.copy()
+        self.data = values
+
+    @classmethod
+    def _from_ndarray(cls, data, copy=False):
+        """Zero-copy construction of an IPNetworkArray from an ndarray.
+
+        Parameters
+        ----------
+        data : ndarray
+            This should have IPNetworkType._record_type dtype
+        copy : bool, default False
+            Whether to copy the data.
+
+        Returns
+        -------
+        ExtensionArray
+        """
+        if copy:
+            data = data.copy()
+        new = IPNetworkArray([])
+        new.data = data
+        return new
+
+    @classmethod
+    def from_addresses(cls, addresses, prefixlen):
+        """Construct an IPNetworkArray from addresses and prefix lengths.
+
+        Parameters
+        ----------
+        addresses : IPArray or sequence
+            The network addresses. Host bits are masked off.
+        prefixlen : int or array-like of int
+            The prefix lengths, relative to each address' version. That is,
+            IPv4 prefix lengths are between 0 and 32.
+
+        Returns
+        -------
+        IPNetworkArray
+
+        Examples
+        --------
+        >>> IPNetworkArray.from_addresses(['10.1.0.0', '2001:db8::'],
+        ...                               [16, 32])
+        IPNetworkArray(['10.1.0.0/16', '2001:db8::/32'])
+        """
+        addresses = IPArray(addresses)
+        prefixlen = np.broadcast_to(np.asarray(prefixlen, dtype='i8'),
+                                    (len(addresses),))
+        is_ipv4 = addresses.is_ipv4
+        prefixlen = np.where(is_ipv4, prefixlen + 96, prefixlen)
+        if ((prefixlen < 0) | (prefixlen > 128)).any():
+            raise ValueError("Invalid prefix length.")
+        hi, lo = addresses._hi_lo
+        return cls._from_ndarray(_records(hi, lo, prefixlen,
+                                          np.where(is_ipv4, 4, 6)))
+
+    # -------------------------------------------------------------------------
+    # Properties
+    # -------------------------------------------------------------------------
+    @property
+    def na_value(self):
+        """The missing value sentinal for IP Networks.
+
+        Missing networks are stored with version 0, so they can't be
+        mistaken for a network, and boxed as NaN.
+
+        Examples
+        --------
+        >>> IPNetworkArray([]).na_value
+        nan
+        """
+        return self.dtype.na_value
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        indices = np.asarray(indices, dtype='int')
+
+        if allow_fill and fill_value is None:
+            fill_value = self.na_value
+        if allow_fill:
+            fill_value = _to_network_array([fill_value])[0]
+            mask = (indices == -1)
+            if not len(self):
+                if not mask.all():
+                    msg = "Invalid take for empty array. Must be all -1."
+                    raise IndexError(msg)
+                else:
+                    took = np.full(len(indices), fill_value,
+                                   dtype=self.dtype._record_type)
+                    return self._from_ndarray(took)
+            if (indices < -1).any():
+                msg = ("Invalid value in 'indicies'. Must be all >= -1 "
+                       "for 'allow_fill=True'")
+                raise ValueError(msg)
+
+        took = self.data.take(indices)
+        if allow_fill:
+            took[mask] = fill_value
+
+        return self._from_ndarray(took)
+
+    # -------------------------------------------------------------------------
+    # Interfaces
+    # -------------------------------------------------------------------------
+
+    def __repr__(self):
+        formatted = self._format_values()
+        return "IPNetworkArray({!r})".format(formatted)
+
+    def _format_values(self):
+        return [str(net) for net in self.to_pynetworks()]
+
+    @staticmethod
+    def _box_scalar(scalar):
+        hi, lo, prefixlen, version = scalar
+        if version == 4:
+            return ipaddress.IPv4Network((int(lo), int(prefixlen) - 96))
+        if version == 6:
+            return ipaddress.IPv6Network((combine(int(hi), int(lo)),
+                                          int(prefixlen)))
+        return IPNetworkType.na_value
+
+    @property
+    def _parser(self):
+        return IPNetworkArray
+
+    def __setitem__(self, key, value):
+        value = _to_network_array(value)
+        self.data[key] = value
+
+    def __iter__(self):
+        return iter(self.to_pynetworks())
+
+    # ------------------------------------------------------------------------
+    # Serializaiton / Export
+    # ------------------------------------------------------------------------
+
+    def to_pynetworks(self):
+        """Convert the array to a list of scalar IP Network objects.
+
+        Returns
+        -------
+        networks : List
+            Each element of the list will be an :class:`ipaddress.IPv4Network`
+            or :class:`ipaddress.IPv6Network`, depending on the version of
+            that element.
+
+        Examples
+        ---------
+        >>> IPNetworkArray(['192.168.1.0/24', '2001:db8::/32']).to_pynetworks()
+        [IPv4Network('192.168.1.0/24'), IPv6Network('2001:db8::/32')]
+        """
+        return [self._box_scalar(x) for x in self.data.tolist()]
+
+    def astype(self, dtype, copy=True):
+        if isinstance(dtype, IPNetworkType):
+            if copy:
+                self = self.copy()
+            return self
+        return super(IPNetworkArray, self).astype(dtype)
+
+    # ------------------------------------------------------------------------
+    # Ops
+    # ------------------------------------------------------------------------
+
+    def __eq__(self, other):
+        if not isinstance(other, IPNetworkArray):
+            return NotImplemented
+        mask = self.isna() | other.isna()
+        result = self.data == other.data
+        result[mask] = False
+        return result
+
+    def equals(self, other):
+        if not isinstance(other, IPNetworkArray):
+            raise TypeError("Cannot compare 'IPNetworkArray' "
+                            "to type '{}'".format(type(other)))
+        return (self.data == other.data).all()
+
+    def _values_for_factorize(self):
+        # The records as fixed-width bytes, as for EndpointArray.
+        data = np.where(self.isna(), _NA_RECORD, self.data)
+        return data.view('S18'), _NA_RECORD.tobytes()
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        values = np.asarray(values, dtype='S18')
+        return cls._from_ndarray(values.view(IPNetworkType._record_type))
+
+    def _codes(self):
+        """Integer codes, in order of first appearance, that are equal
+        exactly where the networks are, computed like
+        ``EndpointArray._codes``."""
+        data = self.data
+        if not len(data):
+            return np.array([], dtype=np.intp)
+        hi = pd.factorize(data['hi'].astype('u8'))[0]
+        lo = pd.factorize(data['lo'].astype('u8'))[0]
+        address = pd.factorize(hi * (lo.max() + 1) + lo)[0]
+        # Missing values only differ in their version
+        prefix = np.where(self.isna(), -1,
+                          (data['version'].astype('i8') << 8) |
+                          data['prefixlen'].astype('i8'))
+        return pd.factorize(prefix * (address.max() + 1) + address)[0]
+
+    def factorize(self, na_sentinel=-1):
+        return factorize_codes(self, self._codes(), na_sentinel)
+
+    def value_counts(self, dropna=True):
+        """Count of each distinct network.
+
+        Parameters
+        ----------
+        dropna : bool, default True
+            Whether to exclude missing values.
+
+        Returns
+        -------
+        Series
+        """
+        codes, uniques = self.factorize()
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        index = uniques.astype(object)
+        if not dropna and (codes == -1).any():
+            counts = np.append(counts, (codes == -1).sum())
+            index = np.append(index, self.na_value)
+        return pd.Series(counts, index=pd.Index(index, dtype=object))
+
+    def isna(self):
+        """Indicator for whether each element is missing.
+
+        Examples
+        --------
+        >>> IPNetworkArray([None, '192.168.1.0/24']).isna()
+        array([ True, False])
+        """
+        return self.data['version'] == 0
+
+    # ------------------------------------------------------------------------
+    # Network Specific
+    # ------------------------------------------------------------------------
+
+    @property
+    def _masks(self):
+        """The netmasks as a (hi, lo) pair of uint64 ndarrays."""
+        return prefix_masks(self.data['prefixlen'])
+
+    @property
+    def is_ipv4(self):
+        """Indicator for whether each network is an IPv4 network."""
+        return self.data['version'] == 4
+
+    @property
+    def is_ipv6(self):
+        """Indicator for whether each network is an IPv6 network."""
+        return self.data['version'] == 6
+
+    @property
+    def version(self):
+        """IP version (4 or 6, and 0 for missing values)."""
+        return self.data['version'].astype('i8')
+
+    @property
+    def prefixlen(self):
+        """Length of the network prefix, in bits.
+
+        IPv4 prefix lengths are between 0 and 32, IPv6 between 0 and 128.
+        """
+        prefixlen = self.data['prefixlen'].astype('i8')
+        return np.where(self.is_ipv4, prefixlen - 96, prefixlen)
+
+    @property
+    def num_addresses(self):
+        """Total number of addresses in each network.
+
+        Returns
+        -------
+        ndarray
+            A uint64 ndarray when every network fits in 64 bits, otherwise
+            an object ndarray of Python integers.
+        """
+        host_bits = 128 - self.data['prefixlen'].astype('i8')
+        if not len(self) or host_bits.max() < 64:
+            return np.uint64(1) << host_bits.astype('u8')
+        return np.array([2 ** int(n) for n in host_bits], dtype=object)
+
+    @property
+    def network_address(self):
+        """The network address of each network, as an IPArray."""
+        data = np.empty(len(self), dtype=IPType._record_type)
+        data['hi'] = self.data['hi']
+        data['lo'] = self.data['lo']
+        return IPArray._from_ndarray(data)
+
+    @property
+    def broadcast_address(self):
+        """The broadcast (last) address of each network, as an IPArray."""
+        mask_hi, mask_lo = self._masks
+        data = np.empty(len(self), dtype=IPType._record_type)
+        data['hi'] = self.data['hi'] | ~mask_hi
+        data['lo'] = self.data['lo'] | ~mask_lo
+        return IPArray._from_ndarray(data)
+
+    @property
+    def netmask(self):
+        """The netmask of each network, as an IPArray."""
+        mask_hi, mask_lo = self._masks
+        data = np.empty(len(self), dtype=IPType._record_type)
+        is_v4 = self.is_ipv4
+        data['hi'] = np.where(is_v4, np.uint64(0), mask_hi)
+        data['lo'] = np.where(is_v4, mask_lo & np.uint64(_IPv4_MAX),
+                              mask_lo)
+        return IPArray._from_ndarray(data)
+
+    @property
+    def hostmask(self):
+        """The hostmask of each network, as an IPArray."""
+        mask_hi, mask_lo = self._masks
+        data = np.empty(len(self), dtype=IPType._record_type)
+        data['hi'] = ~mask_hi
+        data['lo'] = ~mask_lo
+        return IPArray._from_ndarray(data)
+
+    def contains(self, other):
+        """Check whether each network contains an address.
+
+        Comparison is done elementwise, so `other` should either be a single
+        address or have the same length as `self`.
+
+        Parameters
+        ----------
+        other : IPArray, scalar, or sequence
+            The addresses to look for. Anything that :class:`IPArray` accepts.
+
+        Returns
+        -------
+        contained : ndarray
+            A 1-D boolean ndarray with the same length as self.
+
+        See Also
+        --------
+        IPArray.isin
+
+        Examples
+        --------
+        >>> nets = IPNetworkArray(['192.168.1.0/24', '10.0.0.0/8'])
+        >>> nets.contains(IPArray(['192.168.1.10', '192.168.1.10']))
+        array([ True, False])
+        """
+        if not isinstance(other, IPArray):
+            if (isinstance(other, six.string_types) or
+                    not isinstance(other, Sequence)):
+                other = [other]
+            other = IPArray(other)
+        mask_hi, mask_lo = self._masks
+        nets = self.data
+        hi, lo = other._hi_lo
+        # IPArray stores '::1' like '0.0.0.1', so addresses can only be told
+        # apart by version outside of ::/96. IPv6 networks inside it
+        # contain the addresses with the same value.
+        in_v4_space = ((nets['hi'] == 0) & (nets['lo'] <= _IPv4_MAX) &
+                       (nets['prefixlen'] >= 96))
+        same_version = ((other.is_ipv4 == self.is_ipv4) |
+                        (self.is_ipv6 & in_v4_space))
+        return (same_version & ~self.isna() &
+                ((hi & mask_hi) == nets['hi']) &
+                ((lo & mask_lo) == nets['lo']))
+
+    def overlaps(self, other):
+        """Check whether each network overlaps another network.
+
+        Two networks overlap if either one contains the other. Comparison is
+        done elementwise, so `other` should either be a single network or
+        have the same length as `self`.
+
+        Parameters
+        ----------
+        other : IPNetworkArray, scalar, or sequence
+
+        Returns
+        -------
+        overlaps : ndarray
+            A 1-D boolean ndarray with the same length as self.
+
+        Examples
+        --------
+        >>> nets = IPNetworkArray(['192.168.0.0/16', '10.0.0.0/8'])
+        >>> nets.overlaps('192.168.1.0/24')
+        array([ True, False])
+        """
+        other = IPNetworkArray(other)
+        # Networks either nest or are disjoint, so they overlap exactly when
+        # both agree on the bits covered by the shorter prefix.
+        prefixlen = np.minimum(self.data['prefixlen'],
+                               other.data['prefixlen'])
+        mask_hi, mask_lo = prefix_masks(prefixlen)
+        return ((self.version == other.version) & ~self.isna() &
+                ((self.data['hi'] & mask_hi) ==
+                 (other.data['hi'] & mask_hi)) &
+                ((self.data['lo'] & mask_lo) ==
+                 (other.data['lo'] & mask_lo)))
+
+    def supernet(self, prefixlen_diff=1, new_prefix=None):
+        """The containing networks.
+
+        Parameters
+        ----------
+        prefixlen_diff : int, default 1
+            The amount the prefix length should be decreased by.
+        new_prefix : int, optional
+            The desired new prefix length of the supernets, relative to
+            each network's version. Conflicts with `prefixlen_diff`.
+
+        Returns
+        -------
+        IPNetworkArray
+
+        Examples
+        --------
+        >>> IPNetworkArray(['192.168.1.0/24', '2001:db8::/32']).supernet(8)
+        IPNetworkArray(['192.168.0.0/16', '2001:d00::/24'])
+        """
+        prefixlen = self.data['prefixlen'].astype('i8')
+        if new_prefix is not None:
+            if prefixlen_diff != 1:
+                raise ValueError("cannot set prefixlen_diff and new_prefix")
+            new = np.where(self.is_ipv4, new_prefix + 96, new_prefix)
+            if (new > prefixlen).any():
+                raise ValueError("new prefix must be shorter")
+        else:
+            new = prefixlen - prefixlen_diff
+        floor = np.where(self.is_ipv4, 96, 0)
+        if (new < floor).any():
+            raise ValueError("Prefix length diff {!r} is invalid for some "
+                             "networks".format(prefixlen_diff))
+        return self._from_ndarray(_records(self.data['hi'], self.data['lo'],
+                                           new, self.data['version']))
+
+
+def _records(hi, lo, prefixlen, version):
+    """Network records, with the host bits masked off.
+
+    Parameters
+    ----------
+    hi, lo : ndarray
+        The addresses.
+    prefixlen : ndarray
+        The prefix lengths, relative to 128 bits.
+    version : int or ndarray
+        4 or 6.
+
+    Returns
+    -------
+    ndarray
+        With IPNetworkType._record_type.
+    """
+    prefixlen = np.asarray(prefixlen, dtype='i8')
+    mask_hi, mask_lo = prefix_masks(prefixlen)
+    records = np.empty(len(prefixlen), dtype=IPNetworkType._record_type)
+    records['hi'] = hi & mask_hi
+    records['lo'] = lo & mask_lo
+    records['prefixlen'] = prefixlen
+    records['version'] = version
+    return records
+
+
+def _block_version(hi, lo, prefixlen):
+    """The version of blocks of the 128-bit space, like ``IPSet``'s.
+
+    As for IPArray, blocks inside the IPv4 space, the first 2**32
+    addresses, are IPv4 networks.
+    """
+    return np.where((hi == 0) & (lo <= _IPv4_MAX) & (prefixlen >= 96), 4, 6)
+
+
+def _to_network_array(values):
+    """Convert `values` to an ndarray with IPNetworkType._record_type."""
+    if isinstance(values, IPNetworkArray):
+        return values.data
+
+    if (isinstance(values, np.ndarray) and
+            values.dtype == IPNetworkType._record_type):
+        return np.atleast_1d(values)
+
+    if (isinstance(values, (six.string_types, tuple, ipaddress._BaseNetwork))
+            or not isinstance(values, Iterable)):
+        values = [values]
+
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+    if len(values) and infer_dtype(values, skipna=False) in ('string',
+                                                             'unicode'):
+        return _parse_network_strings(values)
+
+    records = []
+    for value in values:
+        if isinstance(value, tuple) and len(value) == 4:
+            records.append(value)
+        elif is_scalar(value) and pd.isna(value):
+            records.append(_NA_RECORD)
+        else:
+            records.append(_to_record(
+                ipaddress.ip_network(value, strict=False)))
+    return np.array(records, dtype=IPNetworkType._record_type)
+
+
+def _to_record(net):
+    """The record of an IPv4Network or IPv6Network, as a tuple."""
+    prefixlen = net.prefixlen
+    if net.version == 4:
+        prefixlen += 96
+    return (unpack(pack(int(net.network_address))) +
+            (prefixlen, net.version))
+
+
+def _parse_network_strings(values):
+    """Parse network strings into an ndarray of records.
+
+    ``'address/prefixlen'`` strings are parsed in bulk, with the address
+    parser of :class:`IPArray`, and anything else, e.g. netmasks, by
+    :func:`ipaddress.ip_network`.
+    """
+    values = np.asarray(values, dtype='U')
+    n = len(values)
+    width = values.dtype.itemsize // 4
+    codes = np.ascontiguousarray(values).view('u4').reshape(n, width)
+
+    # Split at the '/', as character codes.
+    slash = codes == ord('/')
+    at = np.where(slash.any(axis=1), slash.argmax(axis=1), width)
+    address = np.where(np.arange(width) < at[:, None], codes, 0)
+    address = address.astype('u4').view('U{}'.format(width))
+    address = address.reshape(n)
+
+    # One to three digits after the '/', and nothing else
+    prefixlen = np.zeros(n, dtype='i8')
+    n_digits = np.zeros(n, dtype='i8')
+    bulk = at < width
+    done = ~bulk
+    rows = np.arange(n)
+    for k in range(4):
+        j = at + 1 + k
+        c = np.where(j < width, codes[rows, np.minimum(j, width - 1)], 0)
+        c = c.astype('i8')
+        digit = ~done & (c >= ord('0')) & (c <= ord('9'))
+        prefixlen = np.where(digit, prefixlen * 10 + c - ord('0'), prefixlen)
+        n_digits += digit
+        stop = ~done & ~digit
+        bulk &= ~(stop & (c != 0))
+        done |= stop
+    bulk &= done & (n_digits > 0)
+
+    records = np.zeros(n, dtype=IPNetworkType._record_type)
+    if bulk.any():
+        addresses = _parse_ip_strings(address[bulk])
+        prefixlen = prefixlen[bulk]
+        # The version comes from the string, as '::/0' isn't '0.0.0.0/0'.
+        is_ipv4 = ~(codes[bulk] == ord(':')).any(axis=1)
+        if (prefixlen > np.where(is_ipv4, 32, 128)).any():
+            raise ValueError("Invalid prefix length.")
+        prefixlen = np.where(is_ipv4, prefixlen + 96, prefixlen)
+        records[bulk] = _records(addresses['hi'], addresses['lo'], prefixlen,
+                                 np.where(is_ipv4, 4, 6))
+    for i in np.flatnonzero(~bulk):
+        records[i] = _to_record(ipaddress.ip_network(values[i], strict=False))
+    return records
+
+
+# -----------------------------------------------------------------------------
+# Accessor
+# -----------------------------------------------------------------------------
+
+
+@pd.api.extensions.register_series_accessor("net")
+class IPNetworkAccessor:
+
+    is_ipv4 = DelegatedProperty("is_ipv4")
+    is_ipv6 = DelegatedProperty("is_ipv6")
+    version = DelegatedProperty("version")
+    prefixlen = DelegatedProperty("prefixlen")
+    num_addresses = DelegatedProperty("num_addresses")
+    network_address = DelegatedProperty("network_address")
+    broadcast_address = DelegatedProperty("broadcast_address")
+    netmask = DelegatedProperty("netmask")
+    hostmask = DelegatedProperty("hostmask")
+
+    isna = DelegatedMethod("isna")
+    to_pynetworks = DelegatedMethod("to_pynetworks")
+
+    def __init__(self, obj):
+        self._validate(obj)
+        self._data = obj.values
+        self._index = obj.index
+        self._name = obj.name
+
+    @staticmethod
+    def _validate(obj):
+        if not is_ipnetwork_type(obj):
+            raise AttributeError("Cannot use 'net' accessor on objects of "
+                                 "dtype '{}'.".format(obj.dtype))
+
+    def contains(self, other):
+        if isinstance(other, pd.Series):
+            other = other.values
+        return delegated_method(self._data.contains, self._index,
+                                self._name, other)
+
+    def overlaps(self, other):
+        if isinstance(other, pd.Series):
+            other = other.values
+        return delegated_method(self._data.overlaps, self._index,
+                                self._name, other)
+
+    def supernet(self, prefixlen_diff=1, new_prefix=None):
+        return delegated_method(self._data.supernet, self._index,
+                                self._name, prefixlen_diff, new_prefix)
+
+
+def is_ipnetwork_type(obj):
+    t = getattr(obj, 'dtype', obj)
+    try:
+        return isinstance(t, IPNetworkType) or issubclass(t, IPNetworkType)
+    except Exception:
+        return False
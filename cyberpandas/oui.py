@@ -0,0 +1,211 @@
+"""Vendor lookup for MAC addresses from IEEE registry files.
+
+The IEEE assigns blocks of MAC addresses from three registries:
+
+* MA-L: 24-bit prefixes (the classic OUI)
+* MA-M: 28-bit prefixes
+* MA-S: 36-bit prefixes
+
+MA-M and MA-S blocks are carved out of MA-L blocks, so lookups prefer
+the longest matching prefix.
+
+* https://regauth.standards.ieee.org/standards-ra-web/pub/view.html
+"""
+import io
+import re
+
+import numpy as np
+import pandas as pd
+import six
+
+from .mac_array import MACArray, to_macaddress
+
+# Lines of the text format look like
+#   00-1B-63   (hex)		Apple, Inc.
+#   001B63     (base 16)		Apple, Inc.
+# and for MA-M and MA-S, where the base 16 line gives the range of the
+# lower 24 bits,
+#   70-B3-D5   (hex)		Acme
+#   A3B000-A3BFFF     (base 16)		Acme
+_HEX_LINE = re.compile(r'^\s*([0-9A-Fa-f]{2})-([0-9A-Fa-f]{2})-'
+                       r'([0-9A-Fa-f]{2})\s+\(hex\)')
+_BASE16_LINE = re.compile(r'^\s*([0-9A-Fa-f]{6})(?:-([0-9A-Fa-f]{6}))?'
+                          r'\s+\(base 16\)\s*(.*?)\s*$')
+
+
+class OUIRegistry(object):
+    """A table of MAC address prefixes and the organizations they
+    are assigned to.
+
+    Parameters
+    ----------
+    prefixes : sequence of int
+        The leading bits of each assignment, e.g. ``0x001B63`` for a
+        24-bit prefix.
+    prefixlens : sequence of int
+        The number of bits in each prefix.
+    vendors : sequence of str
+        The organization of each prefix.
+
+    See Also
+    --------
+    OUIRegistry.from_file
+
+    Examples
+    --------
+    >>> registry = OUIRegistry([0x001B63], [24], ['Apple, Inc.'])
+    >>> registry.lookup(['00:1b:63:84:45:e6', '00:00:00:00:00:01'])
+    [Apple, Inc., NaN]
+    Categories (1, object): [Apple, Inc.]
+    """
+    def __init__(self, prefixes, prefixlens, vendors):
+        prefixes = np.asarray(prefixes, dtype='u8')
+        prefixlens = np.asarray(prefixlens, dtype='u1')
+        vendors = pd.Categorical(vendors)
+        if not (len(prefixes) == len(prefixlens) == len(vendors)):
+            raise ValueError("'prefixes', 'prefixlens' and 'vendors' must "
+                             "be the same length.")
+        if ((prefixlens < 1) | (prefixlens > 48)).any():
+            raise ValueError("Prefix lengths must be between 1 and 48.")
+
+        self.vendors = vendors.categories
+        # One sorted table per prefix length, longest first. Repeated
+        # assignments keep the first vendor.
+        self._tables = []
+        for prefixlen in np.unique(prefixlens)[::-1]:
+            mask = prefixlens == prefixlen
+            table, index = np.unique(prefixes[mask], return_index=True)
+            codes = vendors.codes[mask][index]
+            self._tables.append((int(prefixlen), table, codes))
+
+    def __repr__(self):
+        return "OUIRegistry(<{} prefixes, {} vendors>)".format(
+            len(self), len(self.vendors))
+
+    def __len__(self):
+        return sum(len(table) for _, table, _ in self._tables)
+
+    @classmethod
+    def from_file(cls, *paths):
+        """Load IEEE registry files.
+
+        Parameters
+        ----------
+        *paths : str or file-like
+            One or more of the IEEE's MA-L, MA-M, MA-S or CID files, in
+            either CSV (``oui.csv``) or text (``oui.txt``) format.
+
+        Returns
+        -------
+        OUIRegistry
+        """
+        prefixes, prefixlens, vendors = [], [], []
+        for path in paths:
+            p, l, v = _read_registry_file(path)
+            prefixes.extend(p)
+            prefixlens.extend(l)
+            vendors.extend(v)
+        return cls(prefixes, prefixlens, vendors)
+
+    def lookup_codes(self, values):
+        """Codes of the vendor of each MAC address.
+
+        Parameters
+        ----------
+        values : MACArray, Series, or sequence of int or str
+
+        Returns
+        -------
+        ndarray[int]
+            Positions in :attr:`OUIRegistry.vendors`, with -1 for
+            missing or unassigned addresses.
+        """
+        data = _mac_data(values)
+        codes = np.full(len(data), -1, dtype=np.intp)
+        missing = data != 0
+        # The prefix is the leading bits of a MAC-48, or of an EUI-64
+        width = np.where(data > np.uint64(2 ** 48 - 1), 64, 48)
+        for prefixlen, table, table_codes in self._tables:
+            if not missing.any():
+                break
+            keys = data >> (width - prefixlen).astype('u8')
+            pos = np.minimum(table.searchsorted(keys), len(table) - 1)
+            found = missing & (table[pos] == keys)
+            codes[found] = table_codes[pos[found]]
+            missing &= ~found
+        return codes
+
+    def lookup(self, values):
+        """The vendor of each MAC address.
+
+        Parameters
+        ----------
+        values : MACArray, Series, or sequence of int or str
+
+        Returns
+        -------
+        Categorical
+            NaN for missing or unassigned addresses.
+        """
+        return pd.Categorical.from_codes(self.lookup_codes(values),
+                                         self.vendors)
+
+
+def _mac_data(values):
+    if isinstance(values, pd.Series):
+        values = values.values
+    if isinstance(values, MACArray):
+        return values.data
+    return to_macaddress(values)
+
+
+def _read_registry_file(path):
+    if isinstance(path, six.string_types):
+        with io.open(path, encoding='utf-8') as f:
+            return _read_registry_file(f)
+
+    first = path.readline()
+    if isinstance(first, bytes):
+        path = io.TextIOWrapper(path, encoding='utf-8')
+        first = first.decode('utf-8')
+    if first.startswith('Registry,'):
+        return _read_registry_csv(first, path)
+    return _read_registry_text(first, path)
+
+
+def _read_registry_csv(first, f):
+    df = pd.read_csv(io.StringIO(first + f.read()), dtype=str,
+                     usecols=['Assignment', 'Organization Name'])
+    df = df.dropna(subset=['Assignment'])
+    assignments = df['Assignment'].str.strip()
+    # The number of hex digits gives the length of the prefix
+    prefixes = [int(x, 16) for x in assignments]
+    prefixlens = (assignments.str.len() * 4).tolist()
+    vendors = df['Organization Name'].fillna('').str.strip().tolist()
+    return prefixes, prefixlens, vendors
+
+
+def _read_registry_text(first, f):
+    prefixes, prefixlens, vendors = [], [], []
+    oui = None
+    for line in [first] + f.readlines():
+        match = _HEX_LINE.match(line)
+        if match:
+            oui = int(''.join(match.groups()), 16)
+            continue
+        match = _BASE16_LINE.match(line)
+        if not match:
+            continue
+        start, end, vendor = match.groups()
+        if end is None:
+            # MA-L
+            prefixes.append(int(start, 16))
+            prefixlens.append(24)
+        else:
+            # The range covers the bits below the prefix
+            start, end = int(start, 16), int(end, 16)
+            host_bits = (end - start).bit_length()
+            prefixes.append(((oui << 24) | start) >> host_bits)
+            prefixlens.append(48 - host_bits)
+        vendors.append(vendor)
+    return prefixes, prefixlens, vendors
@@ -0,0 +1,164 @@
+"""Reading and writing Parquet files with IP and MAC address columns.
+
+``DataFrame.to_parquet`` and ``pandas.read_parquet`` already keep the
+``ip`` and ``mac`` dtypes through the Arrow extension types registered by
+:mod:`cyberpandas._arrow`. The functions here add
+
+* storing columns of only IPv4 addresses as uint32, which is a quarter of
+  the size before compression and much faster to scan, and
+* skipping row groups whose address statistics can't match a CIDR filter.
+
+IP addresses are stored big-endian, as ``fixed_size_binary(16)``, or as
+``uint32`` when compact, so the row group min / max statistics Parquet
+writes order the same way as the addresses do.
+"""
+import ipaddress
+import struct
+
+import numpy as np
+import six
+
+from ._utils import combine
+from .ip_array import is_ipaddress_type
+
+
+def to_parquet(df, path, compact=False, **kwargs):
+    """Write a DataFrame to a Parquet file, keeping IP and MAC dtypes.
+
+    Parameters
+    ----------
+    df : DataFrame
+    path : str or file-like
+    compact : bool, default False
+        Whether to store IP address columns holding only IPv4 addresses
+        as ``uint32``. See :meth:`IPArray.compact`. This writes version 2.4
+        of the Parquet format unless another ``version`` is given.
+    **kwargs
+        Passed through to :func:`pyarrow.parquet.write_table`, e.g.
+        ``row_group_size`` or ``compression``.
+
+    Notes
+    -----
+    Row groups can only be skipped by :func:`read_parquet` when their
+    address ranges don't overlap, so sort by the filtered column before
+    writing.
+
+    Examples
+    --------
+    >>> df = pd.DataFrame({'src': IPArray(['10.0.0.1', '192.168.1.1'])})
+    >>> to_parquet(df, 'flows.parquet', compact=True)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if compact:
+        df = df.copy(deep=False)
+        for name in df.columns:
+            if is_ipaddress_type(df[name]):
+                df[name] = df[name].values.compact()
+        # Version 1.0 of the format has no unsigned 32-bit integers, and
+        # would store them as int64.
+        kwargs.setdefault('version', '2.4')
+
+    table = pa.Table.from_pandas(df)
+    pq.write_table(table, path, **kwargs)
+
+
+def read_parquet(path, columns=None, networks=None):
+    """Read a Parquet file, optionally filtering IP columns by network.
+
+    Parameters
+    ----------
+    path : str or file-like
+    columns : list of str, optional
+        The columns to read. By default, all of them.
+    networks : dict, optional
+        A mapping from column name to a network, or list of networks,
+        as strings or :mod:`ipaddress` objects. Only rows whose address in
+        every listed column lies within one of its networks are returned.
+        Row groups whose statistics rule out a match aren't read.
+
+    Returns
+    -------
+    DataFrame
+
+    Examples
+    --------
+    >>> read_parquet('flows.parquet', networks={'src': '10.0.0.0/8'})
+    """
+    import pyarrow.parquet as pq
+
+    f = pq.ParquetFile(path)
+    if not networks:
+        table = f.read(columns=columns, use_pandas_metadata=True)
+        return table.to_pandas()
+
+    networks = {name: _as_networks(nets) for name, nets in networks.items()}
+    read_columns = columns
+    if columns is not None:
+        read_columns = list(columns) + [name for name in networks
+                                        if name not in columns]
+
+    row_groups = [
+        i for i in range(f.num_row_groups)
+        if _row_group_may_match(f.metadata.row_group(i), networks)
+    ]
+    table = f.read_row_groups(row_groups, columns=read_columns,
+                              use_pandas_metadata=True)
+    df = table.to_pandas()
+
+    mask = np.ones(len(df), dtype=bool)
+    for name, nets in networks.items():
+        mask &= df[name].values.isin(nets)
+    df = df[mask]
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+def _as_networks(networks):
+    scalar_types = six.string_types + (ipaddress.IPv4Network,
+                                       ipaddress.IPv6Network)
+    if isinstance(networks, scalar_types):
+        networks = [networks]
+    return [ipaddress.ip_network(six.text_type(net)) for net in networks]
+
+
+def _network_bounds(network):
+    # IPv4 networks are the addresses below 2**32, as in IPArray.
+    return int(network.network_address), int(network.broadcast_address)
+
+
+def _row_group_may_match(row_group, networks):
+    bounds = _column_bounds(row_group)
+    for name, nets in networks.items():
+        if name not in bounds:
+            continue
+        lo, hi = bounds[name]
+        if not any(start <= hi and lo <= end
+                   for start, end in map(_network_bounds, nets)):
+            return False
+    return True
+
+
+def _column_bounds(row_group):
+    """The min and max address of each column with usable statistics."""
+    bounds = {}
+    for i in range(row_group.num_columns):
+        column = row_group.column(i)
+        stats = column.statistics
+        if stats is None or not stats.has_min_max:
+            continue
+        if column.physical_type == 'FIXED_LEN_BYTE_ARRAY':
+            if len(stats.min) != 16:
+                continue
+            lo = combine(*struct.unpack('>QQ', stats.min))
+            hi = combine(*struct.unpack('>QQ', stats.max))
+        elif column.physical_type == 'INT32':
+            # Compact IPv4 addresses. pyarrow reads the statistics of
+            # uint32 columns as unsigned.
+            lo, hi = int(stats.min), int(stats.max)
+        else:
+            continue
+        bounds[column.path_in_schema] = lo, hi
+    return bounds
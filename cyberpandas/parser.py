@@ -1,10 +1,14 @@
 import ipaddress
+import socket
 
 import numpy as np
-from pandas.api.types import is_list_like
+from pandas.api.types import infer_dtype, is_list_like
 
 from ._utils import pack, unpack
 
+# Not available on Windows before Python 3.4.
+_inet_pton = getattr(socket, 'inet_pton', None)
+
 
 def to_ipaddress(values):
     """Convert values to IPArray
@@ -46,7 +50,7 @@ def _to_ip_array(values):
     from .ip_array import IPType, IPArray
 
     if isinstance(values, IPArray):
-        return values.data
+        return values._data
 
     if (isinstance(values, np.ndarray) and
             values.ndim == 1 and
@@ -78,11 +82,102 @@ def _to_int_pairs(values):
         # TODO: not great
         pass
     else:
+        if not isinstance(values, np.ndarray):
+            values = list(values)
+        inferred = infer_dtype(values, skipna=False) if len(values) else ''
+        if inferred in ('string', 'unicode'):
+            return _parse_ip_strings(values)
         values = [ipaddress.ip_address(v)._ip for v in values]
         values = [unpack(pack(v)) for v in values]
     return values
 
 
+def _parse_ip_strings(values):
+    """Parse IP address strings into an ndarray of records.
+
+    IPv4 dotted quads are parsed in bulk, IPv6 addresses by
+    :func:`socket.inet_pton`, and anything else by
+    :func:`ipaddress.ip_address`.
+    """
+    from .ip_array import IPType
+
+    values = np.asarray(values, dtype='U')
+    result = np.zeros(len(values), dtype=IPType._record_type)
+    result['lo'], parsed = _parse_ipv4_strings(values)
+    rest = np.flatnonzero(~parsed)
+    if len(rest):
+        packed = b''.join(_pack_ip_string(value) for value in values[rest])
+        result[rest] = np.frombuffer(packed, dtype=IPType._record_type)
+    return result
+
+
+def _pack_ip_string(value):
+    """The 16 big-endian bytes of an IP address string."""
+    if _inet_pton is not None:
+        try:
+            return _inet_pton(socket.AF_INET6, str(value))
+        except (socket.error, ValueError, UnicodeError):
+            pass
+    return pack(ipaddress.ip_address(value)._ip)
+
+
+def _parse_ipv4_strings(values):
+    """Vectorized parsing of IPv4 dotted-quad strings.
+
+    The strings are viewed as a 2-D array of character codes, and the
+    octets accumulated one column at a time.
+
+    Parameters
+    ----------
+    values : ndarray
+        Unicode or bytes strings.
+
+    Returns
+    -------
+    addresses : ndarray[uint64]
+    parsed : ndarray[bool]
+        Whether each string was a plain dotted quad. Other strings, like
+        IPv6 addresses or octets with leading zeros, are left for
+        :mod:`ipaddress` to parse or reject.
+    """
+    values = np.asarray(values)
+    n = len(values)
+    char_type = 'u4' if values.dtype.kind == 'U' else 'u1'
+    width = values.dtype.itemsize // np.dtype(char_type).itemsize
+    codes = np.ascontiguousarray(values).view(char_type).reshape(n, width)
+    # Nothing longer than '255.255.255.255' is a dotted quad
+    codes = codes[:, :16]
+
+    result = np.zeros(n, dtype='i8')
+    octet = np.zeros(n, dtype='i8')
+    n_digits = np.zeros(n, dtype='i8')
+    n_dots = np.zeros(n, dtype='i8')
+    ok = np.ones(n, dtype=bool)
+    ended = np.zeros(n, dtype=bool)
+    for j in range(codes.shape[1] + 1):
+        if j < codes.shape[1]:
+            c = codes[:, j].astype('i8')
+        else:
+            c = np.zeros(n, dtype='i8')
+        end = c == 0
+        digit = (c >= ord('0')) & (c <= ord('9'))
+        dot = c == ord('.')
+        ok &= (digit | dot | end) & ~(ended & ~end)
+        # No leading zeros
+        ok &= ~(digit & (n_digits == 1) & (octet == 0))
+        octet = np.where(digit, octet * 10 + (c - ord('0')), octet)
+        n_digits += digit
+        closes = dot | (end & ~ended)
+        ok &= ~(closes & ((n_digits == 0) | (n_digits > 3) | (octet > 255)))
+        result = np.where(closes, (result << 8) | octet, result)
+        octet[closes] = 0
+        n_digits[closes] = 0
+        n_dots += dot
+        ended |= end
+    ok &= n_dots == 3
+    return np.where(ok, result, 0).astype('u8'), ok
+
+
 def _to_ipaddress_pyint(values):
     from .ip_array import IPType
 
@@ -0,0 +1,261 @@
+"""Reading packet headers from pcap files.
+
+Only the classic libpcap format is supported, not pcapng.
+
+* https://wiki.wireshark.org/Development/LibpcapFileFormat
+* https://www.tcpdump.org/linktypes.html
+"""
+import mmap
+import struct
+
+import numpy as np
+import pandas as pd
+
+from ._utils import ordered_frame
+from .ip_array import IPArray, IPType
+from .mac_array import MACArray
+
+# magic number -> (byte order, nanoseconds per timestamp unit)
+_MAGIC = {
+    b'\xd4\xc3\xb2\xa1': ('<', 1000),
+    b'\xa1\xb2\xc3\xd4': ('>', 1000),
+    b'\x4d\x3c\xb2\xa1': ('<', 1),
+    b'\xa1\xb2\x3c\x4d': ('>', 1),
+}
+_GLOBAL_HEADER = 24
+_RECORD_HEADER = 16
+
+_LINKTYPE_ETHERNET = 1
+_LINKTYPE_RAW = (101, 12, 14)
+_LINKTYPE_LINUX_SLL = 113
+
+_ETHERTYPE_IPV4 = 0x0800
+_ETHERTYPE_IPV6 = 0x86dd
+_ETHERTYPE_VLAN = (0x8100, 0x88a8, 0x9100)
+
+# IPv6 extension headers that come before the transport header. The
+# fragment header is always 8 bytes, the others give their length.
+_IPV6_EXTENSIONS = (0, 43, 60)
+_IPV6_FRAGMENT = 44
+_PORT_PROTOCOLS = (6, 17, 132)  # TCP, UDP, SCTP
+
+
+def read_pcap(path):
+    """Read the packet headers of a pcap file into a DataFrame.
+
+    The file is memory mapped, and the headers of all the packets are
+    decoded at once with NumPy.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    DataFrame
+        With a row per packet and the columns
+
+        * timestamp : datetime64[ns]
+        * length : int. The length of the packet on the wire.
+        * eth_src, eth_dst : MACArray. 0 for captures without Ethernet
+          headers.
+        * ethertype : int. After any VLAN tags.
+        * src, dst : IPArray. ``0.0.0.0`` for non-IP packets.
+        * proto : int. The IP protocol, or the IPv6 header after any
+          extension headers.
+        * sport, dport : int. For TCP, UDP and SCTP, and 0 otherwise.
+
+    Notes
+    -----
+    Ethernet (with 802.1Q VLAN tags), raw IP and Linux cooked captures
+    are supported. Fields past the end of a packet's captured bytes, e.g.
+    because of a short snaplen, are 0.
+
+    Examples
+    --------
+    >>> df = read_pcap('capture.pcap')
+    >>> df.groupby(['src', 'dport']).length.sum()
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_GLOBAL_HEADER)
+        if len(header) < _GLOBAL_HEADER or header[:4] not in _MAGIC:
+            raise ValueError("'{}' is not a pcap file. pcapng files "
+                             "aren't supported.".format(path))
+        order, ts_scale = _MAGIC[header[:4]]
+        linktype = struct.unpack(order + 'I', header[20:24])[0] & 0x0fffffff
+
+        if linktype == _LINKTYPE_ETHERNET:
+            link_length = 14
+        elif linktype in _LINKTYPE_RAW:
+            link_length = 0
+        elif linktype == _LINKTYPE_LINUX_SLL:
+            link_length = 16
+        else:
+            raise ValueError("Unsupported link type '{}'.".format(linktype))
+
+        f.seek(0, 2)
+        if f.tell() == _GLOBAL_HEADER:
+            return _empty_frame()
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        buf = np.frombuffer(mm, dtype='u1')
+        records = _record_offsets(mm, order)
+        df = _decode(buf, records, order, ts_scale, linktype, link_length)
+        del buf
+    finally:
+        mm.close()
+    return df
+
+
+def _empty_frame():
+    return _decode(np.zeros(0, dtype='u1'), np.zeros(0, dtype=np.intp),
+                   '<', 1, _LINKTYPE_RAW[0], 0)
+
+
+def _record_offsets(mm, order):
+    """The offsets of the record headers.
+
+    Each record's length is in its header, so this walks the file.
+    """
+    unpack_from = struct.Struct(order + 'I').unpack_from
+    size = len(mm)
+    offsets = []
+    append = offsets.append
+    pos = _GLOBAL_HEADER
+    while pos + _RECORD_HEADER <= size:
+        append(pos)
+        pos += _RECORD_HEADER + unpack_from(mm, pos + 8)[0]
+    # A truncated last packet is kept, reads past the end of the file
+    # give 0.
+    return np.array(offsets, dtype=np.intp)
+
+
+class _Packets(object):
+    """Fixed-width reads at per-packet positions."""
+    def __init__(self, buf, start, end):
+        self.buf = buf
+        self.start = start
+        self.end = end
+
+    def read(self, pos, width, dtype):
+        """Read `width` bytes at each position as `dtype`.
+
+        Reads past the end of a packet, or of the file, give 0.
+        """
+        windows = _windows(self.buf, dtype)
+        # Indexing is much faster than take(mode='clip') on these views.
+        values = windows[np.clip(pos, 0, len(windows) - 1)]
+        values[(pos < self.start) | (pos + width > self.end)] = 0
+        return values
+
+
+def _windows(buf, dtype):
+    """A view of `buf` with an item starting at every byte."""
+    dtype = np.dtype(dtype)
+    count = max(len(buf) - dtype.itemsize + 1, 0)
+    return np.ndarray((count,), dtype=dtype, buffer=buf, strides=(1,))
+
+
+def _decode(buf, records, order, ts_scale, linktype, link_length):
+    n = len(records)
+    start = records + _RECORD_HEADER
+    end = np.minimum(start + _read_record_field(buf, records, 8, order),
+                     len(buf))
+    packets = _Packets(buf, start, end)
+
+    sec = _read_record_field(buf, records, 0, order)
+    sub = _read_record_field(buf, records, 4, order)
+    timestamp = sec.astype('i8') * 10 ** 9 + sub.astype('i8') * ts_scale
+    length = _read_record_field(buf, records, 12, order)
+
+    eth_dst = np.zeros(n, dtype='u8')
+    eth_src = np.zeros(n, dtype='u8')
+    if linktype == _LINKTYPE_ETHERNET:
+        for offset, out in [(0, eth_dst), (6, eth_src)]:
+            hi = packets.read(start + offset, 2, '>u2').astype('u8')
+            lo = packets.read(start + offset + 2, 4, '>u4').astype('u8')
+            out[:] = (hi << np.uint64(32)) | lo
+        ethertype = packets.read(start + 12, 2, '>u2')
+        l3 = start + link_length
+        # Up to two VLAN tags
+        for _ in range(2):
+            tagged = np.isin(ethertype, _ETHERTYPE_VLAN)
+            l3 = np.where(tagged, l3 + 4, l3)
+            ethertype = np.where(tagged, packets.read(l3 - 2, 2, '>u2'),
+                                 ethertype)
+    elif linktype == _LINKTYPE_LINUX_SLL:
+        ethertype = packets.read(start + 14, 2, '>u2')
+        l3 = start + link_length
+    else:
+        # Raw IP. The version is in the first nibble.
+        l3 = start
+        version = packets.read(l3, 1, 'u1') >> 4
+        ethertype = np.select([version == 4, version == 6],
+                              [_ETHERTYPE_IPV4, _ETHERTYPE_IPV6], 0)
+    ethertype = ethertype.astype('u2')
+
+    first = packets.read(l3, 1, 'u1')
+    is_v4 = (ethertype == _ETHERTYPE_IPV4) & (first >> 4 == 4)
+    is_v6 = (ethertype == _ETHERTYPE_IPV6) & (first >> 4 == 6)
+
+    # IPv4
+    ihl = (first & 0x0f).astype(np.intp) * 4
+    frag_offset = packets.read(l3 + 6, 2, '>u2') & 0x1fff
+    v4_src = packets.read(l3 + 12, 4, '>u4')
+    v4_dst = packets.read(l3 + 16, 4, '>u4')
+
+    # IPv6, skipping extension headers
+    next_header = packets.read(l3 + 6, 1, 'u1')
+    l4_v6 = l3 + 40
+    v6_fragment = np.zeros(n, dtype=bool)
+    for _ in range(4):
+        ext = is_v6 & np.isin(next_header, _IPV6_EXTENSIONS)
+        frag = is_v6 & (next_header == _IPV6_FRAGMENT)
+        if not (ext.any() or frag.any()):
+            break
+        ext_length = (packets.read(l4_v6 + 1, 1, 'u1').astype(np.intp) + 1) * 8
+        # Later fragments have no transport header
+        v6_fragment |= frag & (packets.read(l4_v6 + 2, 2, '>u2') >> 3 != 0)
+        following = packets.read(l4_v6, 1, 'u1')
+        next_header = np.where(ext | frag, following, next_header)
+        l4_v6 = np.where(ext, l4_v6 + ext_length,
+                         np.where(frag, l4_v6 + 8, l4_v6))
+
+    src = np.zeros(n, dtype=IPType._record_type)
+    dst = np.zeros(n, dtype=IPType._record_type)
+    src['lo'] = np.where(is_v4, v4_src, 0)
+    dst['lo'] = np.where(is_v4, v4_dst, 0)
+    for offset, out in [(8, src), (24, dst)]:
+        hi = packets.read(l3 + offset, 8, '>u8')
+        lo = packets.read(l3 + offset + 8, 8, '>u8')
+        out['hi'] = np.where(is_v6, hi, np.uint64(0))
+        out['lo'] = np.where(is_v6, lo, out['lo'])
+
+    proto = np.select([is_v4, is_v6],
+                      [packets.read(l3 + 9, 1, 'u1'), next_header],
+                      0).astype('u1')
+    l4 = np.where(is_v4, l3 + ihl, l4_v6)
+    has_ports = (np.isin(proto, _PORT_PROTOCOLS) &
+                 ((is_v4 & (frag_offset == 0)) | (is_v6 & ~v6_fragment)))
+    sport = np.where(has_ports, packets.read(l4, 2, '>u2'), 0).astype('u2')
+    dport = np.where(has_ports, packets.read(l4 + 2, 2, '>u2'),
+                     0).astype('u2')
+
+    return ordered_frame([
+        ('timestamp', pd.to_datetime(timestamp, unit='ns')),
+        ('length', length.astype('u4')),
+        ('eth_src', MACArray(eth_src, copy=False)),
+        ('eth_dst', MACArray(eth_dst, copy=False)),
+        ('ethertype', ethertype),
+        ('src', IPArray._from_ndarray(src)),
+        ('dst', IPArray._from_ndarray(dst)),
+        ('proto', proto),
+        ('sport', sport),
+        ('dport', dport),
+    ])
+
+
+def _read_record_field(buf, records, offset, order):
+    """A uint32 field of each record header."""
+    return _windows(buf, order + 'u4')[records + offset].astype('u4')
@@ -0,0 +1,147 @@
+"""Sharing arrays between processes through shared memory.
+
+Requires Python 3.8 or newer, for :mod:`multiprocessing.shared_memory`.
+"""
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Python < 3.8
+    shared_memory = None
+
+# The blocks mapped by this process, by name. A block stays mapped until
+# it's detached, so arrays attached to it stay valid and attaching again
+# is free.
+_ATTACHED = {}
+
+
+class SharedArray(object):
+    """An IPArray or MACArray in shared memory.
+
+    Creating a SharedArray copies the array's data into a new block of
+    shared memory. The SharedArray is a small handle to that block, and
+    can be passed to other processes, e.g. as an argument of
+    :meth:`multiprocessing.pool.Pool.map`, where :meth:`SharedArray.attach`
+    gives a zero-copy array viewing it.
+
+    The process creating the SharedArray owns the block, and must
+    :meth:`SharedArray.unlink` it when done. Using the SharedArray as a
+    context manager does that on exit.
+
+    Before Python 3.13, processes that attach should be started by
+    :mod:`multiprocessing` from the creating process. Others have their
+    own resource tracker, which unlinks the block when they exit.
+
+    Parameters
+    ----------
+    values : IPArray or MACArray
+        Any array with ``_storage`` and ``_from_ndarray``.
+
+    Examples
+    --------
+    >>> def count_private(shared):
+    ...     return shared.attach().is_private.sum()
+
+    >>> with SharedArray(IPArray(['10.0.0.1', '8.8.8.8'])) as shared:
+    ...     with multiprocessing.Pool(2) as pool:
+    ...         pool.map(count_private, [shared, shared])
+    [1, 1]
+    """
+    def __init__(self, values):
+        if shared_memory is None:
+            raise ImportError("SharedArray requires Python 3.8 or newer.")
+        data = values._storage
+        shm = shared_memory.SharedMemory(create=True,
+                                         size=max(data.nbytes, 1))
+        view = np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)
+        view[:] = data
+        del view
+
+        _ATTACHED[shm.name] = shm
+        self.name = shm.name
+        self.array_type = type(values)
+        self.dtype = data.dtype
+        self.length = len(data)
+        self._owner = True
+
+    def __repr__(self):
+        return "SharedArray(name='{}', array_type={}, length={})".format(
+            self.name, self.array_type.__name__, self.length)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Only the creating process unlinks the block.
+        state['_owner'] = False
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.unlink()
+
+    def attach(self):
+        """An array viewing the shared memory.
+
+        Writes to the array are seen by every process attached to the
+        block.
+
+        Returns
+        -------
+        IPArray or MACArray
+        """
+        shm = _ATTACHED.get(self.name)
+        if shm is None:
+            shm = _ATTACHED[self.name] = _open(self.name)
+        # Unlike np.frombuffer, np.asarray holds on to the buffer, so the
+        # block can't be unmapped while arrays view it.
+        nbytes = self.length * self.dtype.itemsize
+        data = np.asarray(shm.buf)[:nbytes].view(self.dtype)
+        return self.array_type._from_ndarray(data)
+
+    def detach(self):
+        """Unmap the block from this process.
+
+        Arrays from :meth:`SharedArray.attach` in this process must be
+        deleted first. Processes exiting unmap their blocks anyway, so
+        this is only needed by long running processes.
+
+        Raises
+        ------
+        BufferError
+            When arrays from :meth:`SharedArray.attach` still exist.
+        """
+        shm = _ATTACHED.get(self.name)
+        if shm is not None:
+            shm.close()
+            del _ATTACHED[self.name]
+
+    def unlink(self):
+        """Free the block, once every process has detached from it.
+
+        Only the process that created the SharedArray can unlink it.
+        This detaches it from this process, so arrays from
+        :meth:`SharedArray.attach` here must be deleted first.
+        """
+        if not self._owner:
+            raise ValueError("Only the process that created a SharedArray "
+                             "can unlink it.")
+        shm = _ATTACHED.get(self.name)
+        if shm is None:
+            shm = _open(self.name)
+        shm.unlink()
+        self._owner = False
+        self.detach()
+
+
+def _open(name):
+    try:
+        # Python 3.13+. Only the creator's resource tracker should unlink
+        # the block.
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Before 3.13, opening registers the block with this process's
+        # resource tracker. Processes started by multiprocessing share
+        # their parent's, which already tracks it.
+        return shared_memory.SharedMemory(name)
@@ -0,0 +1,201 @@
+"""Reading Zeek (formerly Bro) logs.
+
+Zeek's default log format is tab separated, with a header of ``#``
+directives naming the fields and their Zeek types::
+
+    #separator \\x09
+    #set_separator	,
+    #empty_field	(empty)
+    #unset_field	-
+    #path	conn
+    #fields	ts	uid	id.orig_h	id.orig_p	...
+    #types	time	string	addr	port	...
+
+* https://docs.zeek.org/en/current/log-formats.html
+"""
+import codecs
+import csv
+import gzip
+
+import numpy as np
+import pandas as pd
+
+from ._utils import ordered_frame
+from .ip_array import IPArray
+from .network_array import (IPNetworkArray, _NA_RECORD,
+                            _parse_network_strings)
+from .parser import _parse_ip_strings
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_INTEGER_TYPES = ('count', 'int', 'port')
+_NUMERIC_TYPES = _INTEGER_TYPES + ('double', 'time', 'interval')
+
+
+def read_zeek(path, chunksize=None):
+    """Read a Zeek log in the tab separated format into a DataFrame.
+
+    Parameters
+    ----------
+    path : str
+        The log file. Gzip compressed logs, as Zeek archives them, are
+        read too.
+    chunksize : int, optional
+        Return an iterator of DataFrames with this many rows each, rather
+        than reading the whole log at once.
+
+    Returns
+    -------
+    DataFrame, or an iterator of DataFrames with `chunksize`
+
+        Columns are named by the ``#fields`` header, and typed by
+        ``#types``
+
+        * addr : IPArray. Unset addresses are NA.
+        * subnet : IPNetworkArray
+        * time : datetime64[ns]
+        * interval : timedelta64[ns]
+        * count, int, port, double : int, or float when some values are
+          unset.
+        * bool : bool, or object when some values are unset.
+        * Others, including sets and vectors, are left as strings.
+          Unset values are NaN.
+
+    Notes
+    -----
+    The address columns are parsed in bulk, without an
+    :mod:`ipaddress` object per row.
+
+    Examples
+    --------
+    >>> conn = read_zeek('conn.log.gz')
+    >>> conn.groupby('id.orig_h')['orig_bytes'].sum()
+
+    >>> for chunk in read_zeek('dns.log', chunksize=1000000):
+    ...     chunk[chunk['id.resp_h'].ip.is_global]
+    """
+    header = _read_header(path)
+    # pandas' C parser converts the numbers. Everything else is read as
+    # strings.
+    numeric = [name for name, zeek_type in zip(header['fields'],
+                                               header['types'])
+               if zeek_type in _NUMERIC_TYPES]
+    reader = pd.read_csv(
+        path, sep=header['separator'], header=None,
+        names=header['fields'], skiprows=header['length'],
+        dtype={name: str for name in header['fields']
+               if name not in numeric},
+        # The '#close' line is missing the other fields.
+        na_values={name: [header['unset_field'], ''] for name in numeric},
+        keep_default_na=False, quoting=csv.QUOTE_NONE, low_memory=False,
+        compression='gzip' if header['gzip'] else None,
+        chunksize=chunksize,
+    )
+    if chunksize is None:
+        return _convert(reader, header)
+    return (_convert(chunk, header) for chunk in reader)
+
+
+def _read_header(path):
+    """Parse the ``#`` directives at the start of a log."""
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == _GZIP_MAGIC
+    opener = gzip.open if compressed else open
+
+    header = {
+        'separator': '\t',
+        'empty_field': '(empty)',
+        'unset_field': '-',
+        'gzip': compressed,
+        'length': 0,
+    }
+    with opener(path, 'rb') as f:
+        for line in f:
+            line = line.decode('utf-8').rstrip('\r\n')
+            if not line.startswith('#'):
+                break
+            header['length'] += 1
+            if line.startswith('#separator '):
+                # The only directive separated by a space, as it defines
+                # the separator.
+                header['separator'] = codecs.decode(
+                    line[len('#separator '):], 'unicode_escape')
+                continue
+            directive, _, value = line[1:].partition(header['separator'])
+            values = value.split(header['separator'])
+            if directive in ('fields', 'types'):
+                header[directive] = values
+            else:
+                header[directive] = value
+
+    if 'fields' not in header or 'types' not in header:
+        raise ValueError("'{}' is not a Zeek log. It has no '#fields' and "
+                         "'#types' header.".format(path))
+    if len(header['fields']) != len(header['types']):
+        raise ValueError("The '#fields' and '#types' headers of '{}' "
+                         "differ in length.".format(path))
+    return header
+
+
+def _convert(df, header):
+    # A '#close' line ends the log.
+    first = df[header['fields'][0]].values
+    if first.dtype == object:
+        # 'U1' keeps the first character.
+        keep = first.astype('U1') != u'#'
+    else:
+        keep = np.ones(len(first), dtype=bool)
+    return ordered_frame(
+        (name, _convert_column(df[name].values[keep], zeek_type,
+                               header['unset_field'],
+                               header['empty_field']))
+        for name, zeek_type in zip(header['fields'], header['types'])
+    )
+
+
+def _convert_column(values, zeek_type, unset, empty):
+    """Convert a column read by pandas to the dtype for a Zeek type."""
+    if zeek_type in _NUMERIC_TYPES:
+        # Columns of the chunk with the '#close' line are read as strings,
+        # or as floats for the missing fields.
+        if values.dtype == object:
+            values = pd.to_numeric(np.where(values == unset, np.nan,
+                                            values))
+        if (zeek_type in _INTEGER_TYPES and values.dtype.kind == 'f' and
+                not np.isnan(values).any()):
+            values = values.astype('i8')
+        if zeek_type == 'time':
+            return _to_nanoseconds(values).view('M8[ns]')
+        if zeek_type == 'interval':
+            return _to_nanoseconds(values).view('m8[ns]')
+        return values
+
+    is_unset = values == unset
+    if zeek_type == 'addr':
+        values = np.where(is_unset, u'0.0.0.0', values)
+        return IPArray._from_ndarray(_parse_ip_strings(values))
+    if zeek_type == 'subnet':
+        values = np.where(is_unset, u'0.0.0.0/32', values)
+        records = _parse_network_strings(values)
+        records[is_unset] = _NA_RECORD
+        return IPNetworkArray._from_ndarray(records)
+    if zeek_type == 'bool':
+        return pd.Series(values).map({'T': True, 'F': False}).values
+
+    values = values.copy()
+    values[values == empty] = u''
+    values[is_unset] = np.nan
+    return values
+
+
+def _to_nanoseconds(seconds):
+    """Integer nanoseconds from float seconds, with NaN as NaT.
+
+    Zeek writes times with microseconds, so rounding to them drops the
+    float error.
+    """
+    seconds = np.asarray(seconds, dtype='f8')
+    unset = np.isnan(seconds)
+    micros = np.round(np.where(unset, 0, seconds) * 1e6).astype('i8')
+    nanos = micros * 1000
+    nanos[unset] = np.datetime64('NaT').view('i8')
+    return nanos
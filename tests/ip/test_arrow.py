@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas as ip
+
+pa = pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def arr():
+    return ip.IPArray([u'10.0.0.1', u'2001:db8::1', u'0.0.0.0'])
+
+
+def test_to_arrow(arr):
+    result = pa.array(arr)
+    assert result.type.extension_name == 'cyberpandas.ip'
+    assert result.storage.type == pa.binary(16)
+    assert result.null_count == 0
+    assert result.storage.to_pylist() == [x.packed.rjust(16, b'\x00')
+                                          for x in arr]
+    # Zero-copy
+    assert result.storage.buffers()[1].address == arr.data.ctypes.data
+
+
+def test_to_arrow_storage_type(arr):
+    result = pa.array(arr, type=pa.binary(16))
+    assert result.type == pa.binary(16)
+
+    with pytest.raises(TypeError):
+        pa.array(arr, type=pa.string())
+
+
+def test_to_arrow_compact():
+    arr = ip.IPArray([u'10.0.0.1', u'10.0.0.2'], compact=True)
+    result = pa.array(arr)
+    assert result.type.extension_name == 'cyberpandas.ipv4'
+    assert result.storage.to_pylist() == [0x0a000001, 0x0a000002]
+    assert result.storage.buffers()[1].address == arr._data.ctypes.data
+
+    result = ip.IPType().__from_arrow__(result)
+    assert result.is_compact
+    assert result.equals(arr)
+
+    result = pa.array(arr, type=pa.binary(16))
+    assert result.type == pa.binary(16)
+
+
+def test_to_arrow_compact_raises(arr):
+    with pytest.raises(ValueError):
+        pa.array(arr, type=pa.uint32())
+
+
+def test_from_arrow(arr):
+    result = ip.IPType().__from_arrow__(pa.array(arr))
+    assert result.equals(arr)
+    assert np.shares_memory(result.data, arr.data)
+
+
+def test_from_arrow_chunked_sliced_nulls(arr):
+    storage = pa.array(arr).storage
+    with_null = pa.array([None, b'\x00' * 15 + b'\x02'], type=pa.binary(16))
+    chunked = pa.chunked_array([storage.slice(1), with_null])
+    result = ip.IPType().__from_arrow__(chunked)
+    expected = ip.IPArray([u'2001:db8::1', u'0.0.0.0', u'0.0.0.0',
+                           u'0.0.0.2'])
+    assert result.equals(expected)
+
+
+def test_table_roundtrip(arr):
+    df = pd.DataFrame({'ip': arr, 'n': [1, 2, 3]}, columns=['ip', 'n'])
+    table = pa.Table.from_pandas(df)
+    result = table.to_pandas()
+    tm.assert_frame_equal(result, df)
+
+
+def test_ipc_roundtrip(arr):
+    table = pa.Table.from_pandas(pd.DataFrame({'ip': arr}))
+    sink = pa.BufferOutputStream()
+    writer = pa.ipc.new_stream(sink, table.schema)
+    writer.write_table(table)
+    writer.close()
+
+    result = pa.ipc.open_stream(sink.getvalue()).read_all()
+    assert result.schema.field('ip').type == table.schema.field('ip').type
+    assert result.to_pandas()['ip'].values.equals(arr)
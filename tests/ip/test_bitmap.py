@@ -0,0 +1,90 @@
+import pickle
+
+import numpy as np
+import pandas.util.testing as tm
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists, tuples
+
+import cyberpandas as ip
+from cyberpandas.bitmap import _ARRAY_MAX
+
+# Ranges in a few /16s, so chunks are both arrays and bitmaps.
+RANGES = lists(tuples(integers(min_value=0, max_value=3),
+                      integers(min_value=0, max_value=2 ** 16 - 1),
+                      integers(min_value=0, max_value=3 * _ARRAY_MAX)),
+               max_size=4)
+
+
+def _addresses(ranges):
+    values = [np.arange(start, min(start + n, 2 ** 16)) + (chunk << 16)
+              for chunk, start, n in ranges]
+    return np.concatenate([np.zeros(0, dtype='u8')] + values).astype('u8')
+
+
+@settings(deadline=None)
+@given(RANGES, RANGES)
+def test_algebra_matches_set(a, b):
+    a, b = _addresses(a), _addresses(b)
+    sa, sb = set(a.tolist()) - {0}, set(b.tolist()) - {0}
+    ba, bb = ip.IPv4Bitmap(a), ip.IPv4Bitmap(b)
+    assert len(ba) == len(sa)
+    for result, expected in [(ba | bb, sa | sb), (ba & bb, sa & sb),
+                             (ba - bb, sa - sb)]:
+        assert result.to_array().to_pyints() == sorted(expected)
+        # Canonical, whichever way it's built
+        assert result == ip.IPv4Bitmap(sorted(expected))
+
+    values = ip.IPArray(np.concatenate([a, b, [1, 2 ** 18]]).astype('u8'))
+    expected = np.array([int(x) in sa for x in values.to_pyints()])
+    tm.assert_numpy_array_equal(ba.contains(values), expected)
+    tm.assert_numpy_array_equal(ba.contains(values.compact()), expected)
+
+
+def test_chunks():
+    values = ip.IPArray._concat_same_type([
+        ip.ip_range(u'10.0.0.0', u'10.2.0.0'),
+        ip.IPArray([u'192.168.0.1', u'192.168.0.2'])])
+    bitmap = ip.IPv4Bitmap(values)
+    assert len(bitmap) == 2 ** 17 + 2
+    # Two bitmaps, and an array of two addresses.
+    assert bitmap._bitmaps.shape == (2, 8192)
+    assert len(bitmap._sparse) == 2
+    assert bitmap.to_array().equals(values.compact())
+
+    assert bitmap.nbytes < values.compact().nbytes // 16
+    assert repr(bitmap) == 'IPv4Bitmap(<131074 addresses, 16416 bytes>)'
+
+
+def test_contains():
+    bitmap = ip.IPv4Bitmap([u'10.0.0.1', u'10.0.0.1', u'0.0.0.0'])
+    assert len(bitmap) == 1
+    result = bitmap.contains([u'10.0.0.1', u'10.0.0.2', u'::a00:1',
+                              u'2001:db8::1', u'0.0.0.0'])
+    tm.assert_numpy_array_equal(result, np.array([True, False, True, False,
+                                                  False]))
+    assert u'10.0.0.1' in bitmap
+    assert u'10.0.0.2' not in bitmap
+
+
+def test_empty():
+    empty = ip.IPv4Bitmap()
+    assert len(empty) == 0
+    assert empty == ip.IPv4Bitmap([])
+    assert len(empty.to_array()) == 0
+    tm.assert_numpy_array_equal(empty.contains([u'1.1.1.1']),
+                                np.array([False]))
+    full = ip.IPv4Bitmap(ip.ip_range(u'10.0.0.0', u'10.1.0.0'))
+    assert full | empty == full
+    assert not len(full & empty)
+    assert full - empty == full
+
+
+def test_raises_ipv6():
+    with pytest.raises(ValueError, match='only holds IPv4'):
+        ip.IPv4Bitmap([u'10.0.0.1', u'2001:db8::1'])
+
+
+def test_pickle():
+    bitmap = ip.IPv4Bitmap(ip.ip_range(u'10.0.0.0', u'10.0.16.0'))
+    assert pickle.loads(pickle.dumps(bitmap)) == bitmap
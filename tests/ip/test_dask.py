@@ -0,0 +1,89 @@
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas as ip
+
+dd = pytest.importorskip('dask.dataframe')
+dask = pytest.importorskip('dask')
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'ip': ip.IPArray([u'10.0.0.1', u'10.0.0.2', u'2001:db8::1',
+                          u'10.0.0.1', u'192.168.1.1', u'10.0.0.2',
+                          u'2001:db8::1', u'10.0.0.1']),
+        'net': ip.IPNetworkArray([u'10.0.0.0/8'] * 8),
+    })
+
+
+@pytest.fixture
+def ddf(df):
+    return dd.from_pandas(df, npartitions=3)
+
+
+@pytest.mark.parametrize('dtype', [ip.IPType(), ip.IPNetworkType(),
+                                   ip.EndpointType()])
+def test_meta_nonempty(dtype):
+    meta = dd.utils.meta_nonempty(pd.Series([], dtype=dtype))
+    assert meta.dtype == dtype
+    assert len(meta) == 2
+    scalar = dd.utils.make_meta(dtype)
+    assert isinstance(scalar, dtype.type)
+
+
+def test_tokenize(df):
+    assert dask.base.tokenize(df) == dask.base.tokenize(df.copy())
+    other = df.copy()
+    other['ip'] = ip.IPArray([u'10.0.0.9'] * 8)
+    assert dask.base.tokenize(df) != dask.base.tokenize(other)
+
+
+def test_accessor(df, ddf):
+    result = ddf.ip.ip.is_ipv4
+    assert result.dtype == bool
+    tm.assert_series_equal(result.compute(), df.ip.ip.is_ipv4)
+    tm.assert_series_equal(ddf.ip.ip.netmask(v4_prefixlen=8).compute(),
+                           df.ip.ip.netmask(v4_prefixlen=8))
+
+
+def test_accessor_raises(ddf):
+    with pytest.raises(AttributeError, match="'ip' accessor"):
+        ddf.net.ip
+
+
+@pytest.mark.parametrize('other', [
+    [u'10.0.0.1', u'2001:db8::1'],
+    u'10.0.0.0/8',
+    ip.IPArray([u'192.168.1.1']),
+    ip.IPSet([u'10.0.0.0/30', u'2001:db8::/32']),
+])
+def test_isin(df, ddf, other):
+    tm.assert_series_equal(ddf.ip.ip.isin(other).compute(),
+                           df.ip.ip.isin(other))
+
+
+def test_isin_dask_series(df, ddf):
+    other = pd.Series(ip.IPArray([u'10.0.0.2', u'2001:db8::1',
+                                  u'10.0.0.2']))
+    result = ddf.ip.ip.isin(dd.from_pandas(other, npartitions=2))
+    tm.assert_series_equal(result.compute(), df.ip.ip.isin(other.values))
+
+
+def test_unique(df, ddf):
+    result = ddf.ip.unique().compute()
+    assert result.values.equals(df.ip.unique())
+
+
+def test_value_counts(df, ddf):
+    result = ddf.ip.ip.value_counts(split_every=2).compute()
+    expected = df.ip.value_counts()
+    # IPv4 and IPv6 addresses don't sort together.
+    assert result.to_dict() == expected.to_dict()
+    assert result.is_monotonic_decreasing
+
+    v4 = df[df.ip.ip.is_ipv4]
+    result = dd.from_pandas(v4, npartitions=2).ip.value_counts().compute()
+    tm.assert_series_equal(result.sort_index(),
+                           v4.ip.value_counts().sort_index())
@@ -0,0 +1,155 @@
+import ipaddress
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas as ip
+
+
+@pytest.fixture
+def endpoints():
+    return ip.EndpointArray([u'10.0.0.1:443/tcp', u'[2001:db8::1]:53/udp',
+                             u'10.0.0.1:80', u'192.168.1.1:0/47'])
+
+
+def test_make_container():
+    result = ip.EndpointArray([u'10.0.0.1:443/tcp', u'[2001:db8::1]:53'])
+    expected = np.array([(0, 0x0a000001, 443, 6),
+                         (0x20010db800000000, 1, 53, 0)],
+                        dtype=result.dtype._record_type)
+    tm.assert_numpy_array_equal(result.data, expected)
+    assert result.data.itemsize == 19
+
+
+def test_repr_works(endpoints):
+    result = repr(endpoints)
+    expected = ("EndpointArray(['10.0.0.1:443/tcp', '[2001:db8::1]:53/udp', "
+                "'10.0.0.1:80', '192.168.1.1:0/47'])")
+    assert result == expected
+
+
+def test_roundtrip_strings(endpoints):
+    result = ip.EndpointArray(endpoints.to_strings())
+    assert result.equals(endpoints)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (u'10.0.0.1:443/TCP', (u'10.0.0.1', 443, 6)),
+    (u'[::ffff:1.2.3.4]:65535', (u'::ffff:1.2.3.4', 65535, 0)),
+    (u'[10.0.0.1]:1', (u'10.0.0.1', 1, 0)),
+    (ip.Endpoint(u'10.0.0.1', 22, 6), (u'10.0.0.1', 22, 6)),
+    ((u'10.0.0.1', 22), (u'10.0.0.1', 22, 0)),
+])
+def test_parse(value, expected):
+    result = ip.EndpointArray([value])[0]
+    assert result == ip.Endpoint(*expected)
+
+
+@pytest.mark.parametrize('value', [
+    u'10.0.0.1',
+    u'10.0.0.1:',
+    u':80',
+    u'10.0.0.1:http',
+    u'10.0.0.1:65536',
+    u'2001:db8::1:53',
+    u'10.0.0.1:80/foo',
+    u'10.0.0.1/tcp:80',
+    u'10.0.0.256:80',
+    u'1.2.3.4:443/',
+    u'[::1]:53/',
+])
+def test_parse_raises(value):
+    with pytest.raises(ValueError):
+        ip.EndpointArray([u'10.0.0.1:80', value])
+
+
+@pytest.mark.parametrize('value', [
+    u'1.2.3.4:18446744073709551659',
+    u'1.2.3.4:18446744073709551616',
+    u'1.2.3.4:000080',
+])
+def test_parse_raises_long_port(value):
+    with pytest.raises(ValueError, match='more than 5 digits'):
+        ip.EndpointArray([value])
+
+
+def test_from_components():
+    result = ip.EndpointArray.from_components(
+        ip.IPArray([u'10.0.0.1', u'2001:db8::1']), [443, 53], 17)
+    expected = ip.EndpointArray([u'10.0.0.1:443/udp', u'[2001:db8::1]:53/udp'])
+    assert result.equals(expected)
+
+    with pytest.raises(ValueError):
+        ip.EndpointArray.from_components([u'10.0.0.1'], [-1])
+
+
+def test_components_are_views(endpoints):
+    tm.assert_numpy_array_equal(endpoints.port.astype('i8'),
+                                np.array([443, 53, 80, 0]))
+    tm.assert_numpy_array_equal(endpoints.proto,
+                                np.array([6, 17, 0, 47], dtype='u1'))
+    assert np.shares_memory(endpoints.port, endpoints.data)
+    assert np.shares_memory(endpoints.proto, endpoints.data)
+    address = endpoints.address
+    assert address.equals(
+        ip.IPArray([u'10.0.0.1', u'2001:db8::1', u'10.0.0.1',
+                    u'192.168.1.1']))
+    assert np.shares_memory(address.data, endpoints.data)
+    address[0] = u'10.0.0.2'
+    assert endpoints[0] == ip.Endpoint(u'10.0.0.2', 443, 6)
+    assert endpoints.port[0] == 443
+
+    # A slice with a step isn't contiguous
+    assert endpoints[::2].address.equals(
+        ip.IPArray([u'10.0.0.2', u'10.0.0.1']))
+
+
+def test_scalar():
+    result = ip.Endpoint(u'2001:db8::1', 53, 17)
+    assert str(result) == u'[2001:db8::1]:53/udp'
+    assert repr(result) == "Endpoint('[2001:db8::1]:53/udp')"
+    assert result.address == ipaddress.ip_address(u'2001:db8::1')
+    assert result == ip.Endpoint(u'2001:db8::1', 53, 17)
+    assert result != ip.Endpoint(u'2001:db8::1', 53, 6)
+    assert hash(result) == hash(ip.Endpoint(u'2001:db8::1', 53, 17))
+
+
+def test_factorize():
+    arr = ip.EndpointArray([u'10.0.0.1:80', u'10.0.0.1:80/tcp',
+                            ip.EndpointType.na_value, u'10.0.0.1:80',
+                            u'[::2]:80'])
+    labels, uniques = arr.factorize()
+    tm.assert_numpy_array_equal(labels, np.array([0, 1, -1, 0, 2]))
+    assert uniques.equals(ip.EndpointArray([u'10.0.0.1:80',
+                                            u'10.0.0.1:80/tcp',
+                                            u'[::2]:80']))
+
+
+def test_groupby():
+    df = pd.DataFrame({
+        'src': ip.EndpointArray([u'10.0.0.1:80', u'10.0.0.2:80',
+                                 u'10.0.0.1:80']),
+        'bytes': [1, 2, 3],
+    })
+    result = df.groupby('src').bytes.sum()
+    assert result.tolist() == [4, 2]
+    assert list(result.index) == [ip.Endpoint(u'10.0.0.1', 80),
+                                  ip.Endpoint(u'10.0.0.2', 80)]
+
+
+def test_series_accessor(endpoints):
+    s = pd.Series(endpoints, name='src')
+    result = s.endpoint.port
+    expected = pd.Series([443, 53, 80, 0], name='src', dtype='>u2')
+    tm.assert_series_equal(result, expected)
+
+    result = s.endpoint.to_strings()
+    expected = pd.Series(endpoints.to_strings(), name='src')
+    tm.assert_series_equal(result, expected)
+
+    assert s.endpoint.address.dtype == ip.IPType()
+
+    with pytest.raises(AttributeError):
+        pd.Series([1, 2]).endpoint
@@ -0,0 +1,113 @@
+import pytest
+from pandas.tests.extension import base
+
+import cyberpandas as ip
+
+
+def _endpoints(values):
+    return ip.EndpointArray([(0, v, 443, 6) for v in values])
+
+
+@pytest.fixture
+def dtype():
+    return ip.EndpointType()
+
+
+@pytest.fixture
+def data():
+    return _endpoints(list(range(1, 101)))
+
+
+@pytest.fixture
+def data_missing():
+    return ip.EndpointArray([ip.EndpointType.na_value, u'10.0.0.1:80'])
+
+
+@pytest.fixture(params=['data', 'data_missing'])
+def all_data(request, data, data_missing):
+    """Parametrized fixture giving 'data' and 'data_missing'"""
+    if request.param == 'data':
+        return data
+    elif request.param == 'data_missing':
+        return data_missing
+
+
+@pytest.fixture
+def data_for_sorting():
+    return ip.EndpointArray([u'10.0.0.1:80', u'10.0.0.2:80', u'1.0.0.1:80'])
+
+
+@pytest.fixture
+def data_missing_for_sorting():
+    return ip.EndpointArray([u'10.0.0.2:80', ip.EndpointType.na_value,
+                             u'1.0.0.1:80'])
+
+
+@pytest.fixture
+def data_for_grouping():
+    b = u'1.0.0.1:80'
+    a = u'[2001:db8::1]:53/udp'
+    c = u'[2001:db8::1]:53/tcp'
+    na = ip.EndpointType.na_value
+    return ip.EndpointArray([
+        b, b, na, na, a, a, b, c
+    ])
+
+
+@pytest.fixture
+def data_repeated(data):
+    def gen(count):
+        for _ in range(count):
+            yield data
+    return gen
+
+
+@pytest.fixture
+def na_cmp():
+    """Binary operator for comparing NA values.
+
+    Should return a function of two arguments that returns
+    True if both arguments are (scalar) NA for your type.
+    """
+    return lambda x, y: x == y == ip.EndpointType.na_value
+
+
+@pytest.fixture
+def na_value():
+    return ip.EndpointType.na_value
+
+
+class TestDtype(base.BaseDtypeTests):
+    pass
+
+
+class TestInterface(base.BaseInterfaceTests):
+    pass
+
+
+class TestConstructors(base.BaseConstructorsTests):
+    pass
+
+
+class TestReshaping(base.BaseReshapingTests):
+    @pytest.mark.skip("We consider 0.0.0.0:0 to be NA.")
+    def test_stack(self):
+        pass
+
+    @pytest.mark.skip("We consider 0.0.0.0:0 to be NA.")
+    def test_unstack(self):
+        pass
+
+
+class TestGetitem(base.BaseGetitemTests):
+    pass
+
+
+class TestMissing(base.BaseMissingTests):
+    pass
+
+
+class TestMethods(base.BaseMethodsTests):
+    @pytest.mark.skip(reason='No __add__')
+    def test_combine_add(self, data_repeated):
+        super().test_combine_add(data_repeated)
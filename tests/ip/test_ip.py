@@ -1,5 +1,7 @@
+import collections
 import ipaddress
 import operator
+import pickle
 
 import pytest
 import six
@@ -36,6 +38,30 @@ def test_repr_works():
     assert result == expected
 
 
+@given(lists(integers(min_value=0, max_value=2 ** 32 + 5)))
+def test_strings_roundtrip(values):
+    # IPv4 strings are parsed and formatted in bulk, the rest by ipaddress.
+    values = values + [2 ** 64 + 1, 2 ** 128 - 1]
+    strings = [str(ipaddress.ip_address(x)) for x in values]
+    arr = ip.IPArray(strings)
+    assert arr.to_pyints() == values
+    assert arr._format_values() == strings
+
+
+def test_strings_compact():
+    strings = [u'0.0.0.0', u'10.0.0.1', u'255.255.255.255']
+    arr = ip.IPArray(strings)
+    assert arr.compact()._format_values() == strings
+    assert arr.to_pyints() == [0, 2 ** 24 * 10 + 1, 2 ** 32 - 1]
+
+
+@pytest.mark.parametrize('value', [u'1.2.3', u'256.0.0.1', u'1.2.3.4 '])
+def test_strings_raises(value):
+    # Strings that aren't plain dotted quads fall back to ipaddress
+    with pytest.raises(ValueError):
+        ip.IPArray([u'10.0.0.1', value])
+
+
 def test_isna():
     v = ip.IPArray.from_pyints([0, 2, 2 ** 64, 2 ** 64 + 1, 2 ** 64 + 2])
     r1 = v.isna()
@@ -151,11 +177,26 @@ def test_ops(tup):
     tm.assert_numpy_array_equal(r1, r2)
 
 
-@pytest.mark.xfail(reason='upstream')
 def test_value_counts():
     x = ip.IPArray([0, 0, 1])
     result = x.value_counts()
-    assert len(result)
+    expected = pd.Series([1], index=[ipaddress.IPv4Address(1)])
+    tm.assert_series_equal(result, expected)
+
+    result = x.value_counts(dropna=False)
+    expected = pd.Series([2, 1], index=[ipaddress.IPv4Address(0),
+                                        ipaddress.IPv4Address(1)])
+    tm.assert_series_equal(result, expected)
+
+    x = ip.IPArray([u'1.1.1.1', u'2001:db8::1', u'1.1.1.1'])
+    expected = pd.Series([2, 1], index=[ipaddress.IPv4Address(u'1.1.1.1'),
+                                        ipaddress.IPv6Address(u'2001:db8::1')])
+    tm.assert_series_equal(pd.Series(x).value_counts(), expected)
+    tm.assert_series_equal(x.value_counts(), expected)
+    y = ip.IPArray([u'1.1.1.1', u'2.2.2.2', u'1.1.1.1']).compact()
+    expected = pd.Series([2, 1], index=[ipaddress.IPv4Address(u'1.1.1.1'),
+                                        ipaddress.IPv4Address(u'2.2.2.2')])
+    tm.assert_series_equal(y.value_counts(), expected)
 
 
 def test_iter_works():
@@ -233,6 +274,13 @@ def test_isin_mix():
     tm.assert_numpy_array_equal(result, expected)
 
 
+def test_isin_addresses():
+    s = ip.IPArray([u'192.168.1.1', u'2001:db8::1', u'10.0.0.1'])
+    result = s.isin([u'2001:db8::1', u'192.168.1.1', u'192.168.1.0/30'])
+    expected = np.array([True, True, False])
+    tm.assert_numpy_array_equal(result, expected)
+
+
 def test_isin_iparray():
     s = ip.IPArray([10, 20, 20, 30])
     result = s.isin(ip.IPArray([30, 20]))
@@ -281,6 +329,119 @@ def test_bytes_roundtrip():
     assert result.equals(arr)
 
 
+@pytest.mark.parametrize('block_size', [1, 3, None])
+@pytest.mark.parametrize('values', [
+    [],
+    [1, 2, 3, _U8_MAX + 10],
+    # Unsorted, and crossing 2**64
+    [_U8_MAX - 1, _U8_MAX + 3, _U8_MAX, 2 ** 128 - 1, 0, 0],
+    [0x0a000000 + i * 7 for i in range(20)],
+])
+def test_bytes_delta_roundtrip(values, block_size):
+    arr = ip.IPArray.from_pyints(values)
+    bytestring = arr.to_bytes(encoding='delta', block_size=block_size)
+    result = ip.IPArray.from_bytes(bytestring, encoding='delta')
+    assert result.equals(arr)
+
+    for start, stop in [(1, 3), (2, None), (None, -2), (3, 1)]:
+        result = ip.IPArray.from_bytes(bytestring, encoding='delta',
+                                       start=start, stop=stop)
+        assert result.equals(arr[start:stop])
+
+
+def test_bytes_delta_size():
+    arr = ip.ip_range(u'10.0.0.0', u'10.1.0.0')
+    assert len(arr.to_bytes(encoding='delta')) < len(arr) + 1024
+    # Unsorted, but clustered
+    arr = arr.take(np.random.RandomState(0).permutation(len(arr)))
+    assert len(arr.to_bytes(encoding='delta')) < 2 * len(arr) + 1024
+
+
+def test_bytes_delta_raises():
+    arr = ip.IPArray([1, 2, 3])
+    with pytest.raises(ValueError, match='Unknown encoding'):
+        arr.to_bytes(encoding='gzip')
+    with pytest.raises(ValueError, match='Unknown encoding'):
+        ip.IPArray.from_bytes(arr.to_bytes(), encoding='gzip')
+    with pytest.raises(ValueError, match='block_size'):
+        arr.to_bytes(block_size=10)
+    with pytest.raises(ValueError, match='Not delta encoded'):
+        ip.IPArray.from_bytes(arr.to_bytes(), encoding='delta')
+    with pytest.raises(ValueError, match='truncated'):
+        ip.IPArray.from_bytes(arr.to_bytes(encoding='delta')[:-1],
+                              encoding='delta')
+
+
+@pytest.mark.parametrize('protocol', range(2, pickle.HIGHEST_PROTOCOL + 1))
+@pytest.mark.parametrize('arr', [
+    ip.IPArray([1, 2, 3, _U8_MAX + 10]),
+    ip.IPArray([1, 2, 3], compact=True),
+    ip.IPArray([1, 2, 3, 4])[::2],
+])
+def test_pickle_roundtrip(arr, protocol):
+    result = pickle.loads(pickle.dumps(arr, protocol=protocol))
+    assert result.equals(arr)
+    assert result.is_compact == arr.is_compact
+    result[0] = 10
+
+
+@pytest.mark.skipif(pickle.HIGHEST_PROTOCOL < 5,
+                    reason="requires pickle protocol 5")
+def test_pickle_out_of_band():
+    arr = ip.IPArray([1, 2, 3, _U8_MAX + 10])
+    buffers = []
+    data = pickle.dumps(arr, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+
+    result = pickle.loads(data, buffers=buffers)
+    assert result.equals(arr)
+    assert np.shares_memory(result.data, arr.data)
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.parametrize('arr', [
+    ip.IPArray([1, 2, 3, _U8_MAX + 10]),
+    ip.IPArray([1, 2, 3], compact=True),
+    ip.IPArray([]),
+])
+def test_file_roundtrip(arr, mmap, tmpdir):
+    path = str(tmpdir.join('ips.bin'))
+    arr.to_file(path)
+
+    result = ip.IPArray.from_file(path, mmap=mmap)
+    assert result.equals(arr)
+    assert result.is_compact == arr.is_compact
+
+
+def test_file_mmap_readonly(tmpdir):
+    path = str(tmpdir.join('ips.bin'))
+    ip.IPArray([1, 2, 3]).to_file(path)
+    result = ip.IPArray.from_file(path)
+
+    ser = pd.Series(result)
+    assert ser.values.isin([u'0.0.0.2/32']).tolist() == [False, True, False]
+    with pytest.raises(ValueError):
+        result[0] = 10
+
+    result = result.copy()
+    result[0] = 10
+    assert result.equals(ip.IPArray([10, 2, 3]))
+
+
+def test_file_raises(tmpdir):
+    path = str(tmpdir.join('ips.bin'))
+    with open(path, 'wb') as f:
+        f.write(b'not an IPArray file, but long enough for a header')
+    with pytest.raises(ValueError):
+        ip.IPArray.from_file(path)
+
+    ip.IPArray([1, 2, 3]).to_file(path)
+    with open(path, 'r+b') as f:
+        f.truncate(40)
+    with pytest.raises(ValueError):
+        ip.IPArray.from_file(path, mmap=False)
+
+
 def test_unique():
     arr = ip.IPArray([3, 3, 1, 2, 3, _U8_MAX + 1])
     result = arr.unique()
@@ -322,6 +483,10 @@ def test_from_ndarray(values):
      [2**64 - 1, 2**64, 2**64 + 1]),
     (1, 6, 2, [1, 3, 5]),
     (u'0.0.0.1', u'0.0.0.6', u'0.0.0.2', [1, 3, 5]),
+    (2**64 - 2, 2**64 + 4, 3, [2**64 - 2, 2**64 + 1]),
+    (2**128 - 1, 2**128 - 4, -1, [2**128 - 1, 2**128 - 2, 2**128 - 3]),
+    (1, 2**128, 2**127, [1, 2**127 + 1]),
+    (5, 1, None, []),
 ])
 def test_ip_range(start, stop, step, expected):
     result = ip.ip_range(start, stop, step)
@@ -329,6 +494,63 @@ def test_ip_range(start, stop, step, expected):
     assert result.equals(expected)
 
 
+def test_ip_range_stop_only():
+    assert ip.ip_range(3).equals(ip.IPArray([0, 1, 2]))
+
+
+def test_random_ips():
+    networks = [u'10.0.0.0/8', u'2001:db8::/32', ip.IPRange(1, 4)]
+    result = ip.random_ips(1000, networks, seed=1234)
+    assert len(result) == 1000
+    assert ip.IPSet([u'10.0.0.0/8', u'2001:db8::/32', u'0.0.0.1',
+                     u'0.0.0.2/31']).contains(result).all()
+    # By the number of addresses, so almost all in the /32
+    assert result.is_ipv6.mean() > 0.99
+    assert result.equals(ip.random_ips(1000, networks, seed=1234))
+
+    result = ip.random_ips(1000, networks, weights=[0, 0, 1], seed=1)
+    assert set(result.to_pyints()) == {1, 2, 3}
+
+
+def test_random_ips_uniform():
+    # Overlaps count once, and the NA address is never drawn.
+    result = ip.random_ips(4000, [u'0.0.0.0/30', u'0.0.0.0/31'], seed=1)
+    counts = collections.Counter(result.to_pyints())
+    assert sorted(counts) == [1, 2, 3]
+    assert min(counts.values()) > 1200
+
+
+@pytest.mark.parametrize('networks, weights', [
+    ([u'10.0.0.0/22'], None),
+    ([u'10.0.0.0/22', u'10.0.2.0/23'], None),
+    ([u'10.0.0.0/22', u'2001:db8::/126'], [1, 2]),
+    (u'2001:db8::/64', None),
+])
+def test_random_ips_unique(networks, weights):
+    result = ip.random_ips(1000, networks, weights=weights, unique=True,
+                           seed=1)
+    assert len(set(result.to_pyints())) == 1000
+
+
+def test_random_ips_seed():
+    seed = np.random.RandomState(1)
+    result = ip.random_ips(10, u'10.0.0.0/8', seed=seed)
+    assert len(result) == 10
+    assert not result.equals(ip.random_ips(10, u'10.0.0.0/8', seed=seed))
+
+
+@pytest.mark.parametrize('kwargs, match', [
+    (dict(n=5, networks=[u'10.0.0.0/31'], unique=True), 'unique'),
+    (dict(n=5, networks=[u'0.0.0.0/32']), 'NA address'),
+    (dict(n=5, networks=[u'10.0.0.0/8'], weights=[1, 2]), 'each network'),
+    (dict(n=5, networks=[u'10.0.0.0/8'], weights=[0]), 'non-negative'),
+    (dict(n=5, networks=[ip.IPRange(1, 10, 2)]), 'step'),
+])
+def test_random_ips_raises(kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        ip.random_ips(**kwargs)
+
+
 @pytest.mark.parametrize('addresses', [
     [u'0.0.0.0', u'192.168.1.1', u'::1:1:0:0:0:1']
 ])
@@ -394,3 +616,182 @@ def test_apply_mask():
     result = pd.Series(arr, name='test').ip.mask(mask)
     expected = pd.Series(expected, name='test')
     tm.assert_series_equal(result, expected)
+
+
+def test_compact():
+    arr = ip.IPArray([u'192.168.1.1', u'10.0.0.1'])
+    assert not arr.is_compact
+    assert arr.nbytes == 32
+
+    result = arr.compact()
+    assert result.is_compact
+    assert result.nbytes == 8
+    assert result.equals(arr)
+    assert result.data.dtype == ip.IPType._record_type
+    tm.assert_numpy_array_equal(result.data, arr.data)
+
+    result = ip.IPArray([u'192.168.1.1', u'10.0.0.1'], compact=True)
+    assert result.is_compact
+
+
+def test_compact_ipv6_stays_wide():
+    arr = ip.IPArray([u'192.168.1.1', u'2001:db8::1'], compact=True)
+    assert not arr.is_compact
+    assert not arr.compact().is_compact
+
+
+def test_compact_setitem_promotes():
+    arr = ip.IPArray([1, 2, 3], compact=True)
+    arr[0] = u'10.0.0.1'
+    assert arr.is_compact
+
+    arr[1] = u'2001:db8::1'
+    assert not arr.is_compact
+    expected = ip.IPArray([u'10.0.0.1', u'2001:db8::1', u'0.0.0.3'])
+    assert arr.equals(expected)
+
+
+def test_compact_setitem_view():
+    arr = ip.IPArray([1, 2, 3, 4], compact=True)
+    view = arr[1:3]
+    view[0] = u'10.0.0.1'
+    arr[2] = u'10.0.0.2'
+    assert arr.equals(ip.IPArray([1, u'10.0.0.1', u'10.0.0.2', 4]))
+    assert view.equals(ip.IPArray([u'10.0.0.1', u'10.0.0.2']))
+
+    # Promoting either detaches it from the other.
+    view[0] = u'2001:db8::1'
+    assert view.equals(ip.IPArray([u'2001:db8::1', u'10.0.0.2']))
+    assert not view.is_compact
+    assert arr.is_compact
+    assert arr.equals(ip.IPArray([1, u'10.0.0.1', u'10.0.0.2', 4]))
+
+    view = arr[1:3]
+    arr[0] = u'2001:db8::1'
+    assert arr.equals(ip.IPArray([u'2001:db8::1', u'10.0.0.1', u'10.0.0.2',
+                                  4]))
+    assert view.is_compact
+    assert view.equals(ip.IPArray([u'10.0.0.1', u'10.0.0.2']))
+
+
+@pytest.mark.parametrize('protocol', sorted({2, pickle.HIGHEST_PROTOCOL}))
+def test_compact_setitem_unpickled(protocol):
+    arr = ip.IPArray([1, 2], compact=True)
+    result = pickle.loads(pickle.dumps(arr, protocol=protocol))
+    assert result.is_compact
+    result[0] = u'2001:db8::1'
+    assert result.equals(ip.IPArray([u'2001:db8::1', 2]))
+    assert arr.equals(ip.IPArray([1, 2]))
+
+
+def test_compact_setitem_foreign_buffer():
+    buf = bytearray(np.array([1, 2], dtype='u4').tobytes())
+    arr = ip.IPArray._from_ndarray(np.frombuffer(buf, dtype='u4'))
+    assert arr.is_compact
+    arr[0] = u'2001:db8::1'
+    assert arr.equals(ip.IPArray([u'2001:db8::1', 2]))
+    assert np.frombuffer(buf, dtype='u4').tolist() == [1, 2]
+
+
+def test_compact_data_read_only():
+    arr = ip.IPArray([1, 2], compact=True)
+    assert arr.data.dtype == ip.IPType._record_type
+    with pytest.raises(ValueError):
+        arr.data[0] = (0, 5)
+    assert arr.equals(ip.IPArray([1, 2]))
+
+
+@pytest.mark.parametrize('method', [
+    lambda x: x.to_pyints(),
+    lambda x: x.to_bytes(),
+    lambda x: x.to_bytes(encoding='delta', block_size=2),
+    lambda x: x.packed,
+    lambda x: x.netmask(v4_prefixlen=24).to_pyints(),
+    lambda x: x.mask(x.netmask(v4_prefixlen=24)).to_pyints(),
+    lambda x: ip.IPNetworkArray([u'10.0.0.0/8'] * len(x)).contains(x),
+    lambda x: ip.IPNetworkArray.from_addresses(x, 24).to_pynetworks(),
+    lambda x: ip.EndpointArray.from_components(x, 80, 6).to_pyendpoints(),
+    lambda x: ip.IPRange(u'10.0.0.0', u'10.0.1.0', 3).contains(x),
+    lambda x: x.take([0, -1, 2], allow_fill=True,
+                     fill_value=2 ** 64).to_pyints(),
+    lambda x: x < ip.IPArray([2 ** 64, 2, 1, 0, 1]),
+    lambda x: x == ip.IPArray([2 ** 64, u'10.0.0.3', 1, 0, 1]),
+    lambda x: x.equals(ip.IPArray([2 ** 64, 2, 3, 4, 5])),
+])
+def test_compact_methods(method):
+    arr = ip.IPArray([u'10.0.0.1', u'10.0.0.3', u'192.168.1.1', 0, 1])
+    result = method(arr.compact())
+    expected = method(arr)
+    if isinstance(expected, np.ndarray):
+        tm.assert_numpy_array_equal(result, expected)
+    else:
+        assert result == expected
+
+
+def test_compact_take():
+    arr = ip.IPArray([1, 2, 3], compact=True)
+    result = arr.take([0, -1], allow_fill=True)
+    assert result.is_compact
+    assert result.equals(ip.IPArray([1, 0]))
+
+    result = arr.take([0, -1], allow_fill=True, fill_value=2 ** 64)
+    assert not result.is_compact
+    assert result.equals(ip.IPArray([1, 2 ** 64]))
+
+
+def test_compact_concat():
+    a = ip.IPArray([1, 2], compact=True)
+    b = ip.IPArray([3], compact=True)
+    result = ip.IPArray._concat_same_type([a, b])
+    assert result.is_compact
+    assert result.equals(ip.IPArray([1, 2, 3]))
+
+    c = ip.IPArray([2 ** 64])
+    result = ip.IPArray._concat_same_type([a, c])
+    assert not result.is_compact
+    assert result.equals(ip.IPArray([1, 2, 2 ** 64]))
+
+
+@pytest.mark.parametrize('op', [
+    operator.eq,
+    operator.lt,
+    operator.le,
+    operator.gt,
+    operator.ge,
+])
+@pytest.mark.parametrize('compact', [True, False])
+def test_compare_layouts(op, compact):
+    a = [1, 5, 2 ** 32 - 1, 7, 0]
+    b = [2, 5, 3, 2 ** 32 - 1, 1]
+    left = ip.IPArray(a, compact=compact)
+    right = ip.IPArray(b, compact=True)
+    result = op(left, right)
+    expected = np.array([op(x, y) if x and y else False
+                         for x, y in zip(a, b)])
+    tm.assert_numpy_array_equal(result, expected)
+
+
+def test_compare_128():
+    a = ip.IPArray([2 ** 64, 2 ** 64 + 1])
+    b = ip.IPArray([1, 2 ** 65])
+    tm.assert_numpy_array_equal(a < b, np.array([False, True]))
+    tm.assert_numpy_array_equal(a > b, np.array([True, False]))
+
+
+def test_compact_isin():
+    s = ip.IPArray([u'192.168.1.1', u'255.255.255.255'], compact=True)
+    result = s.isin([u'192.168.1.0/24', u'::/0'])
+    expected = np.array([True, True])
+    tm.assert_numpy_array_equal(result, expected)
+
+    result = s.isin([u'2001:db8::/32'])
+    expected = np.array([False, False])
+    tm.assert_numpy_array_equal(result, expected)
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_isin_whole_space(compact):
+    s = ip.IPArray([u'0.0.0.0', u'192.168.1.1'], compact=compact)
+    result = s.isin([u'0.0.0.0/0'])
+    expected = np.array([False, True])
+    tm.assert_numpy_array_equal(result, expected)
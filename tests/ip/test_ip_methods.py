@@ -0,0 +1,123 @@
+import collections
+import ipaddress
+
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, lists, tuples
+
+import cyberpandas as ip
+
+
+def _collapse_expected(networks):
+    v4 = [net for net in networks if net.version == 4]
+    v6 = [net for net in networks if net.version == 6]
+    return (list(ipaddress.collapse_addresses(v4)) +
+            list(ipaddress.collapse_addresses(v6)))
+
+
+@pytest.mark.parametrize('values, expected', [
+    ([u'192.168.0.0/24', u'192.168.1.0/24', u'192.168.1.7'],
+     [u'192.168.0.0/23']),
+    ([u'10.0.0.0/8', u'10.1.0.0/16'], [u'10.0.0.0/8']),
+    ([u'10.0.0.1', u'10.0.0.2', u'10.0.0.3'],
+     [u'10.0.0.1/32', u'10.0.0.2/31']),
+    ([u'0.0.0.0/1', u'128.0.0.0/1'], [u'0.0.0.0/0']),
+    ([u'2001:db8::/33', u'2001:db8:8000::/33', u'10.0.0.0/8'],
+     [u'10.0.0.0/8', u'2001:db8::/32']),
+    ([u'ffff:ffff:ffff:ffff:ffff:ffff:ffff:fffe/127', u'::/1',
+      u'8000::/1'],
+     [u'::/0']),
+    ([], []),
+])
+def test_collapse(values, expected):
+    result = ip.collapse(values)
+    expected = ip.IPNetworkArray(expected)
+    assert result.equals(expected)
+
+
+def test_collapse_iparray():
+    arr = ip.IPArray([u'10.0.0.2', u'10.0.0.0', u'0.0.0.0', u'10.0.0.1',
+                      u'2001:db8::1'])
+    result = ip.collapse(arr)
+    expected = ip.IPNetworkArray([u'10.0.0.0/31', u'10.0.0.2/32',
+                                  u'2001:db8::1/128'])
+    assert result.equals(expected)
+
+    result = ip.collapse(arr.compact())
+    assert result.equals(expected)
+
+
+@given(lists(tuples(integers(min_value=0, max_value=2 ** 32 - 1),
+                    integers(min_value=0, max_value=32))))
+def test_collapse_v4_matches_ipaddress(nets):
+    networks = [ipaddress.IPv4Network((addr, prefixlen), strict=False)
+                for addr, prefixlen in nets]
+    networks = [net for net in networks if net != ip.IPNetworkType.na_value]
+    result = ip.collapse(networks).to_pynetworks()
+    assert result == _collapse_expected(networks)
+
+
+@given(lists(tuples(integers(min_value=2 ** 32, max_value=2 ** 128 - 1),
+                    integers(min_value=0, max_value=95))))
+def test_collapse_v6_matches_ipaddress(nets):
+    # Networks inside ::/96 are treated as IPv4 networks, so stay out of it
+    networks = [ipaddress.IPv6Network((addr, prefixlen), strict=False)
+                for addr, prefixlen in nets]
+    result = ip.collapse(ip.IPNetworkArray(networks)).to_pynetworks()
+    assert result == _collapse_expected(networks)
+
+
+def test_summarize_ranges():
+    result = ip.summarize_ranges([u'10.0.0.0', u'192.168.0.1'],
+                                 [u'10.0.1.255', u'192.168.0.4'])
+    expected = pd.DataFrame(collections.OrderedDict([
+        ('range_id', [0, 1, 1, 1]),
+        ('network', ip.IPNetworkArray([u'10.0.0.0/23', u'192.168.0.1/32',
+                                       u'192.168.0.2/31',
+                                       u'192.168.0.4/32'])),
+        ('prefixlen', [23, 32, 31, 32]),
+    ]))
+    assert result['network'].dtype == ip.IPNetworkType()
+    tm.assert_frame_equal(result, expected)
+
+
+def test_summarize_ranges_series_index():
+    start = pd.Series(ip.IPArray([u'::', u'2001:db8::']), index=['a', 'b'])
+    end = pd.Series(ip.IPArray([u'ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff',
+                                u'2001:db8::2']), index=['a', 'b'])
+    result = ip.summarize_ranges(start, end)
+    assert result['network'].dtype == ip.IPNetworkType()
+    assert result['range_id'].tolist() == ['a', 'b', 'b']
+    assert result['network'].values.equals(ip.IPNetworkArray(
+        [u'::/0', u'2001:db8::/127', u'2001:db8::2/128']))
+
+
+@pytest.mark.parametrize('start, end, exc', [
+    ([u'10.0.0.2'], [u'10.0.0.1'], ValueError),
+    ([u'10.0.0.1'], [u'2001:db8::'], TypeError),
+    ([u'10.0.0.1', u'10.0.0.2'], [u'10.0.0.3'], ValueError),
+])
+def test_summarize_ranges_raises(start, end, exc):
+    with pytest.raises(exc):
+        ip.summarize_ranges(start, end)
+
+
+@given(lists(tuples(integers(min_value=2 ** 32, max_value=2 ** 128 - 1),
+                    integers(min_value=2 ** 32, max_value=2 ** 128 - 1)),
+             min_size=1))
+def test_summarize_ranges_matches_ipaddress(ranges):
+    ranges = [(min(a, b), max(a, b)) for a, b in ranges]
+    start = ip.IPArray.from_pyints([a for a, _ in ranges])
+    end = ip.IPArray.from_pyints([b for _, b in ranges])
+    result = ip.summarize_ranges(start, end)
+
+    expected = [
+        (i, net)
+        for i, (a, b) in enumerate(ranges)
+        for net in ipaddress.summarize_address_range(
+            ipaddress.IPv6Address(a), ipaddress.IPv6Address(b))
+    ]
+    assert result['range_id'].tolist() == [i for i, _ in expected]
+    assert list(result['network']) == [net for _, net in expected]
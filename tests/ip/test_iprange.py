@@ -0,0 +1,76 @@
+import ipaddress
+
+import numpy as np
+import pandas.util.testing as tm
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, sampled_from
+
+import cyberpandas as ip
+
+ADDRESSES = integers(min_value=0, max_value=2 ** 128 - 1)
+STEPS = sampled_from([1, 2, 3, 7, 2 ** 32 + 1, 2 ** 64, 2 ** 65 + 3,
+                      -1, -3, -2 ** 64])
+
+
+@given(ADDRESSES, integers(min_value=0, max_value=20), STEPS)
+def test_matches_range(start, n, step):
+    stop = min(max(start + n * step, -1), 2 ** 128)
+    expected = list(range(start, stop, step))
+    r = ip.IPRange(start, stop, step)
+    assert r.num_addresses == len(expected)
+    assert r.to_array().to_pyints() == expected
+    for key in [slice(None, None, 2), slice(-3, None), slice(None, None, -1)]:
+        assert r[key].to_array().to_pyints() == expected[key]
+    if expected:
+        assert int(r[0]) == expected[0]
+        assert int(r[-1]) == expected[-1]
+
+    candidates = [x + d for x in expected[:3] for d in (-1, 0, 1)]
+    candidates = [x for x in candidates if 0 <= x < 2 ** 128]
+    result = r.contains(ip.IPArray(candidates))
+    expected = np.array([x in expected and x != 0 for x in candidates],
+                        dtype=bool)
+    tm.assert_numpy_array_equal(result, expected)
+
+
+def test_large():
+    r = ip.IPRange(u'2001:db8::', u'2001:db8:0:1::')
+    assert r.num_addresses == 2 ** 64
+    with pytest.raises(OverflowError):
+        len(r)
+    assert r[-1] == ipaddress.ip_address(u'2001:db8::ffff:ffff:ffff:ffff')
+    assert u'2001:db8::1234' in r
+    assert u'2001:db8:0:1::' not in r
+    assert repr(r[:4:2]) == ('IPRange(<2 addresses, 2001:db8:: to '
+                             '2001:db8::2, step 2>)')
+
+
+def test_chunks():
+    r = ip.IPRange(u'10.0.0.0', u'10.0.0.10')
+    chunks = list(r.chunks(4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert chunks[2].equals(ip.IPArray([u'10.0.0.8', u'10.0.0.9']))
+    assert list(r) == list(r.to_array())
+    with pytest.raises(ValueError, match='positive'):
+        r.chunks(0)
+
+
+def test_equality():
+    assert ip.IPRange(0, 10, 3) == ip.IPRange(0, 11, 3)
+    assert ip.IPRange(5, 1) == ip.IPRange(7, 2)
+    assert ip.IPRange(1, 2) == ip.IPRange(1, 5, 10)
+    assert ip.IPRange(1, 5) != ip.IPRange(1, 6)
+    assert hash(ip.IPRange(0, 10, 3)) == hash(ip.IPRange(0, 11, 3))
+    assert not ip.IPRange(5, 1)
+
+
+@pytest.mark.parametrize('start, stop, step, match', [
+    (0, 10, 0, 'zero'),
+    (-1, 10, 1, 'outside'),
+    (2 ** 128 - 1, 2 ** 128 + 1, 1, 'outside'),
+    (5, -2, -1, 'outside'),
+])
+def test_raises(start, stop, step, match):
+    with pytest.raises(ValueError, match=match):
+        ip.IPRange(start, stop, step)
@@ -0,0 +1,159 @@
+import ipaddress
+import pickle
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, lists, tuples
+
+import cyberpandas as ip
+
+V4_NETS = lists(tuples(integers(min_value=0, max_value=2 ** 32 - 1),
+                       integers(min_value=8, max_value=32)), max_size=10)
+
+
+def _networks(nets):
+    networks = [ipaddress.IPv4Network((addr, prefixlen), strict=False)
+                for addr, prefixlen in nets]
+    return [net for net in networks if net != ip.IPNetworkType.na_value]
+
+
+def _addresses(networks):
+    return {int(addr) for net in networks
+            for addr in (net.network_address, net.broadcast_address)}
+
+
+@pytest.mark.parametrize('values, expected', [
+    ([u'10.0.0.0/24', u'10.0.1.0/24', u'10.0.2.1'],
+     [u'10.0.0.0/23', u'10.0.2.1/32']),
+    (ip.IPArray([u'10.0.0.1', u'10.0.0.0', u'0.0.0.0']), [u'10.0.0.0/31']),
+    (ip.IPNetworkArray([u'2001:db8::/33', u'2001:db8:8000::/33']),
+     [u'2001:db8::/32']),
+    (u'192.168.0.0/16', [u'192.168.0.0/16']),
+    (ipaddress.ip_address(u'8.8.8.8'), [u'8.8.8.8/32']),
+    ([], []),
+    (None, []),
+])
+def test_to_networks(values, expected):
+    result = ip.IPSet(values).to_networks()
+    assert result.equals(ip.IPNetworkArray(expected))
+
+
+def test_contains():
+    s = ip.IPSet([u'10.0.0.0/8', u'192.168.1.1', u'2001:db8::/32'])
+    values = ip.IPArray([u'10.1.2.3', u'8.8.8.8', u'2001:db8::1',
+                         u'192.168.1.1', u'192.168.1.2', u'0.0.0.0'])
+    expected = np.array([True, False, True, True, False, False])
+    tm.assert_numpy_array_equal(s.contains(values), expected)
+    tm.assert_numpy_array_equal(s.contains(values.astype(object)),
+                                expected)
+
+    assert u'10.0.0.1' in s
+    assert ipaddress.ip_address(u'2001:db8::ffff') in s
+    assert u'11.0.0.0' not in s
+
+
+def test_contains_compact():
+    s = ip.IPSet([u'0.0.0.0/8', u'255.255.255.0/24', u'::1:0:0/96'])
+    values = ip.IPArray([0, 1, 2 ** 24 - 1, 2 ** 32 - 1, 2 ** 32 - 257])
+    expected = np.array([False, True, True, True, False])
+    tm.assert_numpy_array_equal(s.contains(values.compact()), expected)
+    tm.assert_numpy_array_equal(s.contains(values), expected)
+
+
+def test_contains_empty():
+    s = ip.IPSet([u'2001:db8::/32'])
+    values = ip.IPArray([u'10.0.0.1']).compact()
+    tm.assert_numpy_array_equal(s.contains(values), np.array([False]))
+    tm.assert_numpy_array_equal(ip.IPSet().contains(values),
+                                np.array([False]))
+
+
+@given(V4_NETS, V4_NETS)
+def test_algebra_matches_ipaddress(a, b):
+    a, b = _networks(a), _networks(b)
+    sa, sb = ip.IPSet(a), ip.IPSet(b)
+    for addr in _addresses(a + b) - {0}:
+        in_a = any(ipaddress.IPv4Address(addr) in net for net in a)
+        in_b = any(ipaddress.IPv4Address(addr) in net for net in b)
+        assert (addr in sa.union(sb)) == (in_a or in_b)
+        assert (addr in sa.intersection(sb)) == (in_a and in_b)
+        assert (addr in sa.difference(sb)) == (in_a and not in_b)
+
+
+def test_algebra():
+    a = ip.IPSet([u'10.0.0.0/8', u'2001:db8::/32'])
+    b = ip.IPSet([u'10.1.0.0/16', u'192.168.0.0/16'])
+    assert (a | b).to_networks().equals(ip.IPNetworkArray(
+        [u'10.0.0.0/8', u'192.168.0.0/16', u'2001:db8::/32']))
+    assert (a & b).to_networks().equals(ip.IPNetworkArray([u'10.1.0.0/16']))
+    assert (a - b).num_addresses == 2 ** 24 - 2 ** 16 + 2 ** 96
+    assert a.union([u'1.1.1.1'], [u'1.1.1.0']).to_networks().equals(
+        ip.IPNetworkArray([u'1.1.1.0/31', u'10.0.0.0/8', u'2001:db8::/32']))
+
+    everything = ip.IPSet([u'::/0'])
+    assert everything.num_addresses == 2 ** 128
+    assert not everything - everything
+    assert everything - ip.IPSet() == everything
+    assert (everything & a) == a
+
+
+def test_add_remove():
+    s = ip.IPSet()
+    s.add(u'10.0.0.0/24')
+    s.add([u'10.0.1.0/24', u'10.0.3.0/24'])
+    s.remove(u'10.0.0.128/25')
+    s.remove(u'172.16.0.0/12')
+    assert s.to_networks().equals(ip.IPNetworkArray(
+        [u'10.0.0.0/25', u'10.0.1.0/24', u'10.0.3.0/24']))
+
+
+def test_copy():
+    s = ip.IPSet([u'10.0.0.0/8'])
+    other = s.copy()
+    other.add(u'8.8.8.8')
+    assert u'8.8.8.8' not in s
+    assert u'8.8.8.8' in other
+
+
+def test_pickle():
+    s = ip.IPSet([u'10.0.0.0/8', u'2001:db8::1'])
+    assert pickle.loads(pickle.dumps(s)) == s
+
+
+@pytest.mark.parametrize('values, size', [
+    ([], 24),
+    ([u'10.0.0.0/8', u'2001:db8::1'], 24 + 2 * 32),
+    # One range
+    ([u'10.0.0.0/8', u'2001:db8::1', u'::/1'], 24 + 32),
+])
+def test_bytes_roundtrip(values, size):
+    s = ip.IPSet(values)
+    data = s.to_bytes()
+    assert len(data) == size
+    result = ip.IPSet.from_bytes(data)
+    assert result == s
+    assert ip.IPSet.from_bytes(bytearray(data)) == s
+
+
+def test_from_bytes_raises():
+    data = ip.IPSet([u'10.0.0.0/8', u'192.168.0.0/16']).to_bytes()
+    with pytest.raises(ValueError, match='Not a serialized IPSet'):
+        ip.IPSet.from_bytes(b'abc')
+    with pytest.raises(ValueError, match='truncated'):
+        ip.IPSet.from_bytes(data[:-1])
+    # Swap the two ranges
+    swapped = data[:24] + data[40:56] + data[24:40] + data[72:] + data[56:72]
+    with pytest.raises(ValueError, match='not sorted'):
+        ip.IPSet.from_bytes(swapped)
+
+
+def test_isin_ipset():
+    s = ip.IPSet([u'10.0.0.0/8'])
+    values = ip.IPArray([u'10.0.0.1', u'11.0.0.1'])
+    expected = np.array([True, False])
+    tm.assert_numpy_array_equal(values.isin(s), expected)
+    tm.assert_series_equal(pd.Series(values).ip.isin(s),
+                           pd.Series(expected))
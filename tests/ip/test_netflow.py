@@ -0,0 +1,191 @@
+import ipaddress
+import struct
+
+import pandas as pd
+import pytest
+
+import cyberpandas as ip
+
+
+def v5_packet(records, sys_uptime=100000, unix_secs=1500000000):
+    header = struct.pack('>HHIIIIBBH', 5, len(records), sys_uptime,
+                         unix_secs, 0, 1, 0, 0, 0)
+    return header + b''.join(records)
+
+
+def v5_record(src, dst, sport, dport, proto=6, packets=10, octets=1000,
+              first=90000, last=99000):
+    return struct.pack('>4s4s4sHHIIIIHHBBBBHHBBH',
+                       ipaddress.IPv4Address(src).packed,
+                       ipaddress.IPv4Address(dst).packed,
+                       ipaddress.IPv4Address(u'10.0.0.254').packed,
+                       1, 2, packets, octets, first, last, sport, dport,
+                       0, 0x1b, proto, 0, 65001, 65002, 24, 16, 0)
+
+
+def ipfix_message(sets, export_time=1500000000, domain=1):
+    body = b''.join(sets)
+    return struct.pack('>HHIII', 10, 16 + len(body), export_time, 1,
+                       domain) + body
+
+
+def ipfix_set(set_id, body):
+    return struct.pack('>HH', set_id, 4 + len(body)) + body
+
+
+def template(template_id, fields):
+    return struct.pack('>HH', template_id, len(fields)) + b''.join(
+        struct.pack('>HH', element, length) for element, length in fields)
+
+
+V4_FIELDS = [(8, 4), (12, 4), (7, 2), (11, 2), (4, 1), (1, 8), (2, 4),
+             (152, 8), (153, 8)]
+V6_FIELDS = [(27, 16), (28, 16), (7, 2), (11, 2), (4, 1), (1, 4), (2, 4),
+             (150, 4), (151, 4)]
+
+
+def v4_data(src, dst, sport, dport):
+    return struct.pack('>4s4sHHBQIQQ', ipaddress.IPv4Address(src).packed,
+                       ipaddress.IPv4Address(dst).packed, sport, dport, 17,
+                       5000, 5, 1500000000000, 1500000001500)
+
+
+def v6_data(src, dst, sport, dport):
+    return struct.pack('>16s16sHHBIIII',
+                       ipaddress.IPv6Address(src).packed,
+                       ipaddress.IPv6Address(dst).packed, sport, dport, 6,
+                       300, 3, 1500000000, 1500000002)
+
+
+def write(tmpdir, data):
+    path = str(tmpdir.join('flows.bin'))
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def test_v5(tmpdir):
+    data = (v5_packet([v5_record(u'10.0.0.1', u'192.168.1.1', 1234, 80),
+                       v5_record(u'10.0.0.2', u'8.8.8.8', 5353, 53, 17)]) +
+            v5_packet([v5_record(u'10.0.0.3', u'1.1.1.1', 1, 443)]))
+    df = ip.read_netflow(write(tmpdir, data))
+
+    assert list(df.columns) == ['start', 'end', 'src', 'dst', 'nexthop',
+                                'sport', 'dport', 'proto', 'tcp_flags',
+                                'tos', 'packets', 'bytes', 'input',
+                                'output', 'src_as', 'dst_as', 'src_mask',
+                                'dst_mask']
+    assert df.src.dtype == ip.IPType()
+    assert df.src.values.equals(
+        ip.IPArray([u'10.0.0.1', u'10.0.0.2', u'10.0.0.3']))
+    assert df.dst.values.equals(
+        ip.IPArray([u'192.168.1.1', u'8.8.8.8', u'1.1.1.1']))
+    assert df.nexthop.values.equals(ip.IPArray([u'10.0.0.254'] * 3))
+    assert df.sport.tolist() == [1234, 5353, 1]
+    assert df.dport.tolist() == [80, 53, 443]
+    assert df.proto.tolist() == [6, 17, 6]
+    assert df.tcp_flags.tolist() == [0x1b] * 3
+    assert df.packets.tolist() == [10] * 3
+    assert df.bytes.tolist() == [1000] * 3
+    assert df.input.tolist() == [1] * 3
+    assert df.src_as.tolist() == [65001] * 3
+    assert df.src_mask.tolist() == [24] * 3
+    # Exported at uptime 100s, so the flow started 10s earlier.
+    assert df.start[0] == pd.Timestamp(1499999990, unit='s')
+    assert df.end[0] == pd.Timestamp(1499999999, unit='s')
+
+
+def test_ipfix(tmpdir):
+    data = ipfix_message([
+        ipfix_set(2, template(256, V4_FIELDS) + template(257, V6_FIELDS)),
+        ipfix_set(256, v4_data(u'10.0.0.1', u'10.0.0.2', 1, 2) +
+                  v4_data(u'10.0.0.3', u'10.0.0.4', 3, 4) + b'\x00\x00'),
+        ipfix_set(257, v6_data(u'2001:db8::1', u'::1', 5, 6)),
+        ipfix_set(256, v4_data(u'10.0.0.5', u'10.0.0.6', 7, 8)),
+    ])
+    df = ip.read_netflow(write(tmpdir, data))
+
+    assert df.src.values.equals(ip.IPArray(
+        [u'10.0.0.1', u'10.0.0.3', u'2001:db8::1', u'10.0.0.5']))
+    assert df.dst.values.equals(ip.IPArray(
+        [u'10.0.0.2', u'10.0.0.4', u'::1', u'10.0.0.6']))
+    assert df.sport.tolist() == [1, 3, 5, 7]
+    assert df.proto.tolist() == [17, 17, 6, 17]
+    assert df.bytes.tolist() == [5000, 5000, 300, 5000]
+    assert df.packets.tolist() == [5, 5, 3, 5]
+    assert df.start[0] == pd.Timestamp(1500000000000, unit='ms')
+    assert df.end[0] == pd.Timestamp(1500000001500, unit='ms')
+    assert df.start[2] == pd.Timestamp(1500000000, unit='s')
+    # Not in the templates
+    assert df.nexthop.values.equals(ip.IPArray([0] * 4))
+    assert df.src_as.tolist() == [0] * 4
+
+
+def test_ipfix_template_scope(tmpdir):
+    data = (
+        # Data before its template is skipped
+        ipfix_message([ipfix_set(256, v4_data(u'1.1.1.1', u'1.1.1.2', 1, 1))
+                       ]) +
+        ipfix_message([ipfix_set(2, template(256, V4_FIELDS))]) +
+        # Another observation domain
+        ipfix_message([ipfix_set(256, v4_data(u'2.2.2.1', u'2.2.2.2', 2, 2))
+                       ], domain=2) +
+        ipfix_message([ipfix_set(256, v4_data(u'3.3.3.1', u'3.3.3.2', 3, 3))
+                       ]) +
+        # Withdrawn
+        ipfix_message([ipfix_set(2, struct.pack('>HH', 256, 0))]) +
+        ipfix_message([ipfix_set(256, v4_data(u'4.4.4.1', u'4.4.4.2', 4, 4))
+                       ])
+    )
+    df = ip.read_netflow(write(tmpdir, data))
+    assert df.src.values.equals(ip.IPArray([u'3.3.3.1']))
+
+
+def test_ipfix_unsupported_templates(tmpdir):
+    options = struct.pack('>HHH', 258, 2, 1) + struct.pack(
+        '>HHHH', 149, 4, 160, 8)
+    data = ipfix_message([
+        ipfix_set(2, template(256, [(8, 4), (82, 65535)]) +
+                  template(257, [(8, 4), (0x8000 | 1, 4)])[:-4] +
+                  struct.pack('>HHI', 0x8000 | 1, 4, 9)),
+        ipfix_set(3, options),
+        ipfix_set(256, b'\x01\x01\x01\x01\x03abc'),
+        ipfix_set(257, b'\x02\x02\x02\x02\x00\x00\x00\x01'),
+        ipfix_set(258, b'\x00\x00\x00\x01' + b'\x00' * 8),
+    ])
+    df = ip.read_netflow(write(tmpdir, data))
+    # Only the template with an enterprise-specific field is decoded.
+    assert df.src.values.equals(ip.IPArray([u'2.2.2.2']))
+
+
+def test_mixed_v5_ipfix(tmpdir):
+    data = (
+        v5_packet([v5_record(u'10.0.0.1', u'10.0.0.2', 1, 2)]) +
+        ipfix_message([
+            ipfix_set(2, template(256, V6_FIELDS)),
+            ipfix_set(256, v6_data(u'::2', u'::3', 3, 4)),
+        ]) +
+        v5_packet([v5_record(u'10.0.0.5', u'10.0.0.6', 5, 6)])
+    )
+    df = ip.read_netflow(write(tmpdir, data))
+    assert df.src.values.equals(
+        ip.IPArray([u'10.0.0.1', u'::2', u'10.0.0.5']))
+    assert df.sport.tolist() == [1, 3, 5]
+
+
+def test_truncated(tmpdir):
+    data = v5_packet([v5_record(u'10.0.0.1', u'10.0.0.2', 1, 2)])
+    df = ip.read_netflow(write(tmpdir, data + data[:30]))
+    assert len(df) == 1
+
+
+def test_empty(tmpdir):
+    df = ip.read_netflow(write(tmpdir, b''))
+    assert len(df) == 0
+    assert df.src.dtype == ip.IPType()
+
+
+def test_unsupported_version_raises(tmpdir):
+    data = struct.pack('>HHIIII', 9, 0, 0, 0, 0, 0)
+    with pytest.raises(ValueError, match="version '9'"):
+        ip.read_netflow(write(tmpdir, data))
@@ -0,0 +1,244 @@
+import ipaddress
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas as ip
+
+
+@pytest.fixture
+def networks():
+    return ip.IPNetworkArray([u'192.168.1.0/24', u'10.0.0.0/8',
+                              u'2001:db8::/32', u'::/0', u'0.0.0.0/0'])
+
+
+def test_make_container():
+    result = ip.IPNetworkArray([u'10.0.0.0/8', u'2001:db8::/32'])
+    expected = np.array([(0, 10 << 24, 104, 4),
+                         (0x20010db800000000, 0, 32, 6)],
+                        dtype=result.dtype._record_type)
+    tm.assert_numpy_array_equal(result.data, expected)
+
+
+def test_host_bits_masked():
+    result = ip.IPNetworkArray([u'10.1.2.3/8'])
+    expected = ip.IPNetworkArray([u'10.0.0.0/8'])
+    assert result.equals(expected)
+
+
+@pytest.mark.parametrize('value', [
+    u'10.1.2.3/8', u'10.0.0.0/255.0.0.0', u'10.0.0.1', u'::/0',
+    u'0.0.0.0/0', u'2001:db8::1/64', u'::ffff:1.2.3.4/120',
+])
+def test_parse_strings_matches_ipaddress(value):
+    result = ip.IPNetworkArray([u'192.168.0.0/16', value])
+    expected = ip.IPNetworkArray([ipaddress.ip_network(u'192.168.0.0/16'),
+                                  ipaddress.ip_network(value, strict=False)])
+    assert result.equals(expected)
+    assert result[1] == ipaddress.ip_network(value, strict=False)
+
+
+@pytest.mark.parametrize('value', [
+    u'10.0.0.0/33', u'::/129', u'10.0.0.0/', u'10.0.0.0/1234', u'x/8',
+])
+def test_parse_strings_raises(value):
+    with pytest.raises(ValueError):
+        ip.IPNetworkArray([u'10.0.0.0/8', value])
+
+
+def test_repr_works(networks):
+    result = repr(networks)
+    expected = ("IPNetworkArray(['192.168.1.0/24', '10.0.0.0/8', "
+                "'2001:db8::/32', '::/0', '0.0.0.0/0'])")
+    assert result == expected
+
+
+def test_to_pynetworks(networks):
+    result = networks.to_pynetworks()
+    expected = [ipaddress.ip_network(x) for x in networks._format_values()]
+    assert result == expected
+
+
+def test_isna():
+    arr = ip.IPNetworkArray([None, u'0.0.0.0/32', u'::/128', u'::/0',
+                             np.nan])
+    result = arr.isna()
+    expected = np.array([True, False, False, False, True])
+    tm.assert_numpy_array_equal(result, expected)
+    assert pd.isna(arr[0])
+
+
+@pytest.mark.parametrize('value', [
+    u'::1/128', u'::/120', u'::/128', u'::/96', u'::ffff:0/112',
+    u'0.0.0.1/32', u'0.0.0.0/24', u'0.0.0.0/32',
+])
+def test_version_round_trips(value):
+    # The IPv6 networks in ::/96 have the same address and prefix length
+    # as an IPv4 network.
+    net = ipaddress.ip_network(value)
+    for arr in [ip.IPNetworkArray([value]), ip.IPNetworkArray([net])]:
+        assert arr[0] == net
+        assert arr[0].version == net.version
+        assert arr.version.tolist() == [net.version]
+        assert arr.is_ipv6.tolist() == [net.version == 6]
+        assert not arr.isna().any()
+        assert arr.to_pynetworks() == [net]
+
+
+def test_version_distinguishes():
+    arr = ip.IPNetworkArray([u'::/120', u'0.0.0.0/24', u'::/120'])
+    assert not arr.equals(ip.IPNetworkArray([u'0.0.0.0/24'] * 3))
+    labels, uniques = arr.factorize()
+    tm.assert_numpy_array_equal(labels, np.array([0, 1, 0]))
+    assert uniques.to_pynetworks() == [ipaddress.ip_network(u'::/120'),
+                                       ipaddress.ip_network(u'0.0.0.0/24')]
+    assert arr.overlaps(ip.IPNetworkArray([u'::/96'] * 3)).tolist() == [
+        True, False, True]
+
+
+def test_from_addresses():
+    result = ip.IPNetworkArray.from_addresses(
+        [u'10.1.2.3', u'2001:db8::1'], [16, 32])
+    expected = ip.IPNetworkArray([u'10.1.0.0/16', u'2001:db8::/32'])
+    assert result.equals(expected)
+
+    with pytest.raises(ValueError):
+        ip.IPNetworkArray.from_addresses([u'10.1.2.3'], [33])
+
+
+@pytest.mark.parametrize('prop', [
+    'prefixlen',
+    'num_addresses',
+    'version',
+    'network_address',
+    'broadcast_address',
+    'netmask',
+    'hostmask',
+])
+def test_attributes(networks, prop):
+    result = list(getattr(networks, prop))
+    expected = [getattr(net, prop) for net in networks.to_pynetworks()]
+    if isinstance(getattr(networks, prop), ip.IPArray):
+        # IPArray boxes IPv6Address(0) as IPv4Address(0)
+        expected = [int(x) for x in expected]
+        result = [int(x) for x in result]
+    assert result == expected
+
+
+def test_contains(networks):
+    addrs = ip.IPArray([u'192.168.1.5', u'10.2.3.4', u'2001:db8::1',
+                        u'1.2.3.4', u'1.2.3.4'])
+    result = networks.contains(addrs)
+    expected = np.array([addr in net for addr, net in
+                         zip(addrs, networks.to_pynetworks())])
+    tm.assert_numpy_array_equal(result, expected)
+
+    result = networks.contains(u'10.1.1.1')
+    expected = np.array([False, True, False, False, True])
+    tm.assert_numpy_array_equal(result, expected)
+
+    # IPArray stores '::1' like '0.0.0.1'
+    nets = ip.IPNetworkArray([u'::/120', u'0.0.0.0/24', None])
+    result = nets.contains(ip.IPArray([u'::1', u'0.0.0.1', u'0.0.0.0']))
+    tm.assert_numpy_array_equal(result, np.array([True, True, False]))
+
+
+def test_overlaps(networks):
+    result = networks.overlaps(u'192.168.0.0/16')
+    expected = np.array([True, False, False, False, True])
+    tm.assert_numpy_array_equal(result, expected)
+
+    other = ip.IPNetworkArray([u'192.168.1.128/25', u'11.0.0.0/8',
+                               u'2001::/16', u'::1/128', u'10.0.0.0/8'])
+    result = networks.overlaps(other)
+    expected = np.array([a.overlaps(b) for a, b in
+                         zip(networks.to_pynetworks(), other.to_pynetworks())])
+    tm.assert_numpy_array_equal(result, expected)
+
+
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'prefixlen_diff': 8},
+    {'new_prefix': 4},
+])
+def test_supernet(kwargs):
+    arr = ip.IPNetworkArray([u'192.168.1.0/24', u'2001:db8::/32'])
+    result = arr.supernet(**kwargs)
+    expected = ip.IPNetworkArray([net.supernet(**kwargs)
+                                  for net in arr.to_pynetworks()])
+    assert result.equals(expected)
+
+
+def test_supernet_raises(networks):
+    with pytest.raises(ValueError):
+        networks.supernet()
+
+    with pytest.raises(ValueError):
+        networks.supernet(new_prefix=16)
+
+
+def test_factorize():
+    arr = ip.IPNetworkArray([u'10.0.0.0/8', u'10.0.0.0/16',
+                             ip.IPNetworkType.na_value, u'0.0.0.0/0',
+                             u'::/0', u'10.0.0.0/8'])
+    labels, uniques = arr.factorize()
+    tm.assert_numpy_array_equal(labels, np.array([0, 1, -1, 2, 3, 0]))
+    assert uniques.equals(ip.IPNetworkArray([u'10.0.0.0/8', u'10.0.0.0/16',
+                                             u'0.0.0.0/0', u'::/0']))
+
+    values, na_value = arr._values_for_factorize()
+    assert (values == na_value).tolist() == [False, False, True, False,
+                                             False, False]
+    assert ip.IPNetworkArray._from_factorized(values, arr).equals(arr)
+
+
+@pytest.mark.parametrize('dropna', [True, False])
+def test_value_counts(dropna):
+    arr = ip.IPNetworkArray([u'10.0.0.0/8', u'::/120', None, u'0.0.0.0/24',
+                             u'10.0.0.0/8'])
+    result = arr.value_counts(dropna=dropna)
+    expected = pd.Series([2, 1, 1], index=[
+        ipaddress.ip_network(u'10.0.0.0/8'),
+        ipaddress.ip_network(u'::/120'),
+        ipaddress.ip_network(u'0.0.0.0/24'),
+    ])
+    if not dropna:
+        expected = expected.append(pd.Series([1], index=[np.nan]))
+    tm.assert_series_equal(result, expected)
+
+    # Series sorts by count, in no particular order for ties
+    result = pd.Series(arr).value_counts(dropna=dropna)
+    tm.assert_series_equal(result.iloc[:1], expected.iloc[:1])
+    assert sorted(map(str, result.index)) == sorted(map(str, expected.index))
+
+
+def test_groupby():
+    df = pd.DataFrame({
+        'net': ip.IPNetworkArray([u'10.0.0.0/8', u'192.168.0.0/16',
+                                  u'10.0.0.0/8', u'10.0.0.0/16']),
+        'bytes': [1, 2, 3, 4],
+    })
+    result = df.groupby('net', sort=False).bytes.sum()
+    assert result.tolist() == [4, 2, 4]
+    assert list(result.index) == [ipaddress.ip_network(u'10.0.0.0/8'),
+                                  ipaddress.ip_network(u'192.168.0.0/16'),
+                                  ipaddress.ip_network(u'10.0.0.0/16')]
+
+
+def test_series_accessor(networks):
+    s = pd.Series(networks, name='nets')
+    result = s.net.prefixlen
+    expected = pd.Series([24, 8, 32, 0, 0], name='nets')
+    tm.assert_series_equal(result, expected)
+
+    result = s.net.contains(u'10.1.1.1')
+    expected = pd.Series([False, True, False, False, True], name='nets')
+    tm.assert_series_equal(result, expected)
+
+    result = s.net.broadcast_address
+    assert result.dtype == ip.IPType()
+
+    with pytest.raises(AttributeError):
+        pd.Series([1, 2]).net
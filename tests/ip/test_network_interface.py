@@ -0,0 +1,150 @@
+import pandas as pd
+import pytest
+from pandas.tests.extension import base
+
+import cyberpandas as ip
+
+
+def _nets(values):
+    return ip.IPNetworkArray([(0, v, 120, 4) for v in values])
+
+
+@pytest.fixture
+def dtype():
+    return ip.IPNetworkType()
+
+
+@pytest.fixture
+def data():
+    return _nets([256 * i for i in range(1, 101)])
+
+
+@pytest.fixture
+def data_missing():
+    return ip.IPNetworkArray([ip.IPNetworkType.na_value, u'10.0.0.0/8'])
+
+
+@pytest.fixture(params=['data', 'data_missing'])
+def all_data(request, data, data_missing):
+    """Parametrized fixture giving 'data' and 'data_missing'"""
+    if request.param == 'data':
+        return data
+    elif request.param == 'data_missing':
+        return data_missing
+
+
+@pytest.fixture
+def data_for_sorting():
+    return ip.IPNetworkArray([u'10.0.0.0/8', u'2001:db8::/32',
+                              u'1.0.0.0/8'])
+
+
+@pytest.fixture
+def data_missing_for_sorting():
+    return ip.IPNetworkArray([u'2001:db8::/32', ip.IPNetworkType.na_value,
+                              u'1.0.0.0/8'])
+
+
+@pytest.fixture
+def data_for_grouping():
+    b = u'1.0.0.0/8'
+    a = u'2001:db8::/32'
+    c = u'2001:db9::/32'
+    na = ip.IPNetworkType.na_value
+    return ip.IPNetworkArray([
+        b, b, na, na, a, a, b, c
+    ])
+
+
+@pytest.fixture
+def data_repeated(data):
+    def gen(count):
+        for _ in range(count):
+            yield data
+    return gen
+
+
+@pytest.fixture
+def na_cmp():
+    """Binary operator for comparing NA values.
+
+    Should return a function of two arguments that returns
+    True if both arguments are (scalar) NA for your type.
+    """
+    return lambda x, y: pd.isna(x) and pd.isna(y)
+
+
+@pytest.fixture
+def na_value():
+    return ip.IPNetworkType.na_value
+
+
+class TestDtype(base.BaseDtypeTests):
+    pass
+
+
+class TestInterface(base.BaseInterfaceTests):
+    pass
+
+
+class TestConstructors(base.BaseConstructorsTests):
+    pass
+
+
+class TestReshaping(base.BaseReshapingTests):
+    @pytest.mark.skip("We consider 0.0.0.0/32 to be NA.")
+    def test_stack(self):
+        pass
+
+    @pytest.mark.skip("We consider 0.0.0.0/32 to be NA.")
+    def test_unstack(self):
+        pass
+
+
+class TestGetitem(base.BaseGetitemTests):
+    pass
+
+
+class TestMissing(base.BaseMissingTests):
+    @pytest.mark.skip(reason="Networks are list-like scalars")
+    def test_fillna_series(self):
+        pass
+
+    @pytest.mark.skip(reason="Networks are list-like scalars")
+    def test_fillna_frame(self):
+        pass
+
+
+class TestMethods(base.BaseMethodsTests):
+    @pytest.mark.parametrize('dropna', [True, False])
+    @pytest.mark.xfail(reason='upstream')
+    def test_value_counts(data, dropna):
+        pass
+
+    @pytest.mark.skip(reason='No ordering')
+    def test_combine_le(self, data_repeated):
+        super().test_combine_le(data_repeated)
+
+    @pytest.mark.skip(reason='No __add__')
+    def test_combine_add(self, data_repeated):
+        super().test_combine_add(data_repeated)
+
+    @pytest.mark.skip(reason="Networks are list-like scalars")
+    def test_fillna_copy_frame(self):
+        pass
+
+    @pytest.mark.skip(reason="Networks are list-like scalars")
+    def test_fillna_copy_series(self):
+        pass
+
+    @pytest.mark.skip(reason="Networks are list-like scalars")
+    def test_where_series(self):
+        pass
+
+    @pytest.mark.skip(reason="TODO")
+    def test_hash_pandas_object_works(self):
+        pass
+
+    @pytest.mark.xfail(reason="No ordering between v4 and v6 networks")
+    def test_searchsorted(self, data_for_sorting, as_series):
+        return super().test_searchsorted(data_for_sorting, as_series)
@@ -0,0 +1,79 @@
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas as ip
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'ip': ip.IPArray([u'10.0.0.1', u'10.0.0.2', u'192.168.1.1',
+                          u'192.168.1.2', u'2001:db8::1', u'2001:db8::2']),
+        'mac': ip.MACArray([1, 2, 3, 4, 5, 6]),
+        'n': [1, 2, 3, 4, 5, 6],
+    }, columns=['ip', 'mac', 'n'])
+
+
+def test_pandas_roundtrip(df, tmpdir):
+    path = str(tmpdir.join('test.parquet'))
+    df.to_parquet(path, engine='pyarrow')
+    result = pd.read_parquet(path, engine='pyarrow')
+    tm.assert_frame_equal(result, df)
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_roundtrip(df, tmpdir, compact):
+    path = str(tmpdir.join('test.parquet'))
+    ip.to_parquet(df, path, compact=compact)
+    result = ip.read_parquet(path)
+    tm.assert_frame_equal(result, df)
+    # Has IPv6 addresses, so never compact
+    assert not result['ip'].values.is_compact
+
+
+def test_roundtrip_compact(df, tmpdir):
+    df = df.iloc[:4].copy()
+    path = str(tmpdir.join('test.parquet'))
+    ip.to_parquet(df, path, compact=True)
+
+    schema = pq.ParquetFile(path).schema_arrow
+    assert schema.field('ip').type.storage_type == pa.uint32()
+
+    result = ip.read_parquet(path)
+    assert result['ip'].values.is_compact
+    tm.assert_frame_equal(result, df)
+
+
+@pytest.mark.parametrize('compact', [True, False])
+@pytest.mark.parametrize('networks, expected', [
+    (u'10.0.0.0/8', [0, 1]),
+    ([u'10.0.0.2/32', u'192.168.0.0/16'], [1, 2, 3]),
+    (u'172.16.0.0/12', []),
+])
+def test_read_networks(df, tmpdir, compact, networks, expected):
+    df = df.iloc[:4]
+    path = str(tmpdir.join('test.parquet'))
+    ip.to_parquet(df, path, compact=compact, row_group_size=2)
+
+    result = ip.read_parquet(path, networks={'ip': networks})
+    tm.assert_frame_equal(result, df.iloc[expected])
+
+    result = ip.read_parquet(path, columns=['n'], networks={'ip': networks})
+    tm.assert_frame_equal(result, df.iloc[expected][['n']])
+
+
+def test_read_networks_skips_row_groups(df, tmpdir):
+    from cyberpandas.parquet import _as_networks, _row_group_may_match
+
+    path = str(tmpdir.join('test.parquet'))
+    ip.to_parquet(df, path, row_group_size=2)
+    metadata = pq.ParquetFile(path).metadata
+    networks = {'ip': _as_networks(u'2001:db8::/32')}
+
+    result = [_row_group_may_match(metadata.row_group(i), networks)
+              for i in range(metadata.num_row_groups)]
+    assert result == [False, False, True]
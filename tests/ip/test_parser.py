@@ -1,8 +1,12 @@
 import ipaddress
 
+import numpy as np
 import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, lists
 
 from cyberpandas import parser, IPArray
+from cyberpandas.ip_array import _format_ipv4
 
 
 @pytest.mark.parametrize('values', [
@@ -56,3 +60,58 @@ def test_as_ip_object(val, expected):
 def test_as_ip_object_raises(val):
     with pytest.raises(ValueError):
         parser._as_ip_object(val)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (u'0.0.0.0', 0),
+    (u'1.2.3.4', 0x01020304),
+    (u'255.255.255.255', 2 ** 32 - 1),
+    (u'10.0.0.10', 0x0a00000a),
+    (u'', None),
+    (u'1.2.3', None),
+    (u'1.2.3.4.5', None),
+    (u'256.0.0.1', None),
+    (u'01.2.3.4', None),
+    (u'1..2.3', None),
+    (u'1.2.3.4 ', None),
+    (u'1.2.3.1234', None),
+    (u'::1', None),
+    (u'1.2.3.4/8', None),
+])
+def test_parse_ipv4_strings(value, expected):
+    values = np.array([u'10.0.0.1', value])
+    result, parsed = parser._parse_ipv4_strings(values)
+    assert parsed[0] and result[0] == 0x0a000001
+    if expected is None:
+        assert not parsed[1]
+    else:
+        assert parsed[1] and result[1] == expected
+
+
+@given(lists(integers(min_value=0, max_value=2 ** 32 - 1)))
+def test_parse_ipv4_strings_matches_ipaddress(values):
+    strings = np.array([str(ipaddress.IPv4Address(x)) for x in values] +
+                       [u'::1'])
+    result, parsed = parser._parse_ipv4_strings(strings)
+    assert result[:-1].tolist() == values
+    assert parsed[:-1].all() and not parsed[-1]
+
+    result = _format_ipv4(np.array(values, dtype='u8'))
+    assert result.tolist() == strings[:-1].tolist()
+
+
+def test_to_ipaddress_mixed_strings():
+    result = parser.to_ipaddress([u'10.0.0.1', u'2001:db8::1', u'::1'])
+    expected = IPArray.from_pyints([0x0a000001, (0x20010db8 << 96) + 1, 1])
+    assert result.equals(expected)
+
+    with pytest.raises(ValueError):
+        parser.to_ipaddress([u'10.0.0.1', u'10.0.0.256'])
+
+
+@given(lists(integers(min_value=0, max_value=2 ** 128 - 1)))
+def test_parse_ip_strings_ipv6_matches_ipaddress(values):
+    strings = [str(ipaddress.IPv6Address(x)) for x in values]
+    result = parser._parse_ip_strings(strings + [u'::ffff:1.2.3.4'])
+    expected = IPArray.from_pyints(values + [0xffff01020304])
+    assert IPArray._from_ndarray(result).equals(expected)
@@ -0,0 +1,191 @@
+import ipaddress
+import struct
+
+import pandas as pd
+import pytest
+
+import cyberpandas as ip
+
+MAC_DST = b'\x00\x11\x22\x33\x44\x55'
+MAC_SRC = b'\x66\x77\x88\x99\xaa\xbb'
+
+
+def pcap_file(packets, linktype=1, order='<', nanoseconds=False,
+              snaplen=65535):
+    magic = 0xa1b23c4d if nanoseconds else 0xa1b2c3d4
+    out = [struct.pack(order + 'IHHiIII', magic, 2, 4, 0, 0, snaplen,
+                       linktype)]
+    for i, packet in enumerate(packets):
+        captured = packet[:snaplen]
+        out.append(struct.pack(order + 'IIII', 1500000000 + i, 250,
+                               len(captured), len(packet)))
+        out.append(captured)
+    return b''.join(out)
+
+
+def ethernet(payload, ethertype=0x0800, vlans=()):
+    tags = b''.join(struct.pack('>HH', tpid, vid) for tpid, vid in vlans)
+    return MAC_DST + MAC_SRC + tags + struct.pack('>H', ethertype) + payload
+
+
+def ipv4(src, dst, proto, payload, options=b'', flags_fragment=0):
+    ihl = 5 + len(options) // 4
+    return (struct.pack('>BBHHHBBH', 0x40 | ihl, 0, 20 + len(payload),
+                        1, flags_fragment, 64, proto, 0) +
+            ipaddress.IPv4Address(src).packed +
+            ipaddress.IPv4Address(dst).packed + options + payload)
+
+
+def ipv6(src, dst, next_header, payload):
+    return (struct.pack('>IHBB', 0x60000000, len(payload), next_header, 64) +
+            ipaddress.IPv6Address(src).packed +
+            ipaddress.IPv6Address(dst).packed + payload)
+
+
+def ports(sport, dport, length=20):
+    return struct.pack('>HH', sport, dport) + b'\x00' * (length - 4)
+
+
+def write(tmpdir, data):
+    path = str(tmpdir.join('test.pcap'))
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def test_ethernet_ipv4_tcp(tmpdir):
+    packets = [
+        ethernet(ipv4('10.0.0.1', '192.168.1.1', 6, ports(12345, 443))),
+        ethernet(ipv4('10.0.0.2', '8.8.8.8', 17, ports(5353, 53, 8))),
+    ]
+    df = ip.read_pcap(write(tmpdir, pcap_file(packets)))
+
+    assert list(df.columns) == ['timestamp', 'length', 'eth_src',
+                                'eth_dst', 'ethertype', 'src', 'dst',
+                                'proto', 'sport', 'dport']
+    assert df.src.dtype == ip.IPType()
+    assert df.eth_src.dtype == ip.MACType()
+    assert df.src.values.equals(ip.IPArray(['10.0.0.1', '10.0.0.2']))
+    assert df.dst.values.equals(ip.IPArray(['192.168.1.1', '8.8.8.8']))
+    assert df.eth_src.values.equals(ip.MACArray([0x66778899aabb] * 2))
+    assert df.eth_dst.values.equals(ip.MACArray([0x001122334455] * 2))
+    assert df.ethertype.tolist() == [0x0800, 0x0800]
+    assert df.proto.tolist() == [6, 17]
+    assert df.sport.tolist() == [12345, 5353]
+    assert df.dport.tolist() == [443, 53]
+    assert df.length.tolist() == [len(p) for p in packets]
+    assert df.timestamp[0] == pd.Timestamp(1500000000000250, unit='us')
+
+
+def test_ipv4_options_and_fragments(tmpdir):
+    packets = [
+        ethernet(ipv4('10.0.0.1', '10.0.0.2', 6, ports(1, 2),
+                      options=b'\x01' * 8)),
+        # A later fragment has no transport header
+        ethernet(ipv4('10.0.0.1', '10.0.0.2', 6, ports(1, 2),
+                      flags_fragment=0x2010)),
+    ]
+    df = ip.read_pcap(write(tmpdir, pcap_file(packets)))
+    assert df.sport.tolist() == [1, 0]
+    assert df.dport.tolist() == [2, 0]
+
+
+def test_vlan_ipv6_extension_headers(tmpdir):
+    hop_by_hop = struct.pack('>BB', 17, 0) + b'\x00' * 6
+    packets = [
+        ethernet(ipv6('2001:db8::1', '2001:db8::2', 0,
+                      hop_by_hop + ports(546, 547, 8)),
+                 ethertype=0x86dd, vlans=[(0x88a8, 10), (0x8100, 20)]),
+        ethernet(ipv6('2001:db8::3', '::1', 6, ports(80, 8080)),
+                 ethertype=0x86dd, vlans=[(0x8100, 30)]),
+    ]
+    df = ip.read_pcap(write(tmpdir, pcap_file(packets)))
+    assert df.src.values.equals(ip.IPArray(['2001:db8::1', '2001:db8::3']))
+    assert df.dst.values.equals(ip.IPArray(['2001:db8::2', '::1']))
+    assert df.ethertype.tolist() == [0x86dd, 0x86dd]
+    assert df.proto.tolist() == [17, 6]
+    assert df.sport.tolist() == [546, 80]
+    assert df.dport.tolist() == [547, 8080]
+
+
+def test_non_ip(tmpdir):
+    arp = ethernet(b'\x00\x01\x08\x00\x06\x04\x00\x01' + b'\x01' * 20,
+                   ethertype=0x0806)
+    df = ip.read_pcap(write(tmpdir, pcap_file([arp])))
+    assert df.ethertype.tolist() == [0x0806]
+    assert df.src.values.equals(ip.IPArray([0]))
+    assert df.proto.tolist() == [0]
+    assert df.sport.tolist() == [0]
+
+
+@pytest.mark.parametrize('order', ['<', '>'])
+@pytest.mark.parametrize('nanoseconds', [True, False])
+def test_raw(tmpdir, order, nanoseconds):
+    packets = [
+        ipv4('10.0.0.1', '10.0.0.2', 17, ports(1, 2, 8)),
+        ipv6('::2', '::3', 17, ports(3, 4, 8)),
+    ]
+    data = pcap_file(packets, linktype=101, order=order,
+                     nanoseconds=nanoseconds)
+    df = ip.read_pcap(write(tmpdir, data))
+    assert df.src.values.equals(ip.IPArray(['10.0.0.1', '::2']))
+    assert df.ethertype.tolist() == [0x0800, 0x86dd]
+    assert df.eth_src.values.equals(ip.MACArray([0, 0]))
+    assert df.sport.tolist() == [1, 3]
+    expected = 250 if nanoseconds else 250000
+    assert df.timestamp[0] == pd.Timestamp(1500000000 * 10 ** 9 + expected)
+
+
+def test_linux_sll(tmpdir):
+    header = struct.pack('>HHH', 0, 1, 6) + MAC_SRC + b'\x00\x00'
+    packet = (header + struct.pack('>H', 0x0800) +
+              ipv4('10.0.0.1', '10.0.0.2', 6, ports(1, 2)))
+    df = ip.read_pcap(write(tmpdir, pcap_file([packet], linktype=113)))
+    assert df.src.values.equals(ip.IPArray(['10.0.0.1']))
+    assert df.dport.tolist() == [2]
+
+
+def test_snaplen(tmpdir):
+    packets = [
+        ethernet(ipv4('10.0.0.1', '10.0.0.2', 6, ports(1, 2))),
+        ethernet(ipv4('10.0.0.3', '10.0.0.4', 6, ports(3, 4))),
+    ]
+    df = ip.read_pcap(write(tmpdir, pcap_file(packets, snaplen=34)))
+    assert df.src.values.equals(ip.IPArray(['10.0.0.1', '10.0.0.3']))
+    assert df.length.tolist() == [54, 54]
+    # The transport headers weren't captured.
+    assert df.sport.tolist() == [0, 0]
+    assert df.dport.tolist() == [0, 0]
+
+
+def test_truncated_file(tmpdir):
+    packets = [
+        ethernet(ipv4('10.0.0.1', '10.0.0.2', 6, ports(1, 2))),
+        ethernet(ipv4('10.0.0.3', '10.0.0.4', 6, ports(3, 4))),
+    ]
+    data = pcap_file(packets)[:-20]
+    df = ip.read_pcap(write(tmpdir, data))
+    assert df.dst.values.equals(ip.IPArray(['10.0.0.2', '10.0.0.4']))
+    assert df.sport.tolist() == [1, 0]
+
+
+def test_empty(tmpdir):
+    df = ip.read_pcap(write(tmpdir, pcap_file([])))
+    assert len(df) == 0
+    assert df.src.dtype == ip.IPType()
+    assert df.eth_src.dtype == ip.MACType()
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'\x0a\x0d\x0d\x0a' + b'\x00' * 24,
+    b'not a pcap file at all!!',
+])
+def test_not_pcap_raises(tmpdir, data):
+    with pytest.raises(ValueError, match='not a pcap file'):
+        ip.read_pcap(write(tmpdir, data))
+
+
+def test_unsupported_linktype_raises(tmpdir):
+    with pytest.raises(ValueError, match='link type'):
+        ip.read_pcap(write(tmpdir, pcap_file([], linktype=105)))
@@ -0,0 +1,73 @@
+import multiprocessing
+
+import numpy as np
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas as ip
+from cyberpandas.shared import _ATTACHED
+
+pytest.importorskip('multiprocessing.shared_memory')
+
+
+def _count_ipv4(shared):
+    return int(shared.attach().is_ipv4.sum())
+
+
+def _set_first(shared):
+    shared.attach()[0] = u'8.8.8.8'
+
+
+@pytest.mark.parametrize('arr', [
+    ip.IPArray([u'10.0.0.1', u'2001:db8::1']),
+    ip.IPArray([u'10.0.0.1', u'10.0.0.2'], compact=True),
+    ip.IPArray([]),
+])
+def test_attach(arr):
+    with ip.SharedArray(arr) as shared:
+        result = shared.attach()
+        assert result.equals(arr)
+        assert result.is_compact == arr.is_compact
+        del result
+    assert shared.name not in _ATTACHED
+
+
+def test_attach_mac():
+    arr = ip.MACArray([1, 0x001b638445e6])
+    with ip.SharedArray(arr) as shared:
+        result = shared.attach()
+        tm.assert_numpy_array_equal(result.data, arr.data)
+        del result
+
+
+def test_pool():
+    arr = ip.IPArray([u'10.0.0.1', u'2001:db8::1', u'192.168.0.1'])
+    with ip.SharedArray(arr) as shared:
+        pool = multiprocessing.Pool(2)
+        try:
+            assert pool.map(_count_ipv4, [shared] * 4) == [2] * 4
+            pool.apply(_set_first, (shared,))
+        finally:
+            pool.terminate()
+            pool.join()
+        result = shared.attach()
+        assert result.equals(ip.IPArray([u'8.8.8.8', u'2001:db8::1',
+                                         u'192.168.0.1']))
+        del result
+
+
+def test_lifetime():
+    shared = ip.SharedArray(ip.IPArray([1, 2, 3]))
+    result = shared.attach()
+    assert np.shares_memory(result.data, shared.attach().data)
+    with pytest.raises(BufferError):
+        shared.detach()
+
+    del result
+    shared.detach()
+    # Attaching maps it again
+    assert shared.attach().equals(ip.IPArray([1, 2, 3]))
+    shared.unlink()
+
+    with pytest.raises(ValueError):
+        shared.unlink()
@@ -0,0 +1,108 @@
+import gzip
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cyberpandas as ip
+
+HEADER = u"""\
+#separator \\x09
+#set_separator\t,
+#empty_field\t(empty)
+#unset_field\t-
+#path\tconn
+#open\t2018-01-01-00-00-00
+#fields\tts\tuid\tid.orig_h\tid.orig_p\tid.resp_h\tid.resp_p\tproto\t\
+duration\torig_bytes\tlocal_orig\ttunnel_parents\tnet
+#types\ttime\tstring\taddr\tport\taddr\tport\tenum\tinterval\tcount\t\
+bool\tset[string]\tsubnet
+"""
+ROWS = [
+    u'1514764800.123456\tCa1\t10.0.0.1\t51234\t8.8.8.8\t53\tudp\t0.5\t'
+    u'40\tT\t(empty)\t10.0.0.0/8',
+    u'1514764801.000000\tCa2\t2001:db8::1\t443\t2001:db8::2\t8443\ttcp\t'
+    u'-\t-\tF\tCb1,Cb2\t2001:db8::/32',
+    u'1514764802.500000\tCa3\t-\t0\t192.168.1.1\t80\ttcp\t1.25\t100\t-\t'
+    u'-\t-',
+]
+FOOTER = u'#close\t2018-01-01-01-00-00\n'
+
+
+def log(rows=ROWS, footer=FOOTER):
+    return HEADER + u''.join(row + u'\n' for row in rows) + footer
+
+
+def write(tmpdir, text, name='conn.log', compress=False):
+    path = str(tmpdir.join(name))
+    opener = gzip.open if compress else open
+    with opener(path, 'wb') as f:
+        f.write(text.encode('utf-8'))
+    return path
+
+
+def test_read_zeek(tmpdir):
+    df = ip.read_zeek(write(tmpdir, log()))
+
+    assert list(df.columns) == ['ts', 'uid', 'id.orig_h', 'id.orig_p',
+                                'id.resp_h', 'id.resp_p', 'proto',
+                                'duration', 'orig_bytes', 'local_orig',
+                                'tunnel_parents', 'net']
+    assert len(df) == 3
+    assert df['id.orig_h'].dtype == ip.IPType()
+    assert df['id.orig_h'].values.equals(
+        ip.IPArray([u'10.0.0.1', u'2001:db8::1', u'0.0.0.0']))
+    assert df['id.orig_h'].isna().tolist() == [False, False, True]
+    assert df['id.resp_h'].values.equals(
+        ip.IPArray([u'8.8.8.8', u'2001:db8::2', u'192.168.1.1']))
+    assert df['net'].dtype == ip.IPNetworkType()
+    assert df['net'].values.equals(
+        ip.IPNetworkArray([u'10.0.0.0/8', u'2001:db8::/32', None]))
+    assert df['net'].isna().tolist() == [False, False, True]
+
+    assert df['ts'][0] == pd.Timestamp('2018-01-01 00:00:00.123456')
+    assert df['id.orig_p'].tolist() == [51234, 443, 0]
+    assert df['id.orig_p'].dtype == np.int64
+    assert df['duration'][0] == pd.Timedelta(0.5, unit='s')
+    assert pd.isna(df['duration'][1])
+    assert df['orig_bytes'].dtype == np.float64
+    assert df['local_orig'].tolist()[:2] == [True, False]
+    assert df['uid'].tolist() == ['Ca1', 'Ca2', 'Ca3']
+    assert df['tunnel_parents'][0] == ''
+    assert df['tunnel_parents'][1] == 'Cb1,Cb2'
+    assert pd.isna(df['tunnel_parents'][2])
+
+
+def test_read_zeek_gzip(tmpdir):
+    expected = ip.read_zeek(write(tmpdir, log()))
+    result = ip.read_zeek(write(tmpdir, log(), name='conn.log.gz',
+                                compress=True))
+    pd.util.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize('compress', [True, False])
+def test_read_zeek_chunks(tmpdir, compress):
+    path = write(tmpdir, log(ROWS * 3), compress=compress)
+    chunks = list(ip.read_zeek(path, chunksize=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 1]
+    assert chunks[1]['id.resp_h'].dtype == ip.IPType()
+    result = pd.concat(chunks, ignore_index=True)
+    expected = ip.read_zeek(path)
+    assert result['id.resp_h'].values.equals(expected['id.resp_h'].values)
+    assert result['ts'].equals(expected['ts'])
+
+
+def test_read_zeek_no_close(tmpdir):
+    df = ip.read_zeek(write(tmpdir, log(footer=u'')))
+    assert len(df) == 3
+
+
+def test_read_zeek_empty(tmpdir):
+    df = ip.read_zeek(write(tmpdir, log(rows=[])))
+    assert len(df) == 0
+    assert df['id.orig_h'].dtype == ip.IPType()
+
+
+def test_read_zeek_not_zeek_raises(tmpdir):
+    with pytest.raises(ValueError, match='not a Zeek log'):
+        ip.read_zeek(write(tmpdir, u'a\tb\n1\t2\n'))
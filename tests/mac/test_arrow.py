@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas as ip
+
+pa = pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def arr():
+    return ip.MACArray([0x001b638445e6, 0, 2 ** 64 - 1])
+
+
+def test_to_arrow(arr):
+    result = pa.array(arr)
+    assert result.type.extension_name == 'cyberpandas.mac'
+    assert result.storage.type == pa.uint64()
+    assert result.storage.to_pylist() == arr.data.tolist()
+    # Zero-copy
+    assert result.storage.buffers()[1].address == arr.data.ctypes.data
+
+    result = pa.array(arr, type=pa.uint64())
+    assert result.type == pa.uint64()
+
+
+def test_from_arrow(arr):
+    result = ip.MACType().__from_arrow__(pa.array(arr))
+    tm.assert_numpy_array_equal(result.data, arr.data)
+    assert np.shares_memory(result.data, arr.data)
+
+
+def test_from_arrow_integers_with_nulls():
+    result = ip.MACType().__from_arrow__(pa.array([1, None, 3]))
+    tm.assert_numpy_array_equal(result.data,
+                                np.array([1, 0, 3], dtype='u8'))
+
+
+def test_table_roundtrip(arr):
+    df = pd.DataFrame({'mac': arr, 'n': [1, 2, 3]}, columns=['mac', 'n'])
+    result = pa.Table.from_pandas(df).to_pandas()
+    tm.assert_frame_equal(result, df)
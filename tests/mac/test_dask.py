@@ -0,0 +1,30 @@
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas
+
+dd = pytest.importorskip('dask.dataframe')
+
+
+@pytest.fixture
+def s():
+    return pd.Series(cyberpandas.MACArray([1, 2, 1, 0x010000000000, 2]),
+                     name='mac')
+
+
+def test_meta_nonempty():
+    meta = dd.utils.meta_nonempty(pd.Series([], dtype='mac'))
+    assert meta.dtype == cyberpandas.MACType()
+    assert len(meta) == 2
+
+
+def test_accessor(s):
+    ds = dd.from_pandas(s, npartitions=2)
+    tm.assert_series_equal(ds.mac.is_multicast.compute(), s.mac.is_multicast)
+
+
+def test_value_counts(s):
+    ds = dd.from_pandas(s, npartitions=2)
+    tm.assert_series_equal(ds.value_counts().compute().sort_index(),
+                           s.value_counts().sort_index())
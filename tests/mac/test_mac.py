@@ -0,0 +1,334 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas as ip
+from cyberpandas.mac_array import MACArray
+
+
+@pytest.mark.parametrize('value', [
+    u'00:1b:63:84:45:e6',
+    u'00-1B-63-84-45-E6',
+    u'001b.6384.45e6',
+    u'001B638445E6',
+    b'00:1b:63:84:45:e6',
+])
+def test_to_macaddress_formats(value):
+    result = ip.to_macaddress([value, value])
+    expected = np.array([0x001b638445e6] * 2, dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+
+def test_to_macaddress_scalar():
+    result = ip.to_macaddress(u'ff:ff:ff:ff:ff:ff')
+    expected = np.array([2 ** 48 - 1], dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+
+def test_to_macaddress_missing():
+    result = ip.to_macaddress([u'', None, np.nan, u'00:00:00:00:00:01'])
+    expected = np.array([0, 0, 0, 1], dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+
+def test_to_macaddress_mixed():
+    result = ip.to_macaddress([1, u'00:00:00:00:00:02', b'000000000003'])
+    expected = np.array([1, 2, 3], dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+
+@pytest.mark.parametrize('value', [
+    u'00:1b:63:84:45:e',
+    u'00:1b:63:84:45:e60',
+    u'00:1b:63:84:45:eg',
+    u'00:1b:63:84:45:eİ',
+    u'00:1b-63:84:45:e6',
+    u'00.1b.63.84.45.e6',
+    u'001b:6384:45e6',
+])
+def test_to_macaddress_invalid(value):
+    with pytest.raises(ValueError):
+        ip.to_macaddress([u'00:00:00:00:00:01', value])
+
+    result = ip.to_macaddress([u'00:00:00:00:00:01', value],
+                              errors='coerce')
+    expected = np.array([1, 0], dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+
+def test_to_macaddress_floats():
+    result = ip.to_macaddress(np.array([1.0, np.nan, 2.0]))
+    expected = np.array([1, 0, 2], dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+
+@pytest.mark.parametrize('value', [1.5, np.float32(0.5), -1.0, 2.0 ** 64])
+def test_to_macaddress_float_invalid(value):
+    with pytest.raises(ValueError):
+        ip.to_macaddress([1, value])
+
+    result = ip.to_macaddress([1, value], errors='coerce')
+    expected = np.array([1, 0], dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+
+def test_to_macaddress_bad_errors():
+    with pytest.raises(ValueError):
+        ip.to_macaddress([u'00:00:00:00:00:01'], errors='ignore')
+
+
+def test_from_strings():
+    result = MACArray([u'00:00:00:00:00:01', u'00-00-00-00-00-02'])
+    expected = MACArray([1, 2])
+    tm.assert_numpy_array_equal(result.data, expected.data)
+
+    result = pd.Series([u'00:00:00:00:00:01', u'0000.0000.0002'],
+                       dtype='mac')
+    assert result.dtype == ip.MACType()
+    assert result.values.data.tolist() == [1, 2]
+
+
+@pytest.mark.parametrize('style, expected', [
+    ('colon', [u'00:00:00:00:00:00', u'00:1b:63:84:45:e6']),
+    ('dash', [u'00-00-00-00-00-00', u'00-1b-63-84-45-e6']),
+    ('cisco', [u'0000.0000.0000', u'001b.6384.45e6']),
+    ('bare', [u'000000000000', u'001b638445e6']),
+])
+def test_to_strings(style, expected):
+    arr = MACArray([0, 0x001b638445e6])
+    result = arr.to_strings(style)
+    expected = np.array(expected, dtype=object)
+    tm.assert_numpy_array_equal(result, expected)
+    # Round trips through the parser
+    tm.assert_numpy_array_equal(ip.to_macaddress(result), arr.data)
+
+
+def test_to_strings_wide():
+    result = MACArray([1, 2 ** 64 - 1]).to_strings()
+    expected = np.array([u'00:00:00:00:00:01', u'ff:ff:ff:ff:ff:ff:ff:ff'],
+                        dtype=object)
+    tm.assert_numpy_array_equal(result, expected)
+
+
+def test_to_strings_raises():
+    with pytest.raises(ValueError):
+        MACArray([1]).to_strings('dots')
+
+
+@pytest.mark.parametrize('protocol', range(2, pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle_roundtrip(protocol):
+    arr = MACArray([1, 0x001b638445e6, 2 ** 64 - 1])
+    result = pickle.loads(pickle.dumps(arr, protocol=protocol))
+    tm.assert_numpy_array_equal(result.data, arr.data)
+
+
+@pytest.mark.skipif(pickle.HIGHEST_PROTOCOL < 5,
+                    reason="requires pickle protocol 5")
+def test_pickle_out_of_band():
+    arr = MACArray([1, 0x001b638445e6, 2 ** 64 - 1])
+    buffers = []
+    data = pickle.dumps(arr, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+
+    result = pickle.loads(data, buffers=buffers)
+    assert np.shares_memory(result.data, arr.data)
+
+
+def test_repr():
+    result = repr(MACArray([1, 0x001b638445e6]))
+    expected = "MACArray(['00:00:00:00:00:01', '00:1b:63:84:45:e6'])"
+    assert result == expected
+
+
+def test_factorize():
+    arr = MACArray([3, 1, 0, 3, 2 ** 64 - 1])
+    labels, uniques = pd.factorize(arr)
+    tm.assert_numpy_array_equal(labels, np.array([0, 1, -1, 0, 2]))
+    tm.assert_numpy_array_equal(uniques.data,
+                                np.array([3, 1, 2 ** 64 - 1], dtype='u8'))
+
+
+def test_unique():
+    result = MACArray([3, 1, 3, 0, 1]).unique()
+    tm.assert_numpy_array_equal(result.data,
+                                np.array([3, 1, 0], dtype='u8'))
+
+
+def test_argsort():
+    arr = MACArray([3, 2 ** 64 - 1, 1])
+    tm.assert_numpy_array_equal(arr.argsort(), np.array([2, 0, 1]))
+    tm.assert_numpy_array_equal(arr.argsort(ascending=False),
+                                np.array([1, 0, 2]))
+
+
+def test_searchsorted():
+    arr = MACArray([1, 3, 2 ** 48 - 1])
+    result = arr.searchsorted(3)
+    assert np.ndim(result) == 0 and result == 1
+    result = arr.searchsorted(u'00:00:00:00:00:03', side='right')
+    assert np.ndim(result) == 0 and result == 2
+    result = arr.searchsorted(MACArray([0, 2 ** 48]))
+    tm.assert_numpy_array_equal(result, np.array([0, 3]))
+    result = arr.searchsorted([3])
+    tm.assert_numpy_array_equal(result, np.array([1]))
+
+    s = pd.Series(arr)
+    assert s.searchsorted(2 ** 48 - 1) == 2
+
+
+def test_value_counts():
+    result = MACArray([3, 1, 0, 3]).value_counts().sort_index()
+    expected = pd.Series([1, 2], index=pd.Index([1, 3], dtype='u8'))
+    tm.assert_series_equal(result, expected)
+
+
+@pytest.mark.parametrize('keep, expected', [
+    ('first', [False, False, True, False, True]),
+    ('last', [True, False, False, True, False]),
+    (False, [True, False, True, True, True]),
+])
+def test_duplicated(keep, expected):
+    result = MACArray([3, 1, 3, 2, 2]).duplicated(keep=keep)
+    tm.assert_numpy_array_equal(result, np.array(expected))
+
+
+def test_groupby():
+    df = pd.DataFrame({'mac': MACArray([3, 1, 3, 2 ** 64 - 1]),
+                       'n': [1, 2, 3, 4]})
+    result = df.groupby('mac').n.sum()
+    assert result.tolist() == [2, 4, 4]
+
+
+def test_oui():
+    arr = MACArray([0x001b638445e6, 0])
+    tm.assert_numpy_array_equal(arr.oui, np.array([0x001b63, 0], dtype='u4'))
+
+
+def test_flags():
+    arr = MACArray([u'00:1b:63:84:45:e6', u'01:00:5e:00:00:fb',
+                    u'02:42:ac:11:00:02', u'ff:ff:ff:ff:ff:ff'])
+    tm.assert_numpy_array_equal(arr.is_multicast,
+                                np.array([False, True, False, True]))
+    tm.assert_numpy_array_equal(arr.is_locally_administered,
+                                np.array([False, False, True, True]))
+
+
+def test_series_accessor():
+    s = pd.Series(MACArray([0x001b638445e6, 0x01005e0000fb]), name='mac')
+    result = s.mac.oui
+    expected = pd.Series(np.array([0x001b63, 0x01005e], dtype='u4'),
+                         name='mac')
+    tm.assert_series_equal(result, expected)
+
+    result = s.mac.to_strings('cisco')
+    expected = pd.Series([u'001b.6384.45e6', u'0100.5e00.00fb'], name='mac')
+    tm.assert_series_equal(result, expected)
+
+    with pytest.raises(AttributeError):
+        pd.Series([1, 2]).mac
+
+
+@pytest.mark.parametrize('value', [
+    u'00:1b:63:ff:fe:84:45:e6',
+    u'00-1B-63-FF-FE-84-45-E6',
+    u'001b.63ff.fe84.45e6',
+    u'001b63fffe8445e6',
+])
+def test_eui64_formats(value):
+    result = ip.to_macaddress([value])
+    expected = np.array([0x001b63fffe8445e6], dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+
+def test_eui64():
+    arr = MACArray([u'00:1b:63:84:45:e6', u'aa:bb:cc:dd:ee:ff:00:11', 0])
+    tm.assert_numpy_array_equal(arr.is_eui64, np.array([False, True, False]))
+    tm.assert_numpy_array_equal(arr.oui,
+                                np.array([0x001b63, 0xaabbcc, 0], dtype='u4'))
+    tm.assert_numpy_array_equal(arr.is_locally_administered,
+                                np.array([False, True, False]))
+
+    result = arr[[0, 2]].to_eui64()
+    expected = MACArray([0x001b63fffe8445e6, 0])
+    tm.assert_numpy_array_equal(result.data, expected.data)
+    with pytest.raises(ValueError, match='wider than 48 bits'):
+        arr.to_eui64()
+
+
+def test_interface_id_width():
+    # An EUI-64 with its upper 16 bits zero looks like a MAC-48.
+    arr = MACArray([u'00:00:63:ff:fe:84:45:e6', 0])
+    result = arr.to_interface_id(64)
+    expected = np.array([0x020063fffe8445e6, 0], dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+    result = arr.to_interface_id(48)
+    expected = np.array([0x61fffefffe8445e6, 0], dtype='u8')
+    tm.assert_numpy_array_equal(result, expected)
+
+    with pytest.raises(TypeError):
+        arr.to_interface_id()
+    with pytest.raises(ValueError, match='48 or 64'):
+        arr.to_interface_id(32)
+    with pytest.raises(ValueError, match='width=64'):
+        MACArray([u'aa:bb:cc:dd:ee:ff:00:11']).to_interface_id(48)
+
+
+def test_link_local():
+    arr = MACArray([u'00:1b:63:84:45:e6', u'02:42:ac:11:00:02', 0])
+    result = arr.link_local()
+    expected = ip.IPArray([u'fe80::21b:63ff:fe84:45e6',
+                           u'fe80::42:acff:fe11:2', 0])
+    assert result.equals(expected)
+
+    arr = MACArray([u'00:00:63:ff:fe:84:45:e6', u'aa:bb:cc:dd:ee:ff:00:11'])
+    result = arr.link_local(width=64)
+    expected = ip.IPArray([u'fe80::200:63ff:fe84:45e6',
+                           u'fe80::a8bb:ccdd:eeff:11'])
+    assert result.equals(expected)
+
+
+def test_slaac():
+    arr = MACArray([u'00:1b:63:84:45:e6', u'02:42:ac:11:00:02'])
+    result = arr.slaac(u'2001:db8:1:2::/64')
+    expected = ip.IPArray([u'2001:db8:1:2:21b:63ff:fe84:45e6',
+                           u'2001:db8:1:2:42:acff:fe11:2'])
+    assert result.equals(expected)
+
+    result = arr.slaac(ip.IPNetworkArray([u'2001:db8:1:2::/64',
+                                          u'2001:db8:3:4::/64']))
+    expected = ip.IPArray([u'2001:db8:1:2:21b:63ff:fe84:45e6',
+                           u'2001:db8:3:4:42:acff:fe11:2'])
+    assert result.equals(expected)
+
+
+@pytest.mark.parametrize('prefix', [
+    u'2001:db8::/48',
+    [u'2001:db8::/64'],
+    [u'2001:db8::/64', u'10.0.0.0/8'],
+])
+def test_slaac_raises(prefix):
+    arr = MACArray([u'00:1b:63:84:45:e6', u'02:42:ac:11:00:02'])
+    with pytest.raises(ValueError):
+        arr.slaac(prefix)
+
+
+def test_from_ipv6():
+    addrs = ip.IPArray([u'fe80::21b:63ff:fe84:45e6',
+                        u'2001:db8::a8bb:ccdd:eeff:11', u'10.0.0.1', 0])
+    result = MACArray.from_ipv6(addrs)
+    expected = MACArray([0x001b638445e6, 0, 0, 0])
+    tm.assert_numpy_array_equal(result.data, expected.data)
+
+    result = MACArray.from_ipv6(addrs, eui64=True)
+    expected = MACArray([0x001b63fffe8445e6, 0xaabbccddeeff0011, 0, 0])
+    tm.assert_numpy_array_equal(result.data, expected.data)
+
+
+def test_from_ipv6_roundtrip():
+    arr = MACArray(np.arange(1, 1000, dtype='u8') * 0x123456789)
+    result = MACArray.from_ipv6(arr.slaac(u'2001:db8::/64'))
+    tm.assert_numpy_array_equal(result.data, arr.data)
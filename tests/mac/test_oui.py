@@ -0,0 +1,107 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pandas.util.testing as tm
+import pytest
+
+import cyberpandas as ip
+
+OUI_CSV = u"""\
+Registry,Assignment,Organization Name,Organization Address
+MA-L,001B63,"Apple, Inc.",1 Infinite Loop Cupertino CA US 95014
+MA-L,70B3D5,IEEE Registration Authority,445 Hoes Lane Piscataway NJ US 08554
+MA-M,70B3D5A,Medium Co,Somewhere
+"""
+
+OUI36_TXT = u"""\
+OUI/MA-S Registry\t\t\t\t\tOrganization
+company_id\t\t\tOrganization
+\t\t\t\tAddress
+
+70-B3-D5   (hex)\t\tSmall Co
+A3B000-A3BFFF     (base 16)\t\tSmall Co
+\t\t\t\tSomewhere
+
+"""
+
+OUI_TXT = u"""\
+00-1B-63   (hex)\t\tApple, Inc.
+001B63     (base 16)\t\tApple, Inc.
+\t\t\t\t1 Infinite Loop
+"""
+
+
+@pytest.fixture
+def registry():
+    return ip.OUIRegistry.from_file(io.StringIO(OUI_CSV),
+                                    io.BytesIO(OUI36_TXT.encode('utf-8')))
+
+
+def test_from_file(registry):
+    assert len(registry) == 4
+    assert list(registry.vendors) == ['Apple, Inc.',
+                                      'IEEE Registration Authority',
+                                      'Medium Co', 'Small Co']
+
+
+def test_from_file_text():
+    registry = ip.OUIRegistry.from_file(io.StringIO(OUI_TXT))
+    result = registry.lookup([u'00:1b:63:84:45:e6'])
+    assert list(result) == ['Apple, Inc.']
+
+
+def test_from_file_path(tmpdir):
+    path = tmpdir.join('oui.csv')
+    path.write(OUI_CSV)
+    registry = ip.OUIRegistry.from_file(str(path))
+    assert len(registry) == 3
+
+
+def test_lookup_longest_prefix(registry):
+    values = ip.MACArray([u'00:1b:63:84:45:e6',  # MA-L
+                          u'70:b3:d5:a0:00:01',  # MA-M
+                          u'70:b3:d5:a3:b0:01',  # MA-S inside the MA-M
+                          u'70:b3:d5:00:00:01',  # Only the MA-L
+                          u'00:00:00:00:00:01',  # Unassigned
+                          u'00:00:00:00:00:00'])  # NA
+    result = registry.lookup(values)
+    expected = pd.Categorical(['Apple, Inc.', 'Medium Co', 'Small Co',
+                               'IEEE Registration Authority', np.nan,
+                               np.nan],
+                              categories=registry.vendors)
+    tm.assert_categorical_equal(result, expected)
+
+    result = registry.lookup_codes(values)
+    tm.assert_numpy_array_equal(result, np.array([0, 2, 3, 1, -1, -1]))
+
+
+def test_lookup_empty():
+    registry = ip.OUIRegistry([], [], [])
+    result = registry.lookup_codes([u'00:1b:63:84:45:e6'])
+    tm.assert_numpy_array_equal(result, np.array([-1]))
+
+
+def test_series_vendor(registry):
+    s = pd.Series(ip.MACArray([u'00:1b:63:84:45:e6', u'00:00:00:00:00:01']),
+                  index=['a', 'b'], name='client')
+    result = s.mac.vendor(registry)
+    expected = pd.Series(pd.Categorical(['Apple, Inc.', np.nan],
+                                        categories=registry.vendors),
+                         index=['a', 'b'], name='client')
+    tm.assert_series_equal(result, expected)
+
+
+@pytest.mark.parametrize('prefixes, prefixlens, vendors', [
+    ([1], [24, 24], ['a']),
+    ([1], [49], ['a']),
+])
+def test_registry_raises(prefixes, prefixlens, vendors):
+    with pytest.raises(ValueError):
+        ip.OUIRegistry(prefixes, prefixlens, vendors)
+
+
+def test_lookup_eui64(registry):
+    result = registry.lookup([u'70:b3:d5:a3:b0:01:02:03',
+                              u'00:1b:63:ff:fe:84:45:e6'])
+    assert list(result) == ['Small Co', 'Apple, Inc.']